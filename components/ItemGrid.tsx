@@ -1,6 +1,12 @@
 import { useComputed, useSignal } from "@preact/signals";
-import { useRef } from "preact/hooks";
-import { getAllItems, getItemName, getMaxDurability } from "../utils/items.ts";
+import { useEffect, useRef } from "preact/hooks";
+import {
+  getItemIcon,
+  getItemName,
+  getMaxDurability,
+  loadSearchIndex,
+  searchItems,
+} from "../utils/items.ts";
 
 const GRID_COLS: Record<number, string> = {
   6: "grid-cols-6",
@@ -12,6 +18,32 @@ export interface SlotEditState {
   slotIndex: number;
 }
 
+/**
+ * An item's icon, cut from its atlas with CSS and scaled to fit a `size`
+ * pixel square. Renders nothing if the item has no icon.
+ */
+export function ItemIcon({ id, size }: { id: number; size: number }) {
+  const icon = getItemIcon(id);
+  if (!icon) return null;
+  const scale = size / Math.max(icon.width, icon.height);
+  return (
+    <span
+      aria-hidden="true"
+      class="block shrink-0"
+      style={{
+        width: `${icon.width * scale}px`,
+        height: `${icon.height * scale}px`,
+        backgroundImage: `url(${icon.url})`,
+        backgroundPosition: `-${icon.x * scale}px -${icon.y * scale}px`,
+        backgroundSize: `${icon.atlasWidth * scale}px ${
+          icon.atlasHeight * scale
+        }px`,
+        imageRendering: "pixelated",
+      }}
+    />
+  );
+}
+
 export function ItemGrid(
   {
     itemIds,
@@ -88,9 +120,13 @@ export function ItemGrid(
                     )
                     : (
                       <>
-                        <span class="text-[10px] leading-tight text-center truncate w-full">
-                          {getItemName(itemId)}
-                        </span>
+                        {getItemIcon(itemId)
+                          ? <ItemIcon id={itemId} size={28} />
+                          : (
+                            <span class="text-[10px] leading-tight text-center truncate w-full">
+                              {getItemName(itemId)}
+                            </span>
+                          )}
                         <span class="text-[9px] text-dinkum-accent">
                           x{stack}
                         </span>
@@ -131,13 +167,11 @@ export function SlotEditor(
   const highlightedIndex = useSignal(-1);
   const dropdownRef = useRef<HTMLDivElement>(null);
 
-  const allItems = getAllItems();
+  useEffect(() => {
+    loadSearchIndex();
+  }, []);
 
-  const filteredItems = useComputed(() => {
-    const q = searchQuery.value.toLowerCase();
-    if (!q) return allItems.slice(0, 50);
-    return allItems.filter((item) => item.name.toLowerCase().includes(q));
-  });
+  const filteredItems = useComputed(() => searchItems(searchQuery.value));
 
   const applyHighlight = (index: number) => {
     if (!dropdownRef.current) return;
@@ -244,14 +278,15 @@ export function SlotEditor(
                       key={item.id}
                       type="button"
                       onClick={() => handleSelect(item.id)}
-                      class={`w-full text-left px-2 py-1 text-xs font-mclaren transition-colors ${
+                      class={`w-full flex items-center gap-1 text-left px-2 py-1 text-xs font-mclaren transition-colors ${
                         item.id === selectedItemId.value
                           ? "bg-dinkum-secondary/10 text-dinkum-tertiary"
                           : "text-dinkum-tertiary hover:bg-dinkum-beige"
                       }`}
                     >
+                      <ItemIcon id={item.id} size={16} />
                       <span>{item.name}</span>
-                      <span class="text-dinkum-accent ml-1">#{item.id}</span>
+                      <span class="text-dinkum-accent">#{item.id}</span>
                     </button>
                   ))}
               </div>
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Extractor Benchmarks
+
+Times the extractor's hot paths on synthetic fixtures (see fixtures.py) and
+compares them with the stored baseline in benchmark-baseline.json:
+
+  - parse_i2_item_names: the I2 term table walk behind extract_item_names
+  - get_fixed_data_offset: the header walk, once per InventoryItem
+  - calibrate_offset: building the calibration engine and both offset searches
+  - decode_item_records: Step 5 of extract_tool_data, decoding every
+    ITEM_FIELDS column into one structured array
+
+Every benchmark's result is also checked against the values the fixture was
+built with, so a run doubles as a regression test. Timings are machine
+dependent; refresh the baseline with --update-baseline on the machine you
+compare on.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --items 2025 100000 --repeat 10
+    python benchmark.py --update-baseline
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from extract_items import (
+    CALIBRATION_WINDOW,
+    ITEM_FIELDS,
+    SCRIPT_VERSION,
+    CalibrationEngine,
+    build_item_table,
+    calibrate_offset,
+    decode_item_records,
+    extract_tool_data,
+    get_fixed_data_offset,
+    parse_i2_item_names,
+)
+from fixtures import DEFAULT_ITEM_COUNT, FIXTURE_OFFSETS, FixtureSession, build_fixture_game
+
+BASELINE_PATH = Path(__file__).parent / "benchmark-baseline.json"
+DEFAULT_SIZES = [DEFAULT_ITEM_COUNT, 100_000]
+DEFAULT_TOLERANCE = 0.5
+
+
+class BenchmarkError(Exception):
+    """Raised when a benchmarked function returns the wrong result."""
+
+
+def best_time(func, repeat: int) -> tuple[float, object]:
+    """
+    Time func with timeit (GC off, looped until a sample takes at least
+    0.2s); returns (fastest seconds per call over repeat samples, result).
+    """
+    result = func()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number, result
+
+
+def check(name: str, ok: bool) -> None:
+    if not ok:
+        raise BenchmarkError(f"{name} returned unexpected results")
+
+
+def run_benchmarks(item_count: int, repeat: int) -> dict[str, float]:
+    """Build a fixture game and time each hot path. Returns name -> seconds."""
+    game = build_fixture_game(item_count)
+    session = FixtureSession(game)
+
+    # Inputs the way extract_item_names / extract_tool_data collect them
+    i2_raw = session.raw(session.objects("resources.assets", "MonoBehaviour")[1])
+    inv_script_pid = session.script_pid("InventoryItem")
+    inv_items_by_pid = {
+        obj.path_id: session.raw(obj)
+        for obj in session.behaviours("sharedassets0.assets", inv_script_pid)
+    }
+    with redirect_stdout(StringIO()):
+        item_pid_map = extract_tool_data(session).item_pid_map
+    item_table = build_item_table(inv_items_by_pid)
+    raws = list(inv_items_by_pid.values())
+
+    results = {}
+
+    seconds, names = best_time(lambda: parse_i2_item_names(i2_raw), repeat)
+    check("parse_i2_item_names", names.get("English") == game.names)
+    results["parse_i2_item_names"] = seconds
+
+    seconds, offsets = best_time(lambda: [get_fixed_data_offset(raw) for raw in raws], repeat)
+    check(
+        "get_fixed_data_offset",
+        offsets == [item_table[pid].fixed_start for pid in inv_items_by_pid],
+    )
+    results["get_fixed_data_offset"] = seconds
+
+    calibrated = [field for field in ITEM_FIELDS if field.calibration]
+
+    def calibrate():
+        engine = CalibrationEngine(
+            item_pid_map,
+            item_table,
+            item_ids=set().union(*(field.calibration.keys() for field in calibrated)),
+            window=CALIBRATION_WINDOW,
+        )
+        with redirect_stdout(StringIO()):
+            return {
+                field.name: calibrate_offset(
+                    engine, field.name, field.calibration, field.search_range, field.dtype
+                )
+                for field in calibrated
+            }
+
+    seconds, calibrated_offsets = best_time(calibrate, repeat)
+    check("calibrate_offset", calibrated_offsets == FIXTURE_OFFSETS)
+    results["calibrate_offset"] = seconds
+
+    seconds, records = best_time(
+        lambda: decode_item_records(item_pid_map, item_table, FIXTURE_OFFSETS), repeat
+    )
+    item_ids = records["itemId"].tolist()
+    check(
+        "decode_item_records",
+        bool(records["valid"].all())
+        and dict(zip(item_ids, (records["isATool"] == 1).tolist())) == game.is_tool
+        and dict(zip(item_ids, records["maxStack"].tolist())) == game.max_stack,
+    )
+    results["decode_item_records"] = seconds
+
+    return results
+
+
+def load_baseline() -> dict:
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    return {"results": {}}
+
+
+def print_report(item_count: int, results: dict, baseline: dict, tolerance: float) -> int:
+    """Print one size's timings against the baseline. Returns the regression count."""
+    regressions = 0
+    print(f"{item_count:,} items:")
+    print(f"  {'benchmark':<24} {'time':>10} {'baseline':>10} {'change':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:<24} {seconds * 1000:>8.2f}ms {'-':>10} {'-':>8}")
+            continue
+        change = seconds / base - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  SLOWER"
+            regressions += 1
+        print(
+            f"  {name:<24} {seconds * 1000:>8.2f}ms {base * 1000:>8.2f}ms {change:>+7.0%}{flag}"
+        )
+    print()
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_items.py on synthetic fixtures")
+    parser.add_argument(
+        "--items",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Item counts to benchmark (default: {' '.join(map(str, DEFAULT_SIZES))})",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; the fastest is kept")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Slowdown vs baseline that counts as a regression (default: {DEFAULT_TOLERANCE:.0%}%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Store these timings in {BASELINE_PATH.name}",
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    regressions = 0
+    for item_count in args.items:
+        try:
+            results = run_benchmarks(item_count, args.repeat)
+        except (BenchmarkError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        regressions += print_report(
+            item_count, results, baseline["results"].get(str(item_count), {}), args.tolerance
+        )
+        baseline["results"][str(item_count)] = {k: round(v, 7) for k, v in results.items()}
+
+    if args.update_baseline:
+        baseline = {
+            "scriptVersion": SCRIPT_VERSION,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "results": {k: baseline["results"][k] for k in sorted(baseline["results"], key=int)},
+        }
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {BASELINE_PATH}")
+    elif regressions:
+        print(f"{regressions} benchmark(s) more than {args.tolerance:.0%} slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+SerializedFiles streamed out of UnityFS bundles.
+
+read_bundled_files() streams the wanted nodes of a bundle (see unityfs.py)
+in one pass, parses each node's object table and keeps only the payloads
+its ObjectFilter asks for, so memory use is bounded by the block size plus
+the objects the extractor needs, not the bundle size.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from serialized_file import (
+    HEADER_SIZE,
+    SerializedObject,
+    read_data_offset,
+    read_object_table,
+)
+from unityfs import BundleError, BundleNode, UnityFSBundle
+
+
+class BundledObject(SerializedObject):
+    """
+    An object streamed out of a bundle, with its payload kept in memory, or
+    None if only its table entry was kept (see ObjectFilter).
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, path_id: int, class_id: int, byte_size: int, data: bytes | None):
+        super().__init__(None, path_id, class_id, 0, byte_size)
+        self._data = data
+
+    def get_raw_data(self) -> bytes:
+        if self._data is None:
+            raise BundleError(f"payload of object {self.path_id} was not kept")
+        return self._data
+
+    def read_bytes(self, size: int) -> bytes:
+        return self.get_raw_data()[:size]
+
+
+class BundledFile:
+    """
+    A SerializedFile stored in a bundle. `objects` holds only the objects its
+    ObjectFilter kept, in file order.
+    """
+
+    def __init__(
+        self, path: Path, name: str, version: int, size: int, objects: list[BundledObject]
+    ):
+        self.path = path
+        self.name = name
+        self.version = version
+        self.size = size
+        self.objects = objects
+
+
+class ObjectFilter(NamedTuple):
+    """
+    What read_bundled_files keeps of a node's objects.
+
+    Objects of the `entries` classes are listed without their payload.
+    Objects of the `payloads` classes are listed with it, if `keep` (when
+    set) accepts the class ID and the first `peek` bytes of the payload,
+    and `accept` (when set) accepts the class ID and the whole payload.
+    Rejected payloads are dropped as they stream by, so only one of them is
+    buffered at a time (none at all for those `keep` rejects).
+    """
+
+    payloads: frozenset[int]
+    entries: frozenset[int] = frozenset()
+    keep: Callable[[int, bytes], bool] | None = None
+    peek: int = 0
+    accept: Callable[[int, bytes], bool] | None = None
+
+
+class _NodeReader:
+    """Cuts one node's wanted objects out of the pieces of a bundle's data."""
+
+    def __init__(self, bundle_path: Path, node: BundleNode):
+        self.bundle_path = bundle_path
+        self.node = node
+        self.filter: ObjectFilter | None = None
+        self.prefix: bytearray | None = bytearray()
+        self.needed = min(HEADER_SIZE, node.size)
+        self.data_offset: int | None = None
+        self.done = False
+
+    def feed(self, offset: int, chunk: bytes) -> None:
+        """Take the part of a piece of bundle data that falls in this node."""
+        node = self.node
+        lo = max(offset, node.offset)
+        hi = min(offset + len(chunk), node.offset + node.size)
+        if lo >= hi or self.done:
+            return
+        view = memoryview(chunk)[lo - offset : hi - offset]
+        pos = lo - node.offset
+        if self.prefix is not None:
+            # Buffer the header and metadata, up to where object data starts
+            self.prefix += view
+            if self.data_offset is None and len(self.prefix) >= self.needed:
+                self.data_offset = read_data_offset(self.prefix, node.path)
+                self.needed = min(max(self.needed, self.data_offset), node.size)
+            if len(self.prefix) < self.needed:
+                return
+            self._read_table()
+            view, pos = memoryview(bytes(self.prefix)), 0
+            self.prefix = None
+        self._cut(view, pos)
+
+    def _read_table(self) -> None:
+        version, entries = read_object_table(self.prefix, self.node.path, self.node.size)
+        self.version = version
+        payloads, listed = self.filter.payloads, self.filter.entries | self.filter.payloads
+        self.entries = [entry for entry in entries if entry[1] in listed]
+        self.wanted = sorted(
+            (entry for entry in self.entries if entry[1] in payloads), key=lambda entry: entry[2]
+        )
+        self.index = 0
+        self.part = bytearray()
+        self.skipping = self.checked = False
+        self.kept: dict[int, bytes] = {}
+        self._advance()
+
+    def _advance(self) -> None:
+        """Move past zero-size objects; mark the node done after the last one."""
+        while self.index < len(self.wanted) and not self.wanted[self.index][3]:
+            self._finish(self.wanted[self.index])
+        if self.index == len(self.wanted):
+            self.done = True
+
+    def _finish(self, entry: tuple) -> None:
+        path_id, class_id, _, _ = entry
+        data = bytes(self.part)
+        accept = self.filter.accept
+        if not self.skipping and (accept is None or accept(class_id, data)):
+            self.kept[path_id] = data
+        self.part = bytearray()
+        self.skipping = self.checked = False
+        self.index += 1
+
+    def _cut(self, view: memoryview, pos: int) -> None:
+        end = pos + len(view)
+        keep, peek = self.filter.keep, self.filter.peek
+        while self.index < len(self.wanted):
+            _, class_id, byte_start, byte_size = self.wanted[self.index]
+            byte_end = byte_start + byte_size
+            if byte_start >= end:
+                return
+            if not self.skipping:
+                self.part += view[max(byte_start, pos) - pos : min(byte_end, end) - pos]
+                if keep is not None and not self.checked and len(self.part) >= min(peek, byte_size):
+                    self.checked = True
+                    if not keep(class_id, bytes(self.part[:peek])):
+                        # Rejected: drop what arrived and skip the rest
+                        self.skipping = True
+                        self.part = bytearray()
+            if byte_end > end:
+                return
+            self._finish(self.wanted[self.index])
+            self._advance()
+
+    def result(self) -> BundledFile:
+        if not self.done:
+            raise BundleError(f"{self.bundle_path.name}: {self.node.path} ends early")
+        payloads = self.filter.payloads
+        objects = []
+        for path_id, class_id, _, byte_size in self.entries:
+            if class_id not in payloads:
+                objects.append(BundledObject(path_id, class_id, byte_size, None))
+            elif path_id in self.kept:
+                objects.append(BundledObject(path_id, class_id, byte_size, self.kept[path_id]))
+        return BundledFile(self.bundle_path, self.node.path, self.version, self.node.size, objects)
+
+
+def read_bundled_files(
+    path: Path, names: Iterable[str], node_filter: Callable[[str], ObjectFilter]
+) -> Iterator[BundledFile]:
+    """
+    Stream the nodes `names` out of a bundle in a single pass over its data,
+    yielding each as a BundledFile as soon as it is complete, in data order.
+
+    node_filter(name) is called when the stream reaches a node and says
+    which of its objects to keep, so a filter may depend on nodes yielded
+    before it. Bytes are buffered only until a node's object table has been
+    parsed; after that each piece is cut into the kept payloads and dropped.
+    Decompression stops after the last object needed from the last node.
+    """
+    bundle = UnityFSBundle(path)
+    readers = sorted(
+        (_NodeReader(Path(path), bundle.node(name)) for name in set(names)),
+        key=lambda reader: reader.node.offset,
+    )
+    ranges = [(r.node.offset, r.node.offset + r.node.size) for r in readers]
+    pending = list(readers)
+    pieces = bundle.iter_ranges(ranges)
+    try:
+        for offset, chunk in pieces:
+            chunk_end = offset + len(chunk)
+            while pending and pending[0].node.offset < chunk_end:
+                reader = pending[0]
+                if reader.filter is None:
+                    reader.filter = node_filter(reader.node.path)
+                reader.feed(offset, chunk)
+                if not reader.done and reader.node.offset + reader.node.size > chunk_end:
+                    break
+                pending.pop(0)
+                yield reader.result()
+            if not pending:
+                return
+    finally:
+        pieces.close()
+    if pending:
+        raise BundleError(f"{Path(path).name}: {pending[0].node.path} ends early")
+
+
+def read_bundled_file(path: Path, name: str, class_ids: Iterable[int]) -> BundledFile:
+    """
+    Stream the node `name` out of a bundle, keeping the payloads of objects
+    whose class ID is in class_ids (see read_bundled_files).
+    """
+    object_filter = ObjectFilter(payloads=frozenset(class_ids))
+    return next(read_bundled_files(path, [name], lambda _: object_filter))
@@ -5,22 +5,39 @@ Dinkum Item Data Extractor
 Extracts item names, tool flags, and durability data from Dinkum game files.
 Outputs a JSON file with all item data for use by the save editor.
 
-Requires: UnityPy (pip install unitypy)
+Requires: NumPy; lz4 for LZ4-compressed bundles; UnityPy only for asset
+files the built-in readers can't handle; UnityPy and Pillow for --icons
+(pip install -r requirements.txt)
 
 Usage:
     python extract_items.py "/path/to/Dinkum"
     python extract_items.py "/path/to/Dinkum" --output ../data/items.json
+    python extract_items.py "/path/to/Dinkum" --icons
 """
 
 import argparse
+import gc
+import hashlib
+import io
 import json
+import os
 import re
 import struct
 import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import cache, cached_property
 from pathlib import Path
 
-SCRIPT_VERSION = "1.3.0"
+from bundled_files import ObjectFilter, read_bundled_files
+from serialized_file import CLASS_IDS, SerializedFile, SerializedFileError, SerializedObject
+from unityfs import BundleError, UnityFSBundle
+
+SCRIPT_VERSION = "1.4.0"
 
 # Items whose durability isn't stored in maxStack (e.g. watering cans track
 # water level, tele items track uses). Values confirmed from a creative-mode
@@ -57,6 +74,75 @@ TOOL_CALIBRATION = {
 }
 
 
+@dataclass(frozen=True)
+class ItemField:
+    """
+    One fixed-size field in the fixed-data region of an InventoryItem.
+
+    The offset (relative to the fixed data start) is either calibrated, by
+    searching `search_range` for the offset where every item in `calibration`
+    holds its known value, or derived as `delta` bytes from the offset of the
+    field named in `relative_to`.
+    """
+
+    name: str
+    dtype: str  # NumPy dtype, e.g. "<i4", "u1"
+    calibration: dict[int, int] | None = None
+    search_range: range | None = None
+    relative_to: str | None = None
+    delta: int = 0
+
+
+# The InventoryItem fields decoded for every item. Add a field here (with
+# calibration values or a confirmed position relative to a calibrated field)
+# and it becomes a column of the decoded record array.
+ITEM_FIELDS = (
+    ItemField("maxStack", "<i4", calibration=STACK_CALIBRATION, search_range=range(100, 300, 4)),
+    ItemField(
+        "isATool",
+        "u1",
+        calibration={k: (1 if v else 0) for k, v in TOOL_CALIBRATION.items()},
+        search_range=range(100, 300),
+    ),
+)
+
+# Bytes of fixed data loaded per calibration item; covers every search range
+# above plus the widest field read at its last candidate offset. It is also
+# all of the fixed data kept per item, so ITEM_FIELDS must lie within it.
+CALIBRATION_WINDOW = 320
+
+# Bytes read first from each InventoryItem payload; enough for the header
+# strings plus CALIBRATION_WINDOW unless the description is unusually long,
+# in which case the whole payload is read.
+ITEM_READ_SIZE = 1024
+
+# MonoBehaviour header: GameObject PPtr (12) + Enabled (4, aligned) + Script PPtr (12)
+MONO_HEADER_SIZE = 28
+
+# PPtr m_FileID values accepted for item and sprite references: 0 is the
+# referencing file itself, 1+ index its externals (sharedassets0.assets is one
+# of the first few for level0)
+PPTR_FILE_IDS = range(5)
+
+
+BUNDLE_SUFFIXES = (".unity3d", ".bundle")
+
+# I2 Localization term table: the MonoBehaviour in resources.assets holding this
+I2_MARKER = b"InventoryItemNames"
+
+# What the phases read from a game file streamed out of a bundle; everything
+# else is dropped as it streams by (see AssetSession.bundle_filter). Besides
+# MonoScripts, only the MonoBehaviours of these scripts are kept (all of a
+# file's MonoBehaviours if one of the scripts can't be resolved) ...
+BUNDLE_SCRIPTS = {
+    "sharedassets0.assets": ("InventoryItem",),
+    "level0": ("Inventory", "WorldManager"),
+}
+# ... or those whose payload contains the marker. Sprites are only listed;
+# UnityPy decodes them from the bundle itself.
+BUNDLE_MARKERS = {"resources.assets": I2_MARKER}
+
+
 def find_game_file(game_dir: Path, *subpath: str) -> Path:
     """Locate a game file, trying standard Unity paths."""
     # Standard path: Dinkum/Dinkum_Data/...
@@ -69,24 +155,346 @@ def find_game_file(game_dir: Path, *subpath: str) -> Path:
     for match in game_dir.rglob(filename):
         return match
 
+    # Builds that ship compressed data keep the file inside a UnityFS bundle;
+    # return the bundle, AssetSession streams the file out of it
+    for bundle in sorted(game_dir.rglob("*")):
+        if bundle.suffix in BUNDLE_SUFFIXES and filename in bundle_node_names(bundle):
+            return bundle
+
     print(f"ERROR: Could not find {'/'.join(subpath)} in {game_dir}")
     sys.exit(1)
 
 
-def read_unity_string(raw: bytes, offset: int) -> tuple[str, int]:
-    """Read a Unity length-prefixed string. Returns (string, next_aligned_offset)."""
-    str_len = struct.unpack("<I", raw[offset : offset + 4])[0]
-    s = raw[offset + 4 : offset + 4 + str_len].decode("utf-8", errors="replace")
-    total = 4 + str_len
-    aligned = (total + 3) & ~3
-    return s, offset + aligned
+@cache
+def bundle_node_names(path: Path) -> frozenset[str]:
+    """Names of the files stored in a UnityFS bundle (empty if it isn't one)."""
+    try:
+        return frozenset(node.path for node in UnityFSBundle(path).nodes)
+    except (BundleError, OSError):
+        return frozenset()
+
+
+def load_asset_file(path: Path):
+    """
+    Open a game file for reading its objects.
+
+    Uncompressed SerializedFiles (what a Dinkum install ships) are read with
+    the built-in reader, which doesn't need UnityPy. Anything else falls back
+    to UnityPy.load. Either way the result has an `objects` list whose
+    entries provide path_id, class_id, byte_size and get_raw_data(). Files
+    inside a bundle are streamed out of it by AssetSession instead.
+    """
+    try:
+        return SerializedFile(path)
+    except SerializedFileError as e:
+        try:
+            import UnityPy
+        except ImportError:
+            print(f"ERROR: {e}, and UnityPy is not installed to read it")
+            print("  Install it with: pip install unitypy")
+            sys.exit(1)
+        return UnityPy.load(str(path))
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
 
+class Profiler:
+    """
+    Records wall time, CPU time, AssetSession counters and peak RSS for
+    nested steps (phase -> sub-step).
+
+    Steps are kept in start order as JSON-ready dicts, so worker processes
+    can send theirs back to be merged into the parent's report.
+    """
 
-def skip_unity_string(raw: bytes, offset: int) -> int:
-    """Skip a Unity length-prefixed string. Returns next aligned offset."""
-    str_len = struct.unpack("<I", raw[offset : offset + 4])[0]
-    total = 4 + str_len
-    return offset + ((total + 3) & ~3)
+    COUNTERS = ("objects", "rawCalls", "bytesRead")
+
+    def __init__(self):
+        self.steps: list[dict] = []
+        self._stack: list[str] = []
+
+    @contextmanager
+    def step(self, name: str, stats: dict[str, int] | None = None):
+        stats = stats if stats is not None else {}
+        self._stack.append(name)
+        entry = {"step": "/".join(self._stack)}
+        self.steps.append(entry)
+        before = dict(stats)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield entry
+        finally:
+            entry["wall"] = time.perf_counter() - wall
+            entry["cpu"] = time.process_time() - cpu
+            for key in self.COUNTERS:
+                entry[key] = stats.get(key, 0) - before.get(key, 0)
+            entry["peakRss"] = peak_rss()
+            self._stack.pop()
+
+    def add_cached(self, name: str) -> None:
+        """Record a phase that was served from the extraction cache."""
+        entry = {"step": name, "cached": True, "wall": 0.0, "cpu": 0.0}
+        entry.update({key: 0 for key in self.COUNTERS}, peakRss=None)
+        self.steps.append(entry)
+
+
+class AssetSession:
+    """
+    Shared access to the game's asset files for every extraction phase.
+
+    Each file is loaded at most once while it is in use: plain SerializedFiles
+    are memory-mapped and read directly (serialized_file.py), files inside a
+    compressed bundle are streamed out of it (unityfs.py), keeping only the
+    objects the phases read (bundle_filter), and all expected files of a
+    bundle in one pass (expect), anything else goes through UnityPy (see
+    load_asset_file). The loaded file, the per-type
+    object lists, the MonoScript name -> path_id index and the per-file
+    script index of MonoBehaviours are memoized, so later phases reuse what
+    earlier phases already parsed. release() drops a file once nothing else
+    needs it, so only the files in use stay loaded.
+
+    `stats` counts objects enumerated, get_raw_data calls and payload bytes
+    read; with a `profiler` attached, phases record steps against them.
+    """
+
+    def __init__(self, game_dir: Path):
+        self.game_dir = game_dir
+        self.stats = {"objects": 0, "rawCalls": 0, "bytesRead": 0}
+        self.profiler: Profiler | None = None
+        self._envs: dict[str, object] = {}
+        self._objects: dict[tuple[str, str], list] = {}
+        self._script_pids: dict[str, int] | None = None
+        self._behaviours: dict[str, dict[int, list]] = {}
+        self._expected: set[str] = set()
+        self._streaming = False
+
+    def step(self, name: str):
+        """Context manager that profiles a step when a profiler is attached."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.step(name, self.stats)
+
+    def expect(self, *filenames: str) -> None:
+        """
+        Declare files the coming phases will read. When one of them is first
+        loaded from a bundle, the others stored in the same bundle are
+        streamed out in the same pass, so the bundle is decompressed once
+        rather than once per file.
+        """
+        self._expected.update(filenames)
+
+    def env(self, filename: str):
+        """Return the loaded form of a game file (see load_asset_file), loading it on first use."""
+        if filename not in self._envs:
+            path = find_game_file(self.game_dir, filename)
+            if path.name != filename:
+                self._load_bundled(path, filename)
+            else:
+                print(f"  Loading {path}...")
+                with self.step(f"load {filename}") as entry:
+                    self._envs[filename] = load_asset_file(path)
+                if entry is not None:
+                    entry["fileSize"] = path.stat().st_size
+        return self._envs[filename]
+
+    def _load_bundled(self, path: Path, filename: str) -> None:
+        """Stream filename, plus the expected files in the same bundle, out of it."""
+        names = [filename]
+        if not self._streaming:
+            names += [
+                name
+                for name in sorted(self._expected - self._envs.keys() - {filename})
+                if find_game_file(self.game_dir, name) == path
+            ]
+        self._expected.difference_update(names)
+        print(f"  Loading {', '.join(names)} from {path}...")
+        # A filter may need the MonoScript index; if its file comes later in
+        # the bundle, it is loaded by a nested (shorter) pass
+        streaming, self._streaming = self._streaming, True
+        with self.step(f"load {path.name}") as entry:
+            try:
+                for bundled in read_bundled_files(path, names, self.bundle_filter):
+                    self._envs[bundled.name] = bundled
+                    if entry is not None:
+                        entry["fileSize"] = entry.get("fileSize", 0) + bundled.size
+            except (BundleError, SerializedFileError) as e:
+                print(f"ERROR: Could not read {filename} from {path}: {e}")
+                sys.exit(1)
+            finally:
+                self._streaming = streaming
+
+    def bundle_filter(self, filename: str) -> ObjectFilter:
+        """
+        Which objects to keep of a file streamed out of a bundle: MonoScripts,
+        Sprite entries, and the MonoBehaviours in BUNDLE_SCRIPTS (picked by
+        the script PPtr in their 28-byte header, before the rest of the
+        payload arrives) or BUNDLE_MARKERS.
+        """
+        payloads = frozenset({CLASS_IDS["MonoScript"], CLASS_IDS["MonoBehaviour"]})
+        entries = frozenset({CLASS_IDS["Sprite"]})
+        mono = CLASS_IDS["MonoBehaviour"]
+        if filename in BUNDLE_MARKERS:
+            marker = BUNDLE_MARKERS[filename]
+            return ObjectFilter(
+                payloads, entries, accept=lambda class_id, raw: class_id != mono or marker in raw
+            )
+        pids = {self.script_pid(name) for name in BUNDLE_SCRIPTS.get(filename, ())}
+        if None in pids:
+            # Can't tell which MonoBehaviours are needed; keep them all
+            return ObjectFilter(payloads, entries)
+        return ObjectFilter(
+            payloads,
+            entries,
+            keep=lambda class_id, head: class_id != mono or I64.unpack_from(head, 20)[0] in pids,
+            peek=MONO_HEADER_SIZE,
+        )
+
+    def release(self, *filenames: str) -> None:
+        """
+        Drop the environments of the given files and everything memoized from
+        them (object lists, MonoBehaviour script index), so their memory can
+        be reclaimed. A released file is loaded again if it's used later.
+        The MonoScript name index is kept; it is small and holds no objects.
+        """
+        released = False
+        for filename in filenames:
+            env = self._envs.pop(filename, None)
+            if isinstance(env, SerializedFile):
+                env.close()
+            released |= env is not None
+            self._behaviours.pop(filename, None)
+            for key in [key for key in self._objects if key[0] == filename]:
+                del self._objects[key]
+        if released:
+            # UnityPy object readers reference each other; collect the cycles now
+            gc.collect()
+
+    def objects(self, filename: str, type_name: str) -> list:
+        """Return all objects of one Unity type (e.g. "MonoBehaviour") in a file."""
+        key = (filename, type_name)
+        if key not in self._objects:
+            objects = self.env(filename).objects
+            self.stats["objects"] += len(objects)
+            class_id = CLASS_IDS[type_name]
+            self._objects[key] = [obj for obj in objects if obj.class_id == class_id]
+        return self._objects[key]
+
+    def raw(self, obj) -> bytes:
+        """Return the serialized payload of an object."""
+        raw = obj.get_raw_data()
+        self.stats["rawCalls"] += 1
+        self.stats["bytesRead"] += len(raw)
+        return raw
+
+    def read_header(self, obj, size: int) -> bytes:
+        """Read only the first `size` bytes of an object's payload."""
+        if isinstance(obj, SerializedObject):
+            header = obj.read_bytes(size)
+        else:
+            obj.reset()
+            header = obj.reader.read_bytes(min(size, obj.byte_size))
+        self.stats["bytesRead"] += len(header)
+        return header
+
+    def behaviours(self, filename: str, script_pid: int) -> list:
+        """
+        Return the MonoBehaviours in a file whose m_Script points at script_pid.
+
+        The index is built from the 28-byte MonoBehaviour header of each object
+        (GameObject PPtr, Enabled, Script PPtr), so payloads are only read in
+        full for the scripts a phase actually asks for.
+        """
+        if filename not in self._behaviours:
+            index: dict[int, list] = {}
+            for obj in self.objects(filename, "MonoBehaviour"):
+                if obj.byte_size < MONO_HEADER_SIZE:
+                    continue
+                header = self.read_header(obj, MONO_HEADER_SIZE)
+                script_path_id = I64.unpack_from(header, 20)[0]
+                index.setdefault(script_path_id, []).append(obj)
+            self._behaviours[filename] = index
+        return self._behaviours[filename].get(script_pid, [])
+
+    def script_pid(self, name: str) -> int | None:
+        """Look up a MonoScript path_id by class name in globalgamemanagers.assets."""
+        if self._script_pids is None:
+            self._script_pids = {}
+            for obj in self.objects("globalgamemanagers.assets", "MonoScript"):
+                # MonoScript payload starts with m_Name (length-prefixed string)
+                raw = self.raw(obj)
+                try:
+                    length = U32.unpack_from(raw, 0)[0]
+                except struct.error:
+                    continue
+                if length >= 200 or 4 + length > len(raw):
+                    continue
+                script_name = raw[4 : 4 + length].decode("utf-8", errors="replace")
+                # Keep the first script when a class name appears twice
+                self._script_pids.setdefault(script_name, obj.path_id)
+        return self._script_pids.get(name)
+
+
+# Precompiled little-endian field formats
+I32 = struct.Struct("<i")
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")  # PPtr m_PathID
+
+
+class BinaryReader:
+    """
+    Little-endian cursor over a memoryview of serialized Unity data.
+
+    Fields are read in place with precompiled struct.Struct objects. Reads
+    past the end raise struct.error. Each read is a method call, so per-item
+    loops (header walks, I2 terms) call Struct.unpack_from with plain offsets
+    instead; this is for the one-off reads around them.
+    """
+
+    __slots__ = ("view", "pos")
+
+    def __init__(self, data, pos: int = 0):
+        self.view = data if isinstance(data, memoryview) else memoryview(data)
+        self.pos = pos
+
+    def u32(self) -> int:
+        value = U32.unpack_from(self.view, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def i32(self) -> int:
+        value = I32.unpack_from(self.view, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def string_span(self) -> tuple[int, int]:
+        """
+        Move past a length-prefixed string (aligned to 4 bytes, counting the
+        prefix) and return the (start, end) offsets of its contents.
+        """
+        prefix = self.pos
+        length = self.u32()
+        start, end = prefix + 4, prefix + 4 + length
+        if end > len(self.view):
+            raise struct.error("string runs past end of data")
+        self.pos = prefix + ((4 + length + 3) & ~3)
+        return start, end
+
+    def string(self) -> str:
+        """Read a length-prefixed string."""
+        start, end = self.string_span()
+        return str(self.view[start:end], "utf-8", "replace")
+
+    def skip_string(self) -> None:
+        self.string_span()
 
 
 def get_fixed_data_offset(raw: bytes) -> int:
@@ -102,34 +510,154 @@ def get_fixed_data_offset(raw: bytes) -> int:
       [...]   Description string (variable length)
       [...]   Fixed-size fields start here
     """
-    pos = 28
-    pos = skip_unity_string(raw, pos)  # m_Name (MonoBehaviour name)
-    pos = skip_unity_string(raw, pos)  # Internal name / category
-    pos = skip_unity_string(raw, pos)  # Item name
-    pos = skip_unity_string(raw, pos)  # Description
-    return pos
+    return parse_item_header(raw)[0]
+
+
+def parse_item_header(raw: bytes) -> tuple[int, tuple[tuple[int, int], ...]]:
+    """
+    Walk the four header strings of an InventoryItem MonoBehaviour (see
+    get_fixed_data_offset for the layout).
+
+    This runs once per item, so lengths are read with unpack_from at plain
+    offsets rather than through BinaryReader. Raises struct.error if a string
+    runs past the end of the data.
+
+    Returns (fixed_start, spans) where spans holds the (start, end) byte range
+    of each string's contents: m_Name, category, item name, description.
+    """
+    read_u32 = U32.unpack_from
+    size = len(raw)
+    spans = []
+    pos = MONO_HEADER_SIZE
+    for _ in range(4):
+        start = pos + 4
+        end = start + read_u32(raw, pos)[0]
+        if end > size:
+            raise struct.error("string runs past end of data")
+        spans.append((start, end))
+        pos = (end + 3) & ~3
+    return pos, tuple(spans)
+
+
+@dataclass
+class InventoryItemRecord:
+    """
+    One InventoryItem MonoBehaviour with its header parsed once.
+
+    The header strings are only decoded when first accessed.
+    """
+
+    raw: bytes
+    fixed_start: int
+    string_spans: tuple[tuple[int, int], ...]
+
+    def _string(self, index: int) -> str:
+        start, end = self.string_spans[index]
+        return str(memoryview(self.raw)[start:end], "utf-8", "replace")
+
+    @cached_property
+    def category(self) -> str:
+        return self._string(1)
+
+    @cached_property
+    def name(self) -> str:
+        return self._string(2)
+
+    @cached_property
+    def description(self) -> str:
+        return self._string(3)
+
+
+def read_item_record(raw: bytes, window: int | None = None) -> InventoryItemRecord | None:
+    """
+    Parse an InventoryItem header. With a window, only the header and `window`
+    bytes of fixed data are kept in the record. Returns None if the header
+    runs past the end of the data.
+    """
+    try:
+        fixed_start, spans = parse_item_header(raw)
+    except struct.error:
+        return None
+    if window is not None:
+        raw = raw[: fixed_start + window]
+    return InventoryItemRecord(raw, fixed_start, spans)
+
+
+def build_item_table(
+    inv_items_by_pid: dict[int, bytes], window: int | None = None
+) -> dict[int, InventoryItemRecord]:
+    """
+    Parse every InventoryItem header in a single pass.
+
+    Returns pid -> InventoryItemRecord. Items whose header runs past the end of
+    their data are left out.
+    """
+    table: dict[int, InventoryItemRecord] = {}
+    for pid, raw in inv_items_by_pid.items():
+        record = read_item_record(raw, window)
+        if record is not None:
+            table[pid] = record
+    return table
+
+
+def collect_item_records(
+    session: AssetSession, script_pid: int, window: int = CALIBRATION_WINDOW
+) -> tuple[set[int], dict[int, InventoryItemRecord]]:
+    """
+    Read the InventoryItem MonoBehaviours of sharedassets0, keeping only each
+    item's header and `window` bytes of fixed data.
+
+    The first ITEM_READ_SIZE bytes of a payload usually cover both; the full
+    payload is read only when they don't. Full payloads are dropped as soon
+    as the item is trimmed, so memory grows with the item count, not with
+    the size of the objects.
+
+    Returns (path_ids of all InventoryItems, path_id -> record for those
+    with a readable header).
+    """
+    item_pids: set[int] = set()
+    table: dict[int, InventoryItemRecord] = {}
+    for obj in session.behaviours("sharedassets0.assets", script_pid):
+        if obj.byte_size <= MONO_HEADER_SIZE:
+            continue
+        item_pids.add(obj.path_id)
+        data = session.read_header(obj, ITEM_READ_SIZE)
+        record = read_item_record(data, window)
+        truncated = record is None or len(record.raw) < record.fixed_start + window
+        if truncated and len(data) < obj.byte_size:
+            record = read_item_record(session.raw(obj), window)
+        if record is not None:
+            table[obj.path_id] = record
+    return item_pids, table
 
 
 # --- Phase 1: Item names from I2 Localization ---
 
 
-def extract_item_names(game_dir: Path) -> dict[int, str]:
+def extract_item_names(session: AssetSession) -> dict[int, str]:
     """
     Extract item ID -> name mapping from I2 Localization data in resources.assets.
     Items follow the pattern: InventoryItemNames/InvItem_NNN -> English name
     """
-    import UnityPy
+    localized = extract_localized_item_names(session)
+    language = "English" if "English" in localized else next(iter(localized), None)
+    if language is None:
+        print("ERROR: Could not parse I2 Localization term table")
+        sys.exit(1)
+    return localized[language]
 
-    resources_path = find_game_file(game_dir, "resources.assets")
-    print(f"  Loading {resources_path}...")
-    env = UnityPy.load(str(resources_path))
 
+def extract_localized_item_names(session: AssetSession) -> dict[str, dict[int, str]]:
+    """
+    Extract item ID -> name mappings for every language in the I2 Localization
+    data. Returns language name -> {item_id: name}.
+    """
     # Find the MonoBehaviour containing I2 Localization data
     i2_raw = None
-    for obj in env.objects:
-        if obj.type.name == "MonoBehaviour":
-            raw = obj.get_raw_data()
-            if b"InventoryItemNames" in raw:
+    with session.step("find I2 data"):
+        for obj in session.objects("resources.assets", "MonoBehaviour"):
+            raw = session.raw(obj)
+            if I2_MARKER in raw:
                 i2_raw = raw
                 break
 
@@ -137,126 +665,266 @@ def extract_item_names(game_dir: Path) -> dict[int, str]:
         print("ERROR: Could not find I2 Localization data in resources.assets")
         sys.exit(1)
 
-    # Parse all InvItem entries
-    pattern = rb"InventoryItemNames/InvItem_(\d+)"
-    items: dict[int, str] = {}
+    with session.step("parse terms"):
+        return parse_i2_item_names(i2_raw)
 
-    for match in re.finditer(pattern, i2_raw):
-        item_id = int(match.group(1))
-        start = match.start()
 
-        # Skip past the term string (aligned to 4 bytes)
-        term_len = struct.unpack("<I", i2_raw[start - 4 : start])[0]
-        term_end = start + term_len
-        term_end = (term_end + 3) & ~3
+I2_ITEM_TERM = re.compile(rb"InventoryItemNames/InvItem_(\d+)")
+I2_PLURAL_MARKER = re.compile(r"\{[^}]*\}")
 
-        # Scan forward for the first valid name string
-        search_end = min(term_end + 200, len(i2_raw))
-        chunk = i2_raw[term_end:search_end]
+# Sanity limits used to tell real TermData records from misaligned bytes
+I2_MAX_TERM_TYPE = 16
+I2_MAX_LANGUAGES = 256
+I2_TERM_HEADER = struct.Struct("<iI")  # TermType, Languages count
 
-        pos = 0
-        while pos < len(chunk) - 4:
-            str_len = struct.unpack("<I", chunk[pos : pos + 4])[0]
-            if 1 < str_len < 100:
-                candidate = chunk[pos + 4 : pos + 4 + str_len]
-                try:
-                    name = candidate.decode("utf-8")
-                    if name.isprintable() and not name.startswith("InventoryItem"):
-                        # Strip I2 pluralization markers like {s}
-                        name = re.sub(r"\{[^}]*\}", "", name)
-                        items[item_id] = name
-                        break
-                except (UnicodeDecodeError, ValueError):
-                    pass
-            pos += 1
 
-    return items
+def read_i2_term(view: memoryview, pos: int) -> tuple[tuple[int, int], list[tuple[int, int]], int]:
+    """
+    Read one serialized I2 TermData record. Returns (term_span, language_spans,
+    next_offset), where each span is the (start, end) of a string's bytes;
+    callers decode only the terms they need.
+
+    Layout (Description is editor-only and not serialized in builds):
+      Term            string
+      TermType        int32
+      Languages       string[]   one entry per language column
+      Flags           byte[]     same length as Languages, aligned
+      Languages_Touch string[]
+
+    This runs once per term, so fields are read with unpack_from inline
+    rather than through BinaryReader methods. Raises ValueError if the bytes
+    at `pos` don't look like a TermData record, struct.error if they run out.
+    """
+    read_u32 = U32.unpack_from
+    length = read_u32(view, pos)[0]
+    term = (pos + 4, pos + 4 + length)
+    pos += (4 + length + 3) & ~3
+
+    term_type, lang_count = I2_TERM_HEADER.unpack_from(view, pos)
+    if not 0 <= term_type < I2_MAX_TERM_TYPE or lang_count > I2_MAX_LANGUAGES:
+        raise ValueError("not a TermData record")
+    pos += 8
+
+    languages = []
+    for _ in range(lang_count):
+        length = read_u32(view, pos)[0]
+        languages.append((pos + 4, pos + 4 + length))
+        pos += (4 + length + 3) & ~3
+
+    flag_count = read_u32(view, pos)[0]
+    if flag_count != lang_count:
+        raise ValueError("TermData flags don't match language count")
+    pos += (4 + flag_count + 3) & ~3
+
+    touch_count = read_u32(view, pos)[0]
+    if touch_count > I2_MAX_LANGUAGES:
+        raise ValueError("not a TermData record")
+    pos += 4
+    for _ in range(touch_count):
+        pos += (4 + read_u32(view, pos)[0] + 3) & ~3
+
+    if pos > len(view):
+        raise ValueError("TermData runs past end of data")
+    return term, languages, pos
+
+
+def read_i2_language_names(reader: BinaryReader, column_count: int) -> list[str] | None:
+    """
+    Read the mLanguages list that follows the term table, if it's where
+    expected. Returns the language names, or None if the layout differs.
+
+    Fields after mTerms: CaseInsensitiveTerms (bool, aligned),
+    OnMissingTranslation (int32), mTerm_AppName (string), then
+    mLanguages: LanguageData[] of Name (string), Code (string), Flags (byte, aligned).
+    """
+    try:
+        reader.pos += 8
+        reader.skip_string()
+        count = reader.u32()
+        if count != column_count:
+            return None
+        names = []
+        for _ in range(count):
+            names.append(reader.string())
+            reader.skip_string()
+            reader.pos += 4
+        return names
+    except struct.error:
+        return None
+
+
+def parse_i2_item_names(i2_raw: bytes) -> dict[str, dict[int, str]]:
+    """
+    Parse item names from a serialized I2 LanguageSourceData blob.
+
+    Walks the term table once, starting at the first InventoryItemNames term,
+    and reads each term's language array by structure. If a record fails to
+    parse, the walk resumes at the next InventoryItemNames term.
+
+    Returns language name -> {item_id: name}. Columns are named from the
+    mLanguages list when it can be read, otherwise "Language N".
+    """
+    columns: dict[int, dict[int, str]] = {}
+    column_count = 0
+    end = 0
+    view = memoryview(i2_raw)
+
+    match = I2_ITEM_TERM.search(i2_raw)
+    while match:
+        # Terms are length-prefixed; the record starts at the prefix
+        pos = match.start() - 4
+        while pos < len(i2_raw):
+            try:
+                term, languages, next_pos = read_i2_term(view, pos)
+            except (ValueError, struct.error):
+                break
+            pos = end = next_pos
+            column_count = max(column_count, len(languages))
+
+            term_match = I2_ITEM_TERM.fullmatch(i2_raw, *term)
+            if term_match is None:
+                continue
+            item_id = int(term_match.group(1))
+            for column, (start, stop) in enumerate(languages):
+                if stop > start:
+                    value = str(view[start:stop], "utf-8", "replace")
+                    # Strip I2 pluralization markers like {s}
+                    columns.setdefault(column, {})[item_id] = I2_PLURAL_MARKER.sub("", value)
+
+        match = I2_ITEM_TERM.search(i2_raw, max(pos, match.start()) + 1)
+
+    names = read_i2_language_names(BinaryReader(view, end), column_count)
+    if names is None:
+        names = [f"Language {i}" for i in range(column_count)]
+    return {names[column]: columns[column] for column in sorted(columns)}
 
 
 # --- Phase 2: Tool durability from InventoryItem MonoBehaviours ---
 
 
-def extract_tool_data(
-    game_dir: Path, item_names: dict[int, str]
-) -> tuple[dict[int, bool], dict[int, int]]:
+def locate_all_items(raw: bytes, item_pids, anchor_ids: list[int]) -> dict[int, int]:
+    """
+    Find the Inventory.allItems PPtr array in a MonoBehaviour payload.
+
+    Every 4-aligned uint32 is treated as a possible array length, and the
+    12-byte (file_id, path_id) entries after it are viewed in place as a NumPy
+    structured array. A candidate is accepted only if the entries at every
+    calibration item's index share one plausible file_id (the same file or
+    one of its first externals, as in PPTR_FILE_IDS) and point at known
+    InventoryItem objects; if several arrays qualify, the one with the most
+    resolvable entries wins. Entries that reference another file are mapped
+    to path_id 0 so they can't resolve to an unrelated object.
+
+    Returns item_id -> path_id, or {} if no array qualifies.
+    """
+    import numpy as np
+
+    # Serialized PPtr: int32 m_FileID then int64 m_PathID, packed into 12 bytes
+    pptr = np.dtype([("file_id", "<i4"), ("path_id", "<i8")])
+    known = np.fromiter(item_pids, dtype=np.int64)
+    anchors = np.array(anchor_ids)
+    counts = np.frombuffer(raw, dtype="<u4", count=len(raw) // 4).astype(np.int64)
+    offsets = np.arange(len(counts), dtype=np.int64) * 4
+    fits = (counts > anchors.max()) & (offsets + 4 + counts * pptr.itemsize <= len(raw))
+
+    best = None
+    best_resolved = 0
+    for offset, count in zip(offsets[fits].tolist(), counts[fits].tolist()):
+        entries = np.frombuffer(raw, dtype=pptr, count=count, offset=offset + 4)
+        file_id = int(entries["file_id"][anchors[0]])
+        if file_id not in PPTR_FILE_IDS:
+            continue
+        if not (entries["file_id"][anchors] == file_id).all():
+            continue
+        path_ids = np.where(entries["file_id"] == file_id, entries["path_id"], 0)
+        if not np.isin(path_ids[anchors], known).all():
+            continue
+        resolved = int(np.isin(path_ids, known).sum())
+        if resolved > best_resolved:
+            best, best_resolved = path_ids, resolved
+
+    if best is None:
+        return {}
+    return dict(enumerate(best.tolist()))
+
+
+@dataclass
+class ToolData:
     """
-    Extract tool flags and maxStack data from InventoryItem MonoBehaviours.
+    Result of Phase 2.
 
-    Returns (is_tool_map, max_stack_map) where:
-      - is_tool_map: item_id -> True if the game flags this item as a tool
-      - max_stack_map: item_id -> maxStack value (durability for tools, stack size otherwise)
+      - records: structured array with one row per mapped item, sorted by item
+        ID: "itemId", "valid" (False if the item's data is too short for a
+        field) and one column per ITEM_FIELDS entry
+      - item_pid_map: item_id -> InventoryItem path_id (from Inventory.allItems)
+      - offsets: field name -> offset from fixed data start
     """
-    import UnityPy
 
-    # Step 1: Find the InventoryItem MonoScript path_id
-    gg_path = find_game_file(game_dir, "globalgamemanagers.assets")
-    print(f"  Loading {gg_path}...")
-    genv = UnityPy.load(str(gg_path))
-
-    inv_script_pid = None
-    for obj in genv.objects:
-        if obj.type.name == "MonoScript":
-            raw = obj.get_raw_data()
-            if b"InventoryItem" in raw:
-                name_len = struct.unpack("<I", raw[0:4])[0]
-                name = raw[4 : 4 + name_len].decode("utf-8")
-                if name == "InventoryItem":
-                    inv_script_pid = obj.path_id
-                    break
+    records: "np.ndarray"
+    item_pid_map: dict[int, int]
+    offsets: dict[str, int]
+
+    def to_json(self) -> dict:
+        return {
+            "records": {name: self.records[name].tolist() for name in self.records.dtype.names},
+            "pidMap": {str(k): v for k, v in self.item_pid_map.items()},
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ToolData":
+        import numpy as np
+
+        columns = data["records"]
+        records = np.zeros(len(columns["itemId"]), dtype=item_record_dtype())
+        for name in records.dtype.names:
+            records[name] = columns[name]
+        return cls(
+            records=records,
+            item_pid_map={int(k): v for k, v in data["pidMap"].items()},
+            offsets=data["offsets"],
+        )
+
 
+def extract_tool_data(session: AssetSession) -> ToolData:
+    """Extract tool flags and maxStack data from InventoryItem MonoBehaviours."""
+    # Step 1: Find the InventoryItem MonoScript path_id
+    with session.step("find scripts"):
+        inv_script_pid = session.script_pid("InventoryItem")
     if inv_script_pid is None:
         print("ERROR: Could not find InventoryItem MonoScript")
         sys.exit(1)
 
-    # Step 2: Collect all InventoryItem MonoBehaviours from sharedassets0
-    sa_path = find_game_file(game_dir, "sharedassets0.assets")
-    print(f"  Loading {sa_path}...")
-    senv = UnityPy.load(str(sa_path))
-
-    inv_items_by_pid: dict[int, bytes] = {}
-    for obj in senv.objects:
-        if obj.type.name == "MonoBehaviour":
-            raw = obj.get_raw_data()
-            if len(raw) > 28:
-                script_path_id = struct.unpack("<q", raw[20:28])[0]
-                if script_path_id == inv_script_pid:
-                    inv_items_by_pid[obj.path_id] = raw
+    # Step 2: Collect all InventoryItem MonoBehaviours from sharedassets0,
+    # parsing each header once (calibration and extraction reuse it)
+    with session.step("collect items"):
+        item_pids, item_table = collect_item_records(session, inv_script_pid)
+    # Nothing else reads sharedassets0; free it before level0 is loaded
+    session.release("sharedassets0.assets")
 
-    print(f"  Found {len(inv_items_by_pid)} InventoryItem objects")
+    print(f"  Found {len(item_pids)} InventoryItem objects")
+    if len(item_table) < len(item_pids):
+        skipped = len(item_pids) - len(item_table)
+        print(f"  Skipped {skipped} items with unreadable headers")
 
     # Step 3: Get item ID -> path_id mapping from Inventory singleton in level0
-    level_path = find_game_file(game_dir, "level0")
-    print(f"  Loading {level_path}...")
-    lenv = UnityPy.load(str(level_path))
-
-    item_pid_map: dict[int, int] = {}
-    for obj in lenv.objects:
-        if obj.type.name == "MonoBehaviour":
-            raw = obj.get_raw_data()
-            # Search for the allItems array (size should match our item count)
-            expected_count = len(item_names)
-            for offset in range(0, min(500, len(raw) - 4)):
-                arr_size = struct.unpack("<I", raw[offset : offset + 4])[0]
-                if arr_size == expected_count:
-                    # Verify it looks like a PPtr array
-                    pptr_start = offset + 4
-                    file_id = struct.unpack(
-                        "<i", raw[pptr_start : pptr_start + 4]
-                    )[0]
-                    path_id = struct.unpack(
-                        "<q", raw[pptr_start + 4 : pptr_start + 12]
-                    )[0]
-                    if file_id in (0, 1, 2, 3, 4) and path_id in inv_items_by_pid:
-                        # Found the array
-                        for i in range(arr_size):
-                            ps = offset + 4 + i * 12
-                            pid = struct.unpack("<q", raw[ps + 4 : ps + 12])[0]
-                            item_pid_map[i] = pid
-                        break
+    # Only the Inventory singleton needs a full read; fall back to scanning
+    # every MonoBehaviour if its MonoScript can't be found.
+    with session.step("locate allItems"):
+        inventory_script_pid = session.script_pid("Inventory")
+        if inventory_script_pid is not None:
+            candidates = session.behaviours("level0", inventory_script_pid)
+        else:
+            candidates = session.objects("level0", "MonoBehaviour")
+
+        anchor_ids = sorted(STACK_CALIBRATION.keys() | TOOL_CALIBRATION.keys())
+        item_pid_map: dict[int, int] = {}
+        for obj in candidates:
+            item_pid_map = locate_all_items(session.raw(obj), item_pids, anchor_ids)
             if item_pid_map:
                 break
 
-    mapped = sum(1 for pid in item_pid_map.values() if pid in inv_items_by_pid)
+    mapped = sum(1 for pid in item_pid_map.values() if pid in item_pids)
     print(f"  Mapped {mapped}/{len(item_pid_map)} items to MonoBehaviour objects")
 
     if not item_pid_map:
@@ -264,91 +932,213 @@ def extract_tool_data(
         sys.exit(1)
 
     # Step 4: Auto-calibrate binary offsets using known values
-    maxstack_rel_offset = calibrate_offset(
-        "maxStack",
-        STACK_CALIBRATION,
-        item_pid_map,
-        inv_items_by_pid,
-        search_range=range(100, 300, 4),
-        read_fn=lambda raw, off: struct.unpack("<i", raw[off : off + 4])[0],
-    )
+    with session.step("calibrate"):
+        calibrated = [field for field in ITEM_FIELDS if field.calibration]
+        engine = CalibrationEngine(
+            item_pid_map,
+            item_table,
+            item_ids=set().union(*(field.calibration.keys() for field in calibrated)),
+            window=CALIBRATION_WINDOW,
+        )
+        offsets = {
+            field.name: calibrate_offset(
+                engine,
+                field.name,
+                field.calibration,
+                search_range=field.search_range,
+                dtype=field.dtype,
+            )
+            for field in calibrated
+        }
+        offsets = resolve_field_offsets(offsets)
+
+    # Step 5: Decode every schema field for all items in one vectorized pass
+    with session.step("read fields"):
+        records = decode_item_records(item_pid_map, item_table, offsets)
+    parse_errors = int((~records["valid"]).sum())
+    if parse_errors > 0:
+        print(f"  Skipped {parse_errors} items with unexpected data layout")
 
-    tool_rel_offset = calibrate_offset(
-        "isATool",
-        {k: (1 if v else 0) for k, v in TOOL_CALIBRATION.items()},
-        item_pid_map,
-        inv_items_by_pid,
-        search_range=range(100, 300),
-        read_fn=lambda raw, off: raw[off],
+    return ToolData(records, item_pid_map, offsets)
+
+
+def resolve_field_offsets(calibrated: dict[str, int], fields=ITEM_FIELDS) -> dict[str, int]:
+    """
+    Fill in the offsets of derived fields from their calibrated anchors.
+    Returns field name -> offset for every field in the schema.
+    """
+    offsets = dict(calibrated)
+    for field in fields:
+        if field.name not in offsets:
+            offsets[field.name] = offsets[field.relative_to] + field.delta
+    return offsets
+
+
+def item_record_dtype(fields=ITEM_FIELDS) -> "np.dtype":
+    """Structured dtype of the decoded InventoryItem records."""
+    import numpy as np
+
+    return np.dtype(
+        [("itemId", "<i4"), ("valid", "?")] + [(field.name, field.dtype) for field in fields]
     )
 
-    # Step 5: Extract tool flag and maxStack for all items
-    is_tool_map: dict[int, bool] = {}
-    max_stack_map: dict[int, int] = {}
-    parse_errors = 0
-    for item_id in range(len(item_names)):
-        pid = item_pid_map.get(item_id)
-        if not pid or pid not in inv_items_by_pid:
+
+def decode_item_records(
+    item_pid_map: dict[int, int],
+    item_table: dict[int, InventoryItemRecord],
+    offsets: dict[str, int],
+    fields=ITEM_FIELDS,
+) -> "np.ndarray":
+    """
+    Decode the schema fields of every mapped item into one structured array.
+
+    Only the bytes the schema covers are taken from each payload: they are
+    stacked into a zero-padded uint8 matrix (one row per item), and every
+    field is then read for all items at once as a column slice viewed as its
+    dtype. Rows whose payload is too short for any field are zeroed and
+    marked invalid.
+    """
+    import numpy as np
+
+    sizes = {field.name: np.dtype(field.dtype).itemsize for field in fields}
+    low = min(offsets[field.name] for field in fields)
+    width = max(offsets[field.name] + sizes[field.name] for field in fields) - low
+
+    item_ids, regions, lengths = [], [], []
+    for item_id, pid in sorted(item_pid_map.items()):
+        record = item_table.get(pid)
+        if record is None:
             continue
-        raw = inv_items_by_pid[pid]
-        try:
-            fixed_start = get_fixed_data_offset(raw)
-            if fixed_start + maxstack_rel_offset + 4 > len(raw):
-                parse_errors += 1
-                continue
+        start = record.fixed_start + low
+        region = record.raw[start : start + width] if start >= 0 else b""
+        item_ids.append(item_id)
+        lengths.append(len(region))
+        regions.append(region if len(region) == width else region.ljust(width, b"\0"))
+
+    records = np.zeros(len(item_ids), dtype=item_record_dtype(fields))
+    records["itemId"] = item_ids
+    matrix = np.frombuffer(b"".join(regions), dtype=np.uint8).reshape(len(item_ids), width)
+    lengths = np.array(lengths, dtype=np.int64)
+
+    valid = np.ones(len(item_ids), dtype=bool)
+    for field in fields:
+        column = offsets[field.name] - low
+        end = column + sizes[field.name]
+        valid &= lengths >= end
+        records[field.name] = np.ascontiguousarray(matrix[:, column:end]).view(field.dtype)[:, 0]
+
+    for field in fields:
+        records[field.name][~valid] = 0
+    records["valid"] = valid
+    return records
+
+
+class CalibrationEngine:
+    """
+    Vectorized offset search over the fixed-data regions of calibration items.
 
-            is_tool = raw[fixed_start + tool_rel_offset] == 1
-            max_stack = struct.unpack(
-                "<i",
-                raw[
-                    fixed_start + maxstack_rel_offset : fixed_start
-                    + maxstack_rel_offset
-                    + 4
-                ],
-            )[0]
-            is_tool_map[item_id] = is_tool
-            max_stack_map[item_id] = max_stack
-        except (struct.error, IndexError):
-            parse_errors += 1
+    Each item's region (from its fixed data start, `window` bytes long) is
+    loaded once into a zero-padded uint8 matrix. A field is then tested at
+    every candidate offset for every item in a single array comparison.
+    """
 
-    if parse_errors > 0:
-        print(f"  Skipped {parse_errors} items with unexpected data layout")
+    def __init__(
+        self,
+        item_pid_map: dict[int, int],
+        item_table: dict[int, InventoryItemRecord],
+        item_ids,
+        window: int,
+    ):
+        import numpy as np
+
+        self.item_ids = sorted(item_ids)
+        self.rows = {item_id: row for row, item_id in enumerate(self.item_ids)}
+        self.matrix = np.zeros((len(self.item_ids), window), dtype=np.uint8)
+        # Bytes actually available per item; -1 marks an unmapped item
+        self.lengths = np.full(len(self.item_ids), -1, dtype=np.int64)
+
+        for row, item_id in enumerate(self.item_ids):
+            record = item_table.get(item_pid_map.get(item_id))
+            if record is None:
+                continue
+            region = memoryview(record.raw)[record.fixed_start : record.fixed_start + window]
+            self.matrix[row, : len(region)] = np.frombuffer(region, dtype=np.uint8)
+            self.lengths[row] = len(region)
+
+    def find_offsets(
+        self, calibration: dict[int, int], search_range: range, dtype: str
+    ) -> list[int]:
+        """
+        Return every candidate offset where all calibration items hold their
+        expected value when read as `dtype` (e.g. "<i4", "u1").
+        """
+        import numpy as np
+
+        field = np.dtype(dtype)
+        rows = np.array([self.rows[item_id] for item_id in calibration])
+        if (self.lengths[rows] < 0).any():
+            return []
+
+        candidates = np.arange(search_range.start, search_range.stop, search_range.step)
+        candidates = candidates[candidates + field.itemsize <= self.matrix.shape[1]]
+
+        # (items, candidates, itemsize) byte windows -> (items, candidates) values
+        windows = np.lib.stride_tricks.sliding_window_view(
+            self.matrix[rows], field.itemsize, axis=1
+        )
+        values = np.ascontiguousarray(windows[:, candidates]).view(field)[..., 0]
+
+        expected = np.array(list(calibration.values()), dtype=field)
+        in_bounds = candidates[None, :] + field.itemsize <= self.lengths[rows][:, None]
+        matches = ((values == expected[:, None]) & in_bounds).all(axis=0)
+        return candidates[matches].tolist()
+
+    def find_pointer_offsets(self, search_range: range, targets) -> list[int]:
+        """
+        Return every candidate offset where all mapped items hold a PPtr into
+        the same file (m_FileID 0) whose m_PathID is one of `targets`.
+        """
+        import numpy as np
+
+        pptr = np.dtype([("file_id", "<i4"), ("path_id", "<i8")])
+        rows = np.flatnonzero(self.lengths >= 0)
+        if not len(rows):
+            return []
+
+        candidates = np.arange(search_range.start, search_range.stop, search_range.step)
+        candidates = candidates[candidates + pptr.itemsize <= self.matrix.shape[1]]
+
+        windows = np.lib.stride_tricks.sliding_window_view(
+            self.matrix[rows], pptr.itemsize, axis=1
+        )
+        values = np.ascontiguousarray(windows[:, candidates]).view(pptr)[..., 0]
 
-    return is_tool_map, max_stack_map
+        known = np.fromiter(targets, dtype=np.int64)
+        in_bounds = candidates[None, :] + pptr.itemsize <= self.lengths[rows][:, None]
+        points = (values["file_id"] == 0) & np.isin(values["path_id"], known)
+        matches = (points & in_bounds).all(axis=0)
+        return candidates[matches].tolist()
 
 
 def calibrate_offset(
+    engine: CalibrationEngine,
     field_name: str,
     calibration: dict[int, int],
-    item_pid_map: dict[int, int],
-    inv_items_by_pid: dict[int, bytes],
     search_range: range,
-    read_fn,
+    dtype: str,
 ) -> int:
     """
     Auto-discover a binary field offset by testing candidate offsets against
     items with known values. Returns offset relative to fixed data start.
     """
-    for candidate in search_range:
-        all_match = True
-        for item_id, expected in calibration.items():
-            pid = item_pid_map.get(item_id)
-            if not pid or pid not in inv_items_by_pid:
-                all_match = False
-                break
-            raw = inv_items_by_pid[pid]
-            fixed_start = get_fixed_data_offset(raw)
-            abs_offset = fixed_start + candidate
-            if abs_offset + 4 > len(raw):
-                all_match = False
-                break
-            val = read_fn(raw, abs_offset)
-            if val != expected:
-                all_match = False
-                break
-        if all_match:
-            print(f"  Calibrated {field_name} offset: +{candidate} from fixed data start")
-            return candidate
+    offsets = engine.find_offsets(calibration, search_range, dtype)
+    if offsets:
+        candidate = offsets[0]
+        print(f"  Calibrated {field_name} offset: +{candidate} from fixed data start")
+        if len(offsets) > 1:
+            others = ", ".join(f"+{o}" for o in offsets[1:])
+            print(f"  (also matched at {others}; using the first)")
+        return candidate
 
     print(f"ERROR: Could not calibrate {field_name} offset.")
     print(f"  The game may have been updated with a different data layout.")
@@ -359,7 +1149,7 @@ def calibrate_offset(
 # --- Game version from WorldManager ---
 
 
-def extract_game_version(game_dir: Path) -> str | None:
+def extract_game_version(session: AssetSession) -> str | None:
     """
     Extract the game version from the WorldManager singleton in level0.
 
@@ -367,84 +1157,619 @@ def extract_game_version(game_dir: Path) -> str | None:
     showVersionNumber script. The "1." prefix is hardcoded; masterVersionNumber
     and versionNumber are the first two int32 instance fields on WorldManager.
     """
-    import UnityPy
-
-    gg_path = find_game_file(game_dir, "globalgamemanagers.assets")
-    genv = UnityPy.load(str(gg_path))
-
-    wm_script_pid = None
-    for obj in genv.objects:
-        if obj.type.name == "MonoScript":
-            raw = obj.get_raw_data()
-            name_len = struct.unpack("<I", raw[0:4])[0]
-            if name_len < 200:
-                name = raw[4 : 4 + name_len].decode("utf-8", errors="replace")
-                if name == "WorldManager":
-                    wm_script_pid = obj.path_id
-                    break
-
+    wm_script_pid = session.script_pid("WorldManager")
     if wm_script_pid is None:
         print("  WARNING: Could not find WorldManager MonoScript")
         return None
 
-    level_path = find_game_file(game_dir, "level0")
-    lenv = UnityPy.load(str(level_path))
-
-    for obj in lenv.objects:
-        if obj.type.name != "MonoBehaviour":
-            continue
-        raw = obj.get_raw_data()
+    for obj in session.behaviours("level0", wm_script_pid):
+        raw = session.raw(obj)
         if len(raw) < 36:
             continue
-        script_path_id = struct.unpack("<q", raw[20:28])[0]
-        if script_path_id != wm_script_pid:
-            continue
-
-        # Skip MonoBehaviour header (28 bytes) + m_Name string
-        pos = 28
-        pos = skip_unity_string(raw, pos)
 
-        # First two int32 fields: versionNumber, masterVersionNumber
-        if pos + 8 > len(raw):
+        # Skip MonoBehaviour header (28 bytes) + m_Name string, then read the
+        # first two int32 fields: versionNumber, masterVersionNumber
+        reader = BinaryReader(raw, MONO_HEADER_SIZE)
+        try:
+            reader.skip_string()
+            version_number = reader.i32()
+            master_version = reader.i32()
+        except struct.error:
             print("  WARNING: WorldManager data too short")
             return None
 
-        version_number = struct.unpack("<i", raw[pos : pos + 4])[0]
-        master_version = struct.unpack("<i", raw[pos + 4 : pos + 8])[0]
         return f"1.{master_version}.{version_number}"
 
     print("  WARNING: Could not find WorldManager instance in level0")
     return None
 
 
+# --- Phase 2.6: Item icons (--icons) ---
+
+# Each sprite is scaled to fit an ICON_SIZE square and packed on a grid into
+# atlases of at most ATLAS_SIZE x ATLAS_SIZE
+ICON_SIZE = 64
+ATLAS_SIZE = 2048
+ATLAS_FORMAT = "webp"  # lossless
+ATLAS_GLOB = f"icons-*.{ATLAS_FORMAT}"
+ICONS_DIR = Path(__file__).parent.parent / "static" / "item-icons"
+NO_ICON = 0xFFFF  # atlas index sentinel for items without an icon
+
+# What UnityPy and Pillow raise for a sprite they can't decode: unsupported
+# texture formats, sprites without image data or UVs, missing or truncated
+# .resS streams
+SPRITE_DECODE_ERRORS = (NotImplementedError, ValueError, OSError, EOFError, struct.error)
+
+# Where InventoryItem.itemSprite may sit, relative to fixed data start
+SPRITE_SEARCH_RANGE = range(0, CALIBRATION_WINDOW, 4)
+
+
+def locate_sprite_offset(
+    item_pid_map: dict[int, int],
+    item_table: dict[int, InventoryItemRecord],
+    sprite_pids: set[int],
+) -> int | None:
+    """
+    Find the itemSprite PPtr in the InventoryItem fixed data.
+
+    Like allItems, it is located by structure rather than a hardcoded offset:
+    the first 4-aligned offset where every calibration item holds a PPtr to
+    a Sprite in sharedassets0. Returns the offset of the PPtr, or None.
+    """
+    engine = CalibrationEngine(
+        item_pid_map,
+        item_table,
+        item_ids=STACK_CALIBRATION.keys() | TOOL_CALIBRATION.keys(),
+        window=CALIBRATION_WINDOW,
+    )
+    offsets = engine.find_pointer_offsets(SPRITE_SEARCH_RANGE, sprite_pids)
+    if not offsets:
+        return None
+    print(f"  Located itemSprite PPtr: +{offsets[0]} from fixed data start")
+    if len(offsets) > 1:
+        others = ", ".join(f"+{o}" for o in offsets[1:])
+        print(f"  (also matched at {others}; using the first)")
+    return offsets[0]
+
+
+def find_unitypy_assets(env, filename: str):
+    """The SerializedFile named `filename` in a UnityPy environment, looking inside bundles."""
+    pending = list(env.files.items())
+    while pending:
+        name, file = pending.pop()
+        if hasattr(file, "objects"):  # a SerializedFile
+            if Path(name).name == filename:
+                return file
+        else:
+            pending.extend(getattr(file, "files", {}).items())
+    return None
+
+
+def decode_sprites(path: Path, filename: str, sprite_pids) -> dict[int, "Image.Image"]:
+    """
+    Decode Sprite objects to RGBA images with UnityPy (which also reads the
+    textures they cut from, including .resS streams). Returns path_id -> image;
+    sprites that can't be decoded are left out.
+    """
+    import UnityPy
+
+    env = UnityPy.load(str(path))
+    assets = find_unitypy_assets(env, filename)
+    if assets is None:
+        print(f"  WARNING: {filename} not found in {path.name}")
+        return {}
+
+    images = {}
+    failed = 0
+    for pid in sorted(sprite_pids):
+        obj = assets.objects.get(pid)
+        if obj is None:
+            failed += 1
+            continue
+        try:
+            images[pid] = obj.read().image
+        except SPRITE_DECODE_ERRORS:
+            failed += 1
+    if failed:
+        print(f"  Skipped {failed} sprites that couldn't be decoded")
+    return images
+
+
+def pack_icon_atlases(
+    images: dict[int, "Image.Image"], icon_size: int = ICON_SIZE, atlas_size: int = ATLAS_SIZE
+) -> tuple[list["Image.Image"], dict[int, tuple[int, int, int, int, int]]]:
+    """
+    Scale each image to fit an icon_size square (keeping its aspect ratio,
+    never enlarging) and pack them row by row into atlas_size atlases; the
+    last atlas is cut to the rows it uses.
+
+    Returns (atlases, path_id -> (atlas index, x, y, width, height)).
+    """
+    from PIL import Image
+
+    per_row = atlas_size // icon_size
+    per_atlas = per_row * per_row
+    atlas_count = -(-len(images) // per_atlas)
+    atlases = []
+    for index in range(atlas_count):
+        cells = min(per_atlas, len(images) - index * per_atlas)
+        height = -(-cells // per_row) * icon_size
+        atlases.append(Image.new("RGBA", (atlas_size, height), (0, 0, 0, 0)))
+
+    rects = {}
+    for i, (pid, image) in enumerate(sorted(images.items())):
+        index, cell = divmod(i, per_atlas)
+        icon = image.convert("RGBA")
+        icon.thumbnail((icon_size, icon_size), Image.LANCZOS)
+        x, y = cell % per_row * icon_size, cell // per_row * icon_size
+        atlases[index].paste(icon, (x, y))
+        rects[pid] = (index, x, y, icon.width, icon.height)
+    return atlases, rects
+
+
+def write_icon_atlases(atlases: list["Image.Image"], icons_dir: Path) -> list[dict]:
+    """
+    Save atlases as lossless WebP named by a hash of their contents, so a
+    changed atlas gets a new URL and browsers can cache them indefinitely.
+    Atlases from earlier runs that are no longer used are removed.
+
+    Returns [{"file", "width", "height", "sha256"}] in atlas order.
+    """
+    icons_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for atlas in atlases:
+        buffer = io.BytesIO()
+        atlas.save(buffer, ATLAS_FORMAT.upper(), lossless=True)
+        data = buffer.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        filename = ATLAS_GLOB.replace("*", digest[:16])
+        (icons_dir / filename).write_bytes(data)
+        written.append(
+            {"file": filename, "width": atlas.width, "height": atlas.height, "sha256": digest}
+        )
+
+    keep = {entry["file"] for entry in written}
+    for path in icons_dir.glob(ATLAS_GLOB):
+        if path.name not in keep:
+            path.unlink()
+    return written
+
+
+def atlases_present(atlases: list[dict], icons_dir: Path) -> bool:
+    """Whether every atlas of a cached icons result is on disk unchanged."""
+    for entry in atlases:
+        path = icons_dir / entry["file"]
+        if not path.is_file() or hashlib.sha256(path.read_bytes()).hexdigest() != entry["sha256"]:
+            return False
+    return True
+
+
+def extract_item_icons(
+    session: AssetSession, item_pid_map: dict[int, int], icons_dir: Path
+) -> dict:
+    """
+    Follow each InventoryItem's itemSprite to its Sprite in sharedassets0,
+    decode the sprites (deduplicated, items often share one) and pack them
+    into icon atlases written to icons_dir.
+
+    Returns {"spriteOffset", "atlases": [...], "icons": {item_id: [atlas,
+    x, y, w, h]}}; empty if the sprite reference can't be located.
+    """
+    import numpy as np
+
+    with session.step("find scripts"):
+        inv_script_pid = session.script_pid("InventoryItem")
+    if inv_script_pid is None:
+        print("ERROR: Could not find InventoryItem MonoScript")
+        sys.exit(1)
+
+    with session.step("collect items"):
+        _, item_table = collect_item_records(session, inv_script_pid)
+        sprite_pids = {obj.path_id for obj in session.objects("sharedassets0.assets", "Sprite")}
+    # UnityPy loads the file again for the sprites themselves
+    session.release("sharedassets0.assets")
+    print(f"  Found {len(sprite_pids)} Sprite objects")
+
+    empty = {"spriteOffset": None, "atlases": [], "icons": {}}
+    with session.step("locate itemSprite"):
+        offset = locate_sprite_offset(item_pid_map, item_table, sprite_pids)
+    if offset is None:
+        print("  WARNING: Could not locate the itemSprite reference; skipping icons")
+        return empty
+
+    with session.step("read sprite refs"):
+        # The whole PPtr: sprite_pids are only valid for m_FileID 0 (sharedassets0
+        # itself); a reference into another file could share a path_id
+        fields = (ItemField("spriteFile", "<i4"), ItemField("sprite", "<i8"))
+        records = decode_item_records(
+            item_pid_map, item_table, {"spriteFile": offset, "sprite": offset + 4}, fields=fields
+        )
+        records = records[records["valid"] & (records["sprite"] != 0)]
+        external = records["spriteFile"] != 0
+        records = records[~external & np.isin(records["sprite"], list(sprite_pids))]
+    if external.any():
+        print(f"  Skipped {int(external.sum())} items whose sprite is in another file")
+    print(f"  {len(records)} items reference {len(set(records['sprite'].tolist()))} sprites")
+
+    with session.step("decode sprites"):
+        path = find_game_file(session.game_dir, "sharedassets0.assets")
+        images = decode_sprites(path, "sharedassets0.assets", set(records["sprite"].tolist()))
+
+    with session.step("pack atlases"):
+        atlases, rects = pack_icon_atlases(images)
+        written = write_icon_atlases(atlases, icons_dir)
+    icons = {
+        str(item_id): list(rects[pid])
+        for item_id, pid in zip(records["itemId"].tolist(), records["sprite"].tolist())
+        if pid in rects
+    }
+    return {"spriteOffset": offset, "atlases": written, "icons": icons}
+
+
+# --- Extraction cache ---
+
+CACHE_PATH = Path(__file__).parent / ".extract-cache.json"
+
+# Game files each phase reads
+NAME_INPUTS = ("resources.assets",)
+TOOL_INPUTS = ("globalgamemanagers.assets", "sharedassets0.assets", "level0")
+VERSION_INPUTS = ("globalgamemanagers.assets", "level0")
+
+
+class ExtractionCache:
+    """
+    On-disk cache of phase results, keyed by the game files each phase reads.
+
+    Every file is fingerprinted by size, mtime and SHA-256 of its contents.
+    The hash is only recomputed when size or mtime changed, so a rerun
+    against an unchanged install does no hashing at all. A phase result is
+    reused when the content hashes of all its inputs (and its parameters)
+    match the ones it was stored with.
+
+    With path=None the cache is disabled; with rebuild=True stored results
+    are ignored but new ones are still written.
+    """
+
+    def __init__(self, path: Path | None, game_dir: Path, rebuild: bool = False):
+        self.path = path
+        self.game_dir = game_dir
+        self.rebuild = rebuild
+        self._data = {"scriptVersion": SCRIPT_VERSION, "files": {}, "phases": {}}
+        self._hashes: dict[str, str] = {}
+
+        if path is not None and path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            if data and data.get("scriptVersion") == SCRIPT_VERSION:
+                self._data = data
+
+    def _file_hash(self, filename: str) -> str:
+        if filename in self._hashes:
+            return self._hashes[filename]
+
+        path = find_game_file(self.game_dir, filename)
+        stat = path.stat()
+        key = str(path.resolve())
+        known = self._data["files"].get(key)
+        if known and known["size"] == stat.st_size and known["mtimeNs"] == stat.st_mtime_ns:
+            digest = known["sha256"]
+        else:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._data["files"][key] = {
+                "size": stat.st_size,
+                "mtimeNs": stat.st_mtime_ns,
+                "sha256": digest,
+            }
+
+        self._hashes[filename] = digest
+        return digest
+
+    def _key(self, inputs: tuple[str, ...], params: dict | None) -> dict:
+        return {
+            "inputs": {name: self._file_hash(name) for name in inputs},
+            "params": params or {},
+        }
+
+    def load(self, phase: str, inputs: tuple[str, ...], params: dict | None = None):
+        """Return the stored result of a phase, or None if it's missing or stale."""
+        if self.path is None or self.rebuild:
+            return None
+        entry = self._data["phases"].get(phase)
+        if entry is None or entry["key"] != self._key(inputs, params):
+            return None
+        return entry["data"]
+
+    def store(self, phase: str, inputs: tuple[str, ...], data, params: dict | None = None):
+        """Record the JSON-serializable result of a phase."""
+        if self.path is None:
+            return
+        self._data["phases"][phase] = {"key": self._key(inputs, params), "data": data}
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+# --- Phase scheduling ---
+
+# phase -> (progress heading, game files it reads)
+PHASES = {
+    "names": ("Phase 1: Extracting item names...", NAME_INPUTS),
+    "tools": ("Phase 2: Extracting tool and stack data...", TOOL_INPUTS),
+    "version": ("Phase 2.5: Extracting game version...", VERSION_INPUTS),
+}
+
+
+def phase_params(phase: str) -> dict | None:
+    """Settings a phase result depends on besides its input files."""
+    if phase == "tools":
+        # The cached record columns follow the field schema
+        return {"itemFields": [[field.name, field.dtype] for field in ITEM_FIELDS]}
+    return None
+
+
+# One session per worker process, reused by every phase it runs
+_worker_sessions: dict[Path, AssetSession] = {}
+
+
+def run_phase(session: AssetSession, phase: str):
+    """Run one extraction phase and return its result in cacheable JSON form."""
+    with session.step(phase):
+        if phase == "names":
+            return {str(k): v for k, v in extract_item_names(session).items()}
+        if phase == "tools":
+            return extract_tool_data(session).to_json()
+        if phase == "version":
+            return {"gameVersion": extract_game_version(session)}
+    raise ValueError(f"Unknown phase: {phase}")
+
+
+def summarize_phase(phase: str, result) -> str:
+    """One-line summary of a phase result, printed after its progress output."""
+    if phase == "names":
+        return f"  Extracted {len(result)} item names"
+    if phase == "tools":
+        columns = result["records"]
+        decoded = [row for row, valid in enumerate(columns["valid"]) if valid]
+        tool_count = sum(1 for row in decoded if columns["isATool"][row] == 1)
+        return f"  Found {tool_count} tools, extracted maxStack for {len(decoded)} items"
+    if phase == "version":
+        if result["gameVersion"]:
+            return f"  Detected game version: {result['gameVersion']}"
+        return "  Could not detect game version (use --game-version to set manually)"
+    raise ValueError(f"Unknown phase: {phase}")
+
+
+def run_phase_worker(
+    game_dir: Path, phase: str, profile: bool = False
+) -> tuple[object, str, float, int, list[dict]]:
+    """
+    Process-pool entry point for run_phase.
+
+    Progress output is captured so the parent can print it in phase order.
+    Returns (result, log, wall_seconds, exit_code, profile_steps); result is
+    None if the phase called sys.exit, profile_steps is empty unless profiling.
+    """
+    session = _worker_sessions.setdefault(game_dir, AssetSession(game_dir))
+    session.profiler = Profiler() if profile else None
+    session.expect(*PHASES[phase][1])
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        try:
+            result = run_phase(session, phase)
+            code = 0
+        except SystemExit as e:
+            result, code = None, e.code if isinstance(e.code, int) else 1
+        finally:
+            session.release(*PHASES[phase][1])
+    steps = session.profiler.steps if profile else []
+    return result, log.getvalue(), time.perf_counter() - start, code, steps
+
+
+def run_phases(
+    game_dir: Path,
+    phases: list[str],
+    cache: ExtractionCache,
+    jobs: int,
+    profiler: Profiler | None = None,
+) -> tuple[dict[str, object], dict[str, float]]:
+    """
+    Run the given phases, serving unchanged ones from the cache.
+
+    With jobs > 1 the uncached phases run concurrently in a process pool.
+    Output is printed and results are returned in phase order either way, so
+    parallel and serial runs produce the same results. Each game file is
+    released once the last phase that reads it has finished. With a profiler, each
+    phase's steps are recorded into it, including those run by workers.
+
+    Returns (phase -> JSON result, phase -> wall seconds).
+    """
+    results: dict[str, object] = {}
+    timings: dict[str, float] = {}
+    pending = []
+    for phase in phases:
+        cached = cache.load(phase, PHASES[phase][1], phase_params(phase))
+        if cached is not None:
+            results[phase] = cached
+            timings[phase] = 0.0
+        else:
+            pending.append(phase)
+
+    futures = {}
+    if jobs > 1 and len(pending) > 1:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(pending)))
+        futures = {
+            phase: pool.submit(run_phase_worker, game_dir, phase, profiler is not None)
+            for phase in pending
+        }
+        pool.shutdown(wait=False)
+
+    session = AssetSession(game_dir)
+    session.profiler = profiler
+    session.expect(*(name for phase in pending if phase not in futures for name in PHASES[phase][1]))
+    for phase in phases:
+        print(PHASES[phase][0])
+        if phase not in pending:
+            if profiler is not None:
+                profiler.add_cached(phase)
+            print("  Using cached result (inputs unchanged)")
+            print(summarize_phase(phase, results[phase]))
+            print()
+            continue
+
+        if phase in futures:
+            result, log, elapsed, code, steps = futures[phase].result()
+            print(log, end="")
+            if code:
+                sys.exit(code)
+            if profiler is not None:
+                profiler.steps.extend(steps)
+        else:
+            start = time.perf_counter()
+            result = run_phase(session, phase)
+            elapsed = time.perf_counter() - start
+            # Free the files no later phase in this process reads
+            remaining = [p for p in pending[pending.index(phase) + 1 :] if p not in futures]
+            needed = {name for p in remaining for name in PHASES[p][1]}
+            session.release(*(name for name in PHASES[phase][1] if name not in needed))
+
+        print(summarize_phase(phase, result))
+        print(f"  ({elapsed:.2f}s)")
+        print()
+        cache.store(phase, PHASES[phase][1], result, phase_params(phase))
+        results[phase] = result
+        timings[phase] = elapsed
+
+    return results, timings
+
+
+# Icons follow tool data (they need its item -> path_id map), so they run
+# after the other phases; textures may be streamed from a .resS file
+ICON_INPUTS = TOOL_INPUTS
+ICON_RESOURCE = "sharedassets0.assets.resS"
+
+
+def run_icons_phase(
+    game_dir: Path,
+    item_pid_map: dict[int, int],
+    icons_dir: Path,
+    cache: ExtractionCache,
+    profiler: Profiler | None = None,
+) -> dict:
+    """
+    Run the icons phase unless the cache holds a result for unchanged inputs
+    whose atlases are still in icons_dir. Returns the extract_item_icons result.
+    """
+    inputs = ICON_INPUTS
+    if next(game_dir.rglob(ICON_RESOURCE), None) is not None:
+        inputs += (ICON_RESOURCE,)
+    params = {"iconSize": ICON_SIZE, "atlasSize": ATLAS_SIZE, "format": ATLAS_FORMAT}
+
+    print("Phase 2.6: Extracting item icons...")
+    result = cache.load("icons", inputs, params)
+    if result is not None and atlases_present(result["atlases"], icons_dir):
+        if profiler is not None:
+            profiler.add_cached("icons")
+        print("  Using cached atlases (sprites unchanged)")
+    else:
+        session = AssetSession(game_dir)
+        session.profiler = profiler
+        # level0 is only part of the cache key; the item map comes from Phase 2
+        session.expect("globalgamemanagers.assets", "sharedassets0.assets")
+        start = time.perf_counter()
+        with session.step("icons"):
+            result = extract_item_icons(session, item_pid_map, icons_dir)
+        session.release(*inputs)
+        for entry in result["atlases"]:
+            print(f"  Wrote {icons_dir / entry['file']} ({entry['width']}x{entry['height']})")
+        print(f"  ({time.perf_counter() - start:.2f}s)")
+        cache.store("icons", inputs, result, params)
+    print(f"  {len(result['icons'])} items with icons in {len(result['atlases'])} atlases")
+    print()
+    return result
+
+
 # --- Output ---
 
 
+def item_durability(records: "np.ndarray", count: int) -> "np.ndarray":
+    """
+    Max durability column indexed by item ID, NO_DURABILITY where none.
+
+    1. isATool items with positive maxStack (the game stores durability in
+       the maxStack field for tools)
+    2. Manual overrides for items whose durability isn't in maxStack
+    """
+    import numpy as np
+
+    durability = np.full(count, NO_DURABILITY, dtype=np.int64)
+    rows = records[records["valid"] & (records["itemId"] < count)]
+    tools = rows[(rows["isATool"] == 1) & (rows["maxStack"] > 0)]
+    durability[tools["itemId"]] = tools["maxStack"]
+    for item_id, value in DURABILITY_OVERRIDES.items():
+        if item_id < count:
+            durability[item_id] = value
+    return durability
+
+
+def item_icon_rects(icons: dict | None, count: int) -> "np.ndarray":
+    """
+    Icon column indexed by item ID: a (count, 5) uint16 array of (atlas, x,
+    y, width, height), with atlas NO_ICON for items without an icon.
+    `icons` is the icons phase result (None if it didn't run).
+    """
+    import numpy as np
+
+    rects = np.zeros((count, 5), dtype=np.uint16)
+    rects[:, 0] = NO_ICON
+    for item_id, rect in (icons or {}).get("icons", {}).items():
+        if int(item_id) < count:
+            rects[int(item_id)] = rect
+    return rects
+
+
+def icons_meta(icons: dict) -> dict:
+    """Atlas list for the output meta: what the browser needs to draw icons."""
+    atlases = [
+        {"file": entry["file"], "width": entry["width"], "height": entry["height"]}
+        for entry in icons["atlases"]
+    ]
+    return {"size": ICON_SIZE, "atlases": atlases}
+
+
 def build_output(
     item_names: dict[int, str],
-    is_tool_map: dict[int, bool],
-    max_stack_map: dict[int, int],
+    durability: "np.ndarray",
     game_version: str | None,
+    icons: dict | None = None,
 ) -> dict:
-    """Build the final JSON structure."""
+    """
+    Build the final JSON structure from the names and durability column.
+    With an icons phase result, items with an icon get "icon": [atlas, x, y,
+    width, height] and meta lists the atlases.
+    """
     items = {}
     durability_count = 0
+    icon_map = icons["icons"] if icons else {}
     for item_id in sorted(item_names.keys()):
         entry: dict = {"name": item_names[item_id]}
-        is_tool = is_tool_map.get(item_id, False)
-        max_stack = max_stack_map.get(item_id)
-
-        # Determine max durability:
-        # 1. Manual overrides for items whose durability isn't in maxStack
-        # 2. isATool items with positive maxStack (the game stores durability
-        #    in the maxStack field for tools)
-        if item_id in DURABILITY_OVERRIDES:
-            entry["maxDurability"] = DURABILITY_OVERRIDES[item_id]
-            durability_count += 1
-        elif is_tool and max_stack is not None and max_stack > 0:
-            entry["maxDurability"] = max_stack
+        if durability[item_id] != NO_DURABILITY:
+            entry["maxDurability"] = int(durability[item_id])
             durability_count += 1
-
+        if str(item_id) in icon_map:
+            entry["icon"] = icon_map[str(item_id)]
         items[str(item_id)] = entry
 
     meta: dict = {
@@ -455,10 +1780,179 @@ def build_output(
     }
     if game_version:
         meta["gameVersion"] = game_version
+    if icons is not None:
+        meta["icons"] = icons_meta(icons)
 
     return {"meta": meta, "items": items}
 
 
+# Compact artifacts written next to the main JSON output: dense, id-indexed
+# columns (items.json -> items.min.json) and the item picker's name index
+# (items.search.json); see utils/items.ts for the matching loaders.
+COMPACT_SUFFIX = ".min.json"
+SEARCH_SUFFIX = ".search.json"
+NO_DURABILITY = 0  # maxDurability sentinel for items without durability
+
+# Longest n-gram with a posting list in the search index
+SEARCH_GRAM = 3
+
+
+def build_columnar_output(
+    meta: dict,
+    item_names: dict[int, str],
+    durability: "np.ndarray",
+    icon_rects: "np.ndarray | None" = None,
+) -> dict:
+    """
+    Dense columns indexed by item ID: `names[id]` is the item name ("" for
+    unused IDs) and `maxDurability[id]` its durability, or NO_DURABILITY if
+    it has none. `durability` is the item_durability column. With icons,
+    `iconRects[5 * id : 5 * id + 5]` is the item's (atlas, x, y, width,
+    height), atlas NO_ICON if it has none (see item_icon_rects).
+    """
+    names = [""] * len(durability)
+    for item_id, name in item_names.items():
+        names[item_id] = name
+    columns = {"meta": meta, "names": names, "maxDurability": durability}
+    if icon_rects is not None:
+        columns["iconRects"] = icon_rects.reshape(-1)
+    return columns
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Lowercase, strip accents and collapse whitespace; must match
+    normalizeSearchText in utils/items.ts.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+def build_search_index(item_names: dict[int, str]) -> dict:
+    """
+    Precomputed index for substring search in the item picker:
+
+      - ids: item IDs sorted by normalized name (then ID)
+      - names: the normalized names, in the same order
+      - grams: every 1- to SEARCH_GRAM-character substring -> the ascending
+        positions in `ids` of the names containing it, delta-encoded
+
+    A query of up to SEARCH_GRAM characters is answered by its own posting
+    list; a longer one by intersecting the lists of its trigrams, starting
+    from the shortest, and checking the hits against `names`. Either way the
+    work follows the matches, not the number of items.
+    """
+    entries = sorted(
+        (normalize_search_text(name), item_id) for item_id, name in item_names.items() if name
+    )
+    postings: dict[str, list[int]] = {}
+    for position, (key, _) in enumerate(entries):
+        grams = {
+            key[start : start + size]
+            for size in range(1, SEARCH_GRAM + 1)
+            for start in range(len(key) - size + 1)
+        }
+        for gram in grams:
+            postings.setdefault(gram, []).append(position)
+
+    return {
+        "ids": [item_id for _, item_id in entries],
+        "names": [key for key, _ in entries],
+        "grams": {
+            gram: [hits[0]] + [b - a for a, b in zip(hits, hits[1:])]
+            for gram, hits in sorted(postings.items())
+        },
+    }
+
+
+def write_outputs(output: dict, columns: dict, search: dict, output_path: Path) -> list[Path]:
+    """Write items.json plus its minified columnar variant and search index."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    compact_path = output_path.with_name(output_path.stem + COMPACT_SUFFIX)
+    search_path = output_path.with_name(output_path.stem + SEARCH_SUFFIX)
+    compact = {**columns, "maxDurability": columns["maxDurability"].tolist()}
+    if "iconRects" in columns:
+        compact["iconRects"] = columns["iconRects"].tolist()
+    for path, data in ((compact_path, compact), (search_path, search)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.write("\n")
+
+    return [output_path, compact_path, search_path]
+
+
+# --- Profiling report ---
+
+PROFILE_SUFFIX = ".profile.json"
+
+
+def print_profile(steps: list[dict]) -> None:
+    """Print recorded profiler steps as an indented table."""
+    print("Profile:")
+    print(
+        f"  {'step':<36} {'wall':>8} {'cpu':>8} {'objects':>8} "
+        f"{'raw calls':>9} {'read MB':>8} {'peak RSS':>9}"
+    )
+    for entry in steps:
+        depth = entry["step"].count("/")
+        name = "  " * depth + entry["step"].rsplit("/", 1)[-1]
+        if entry.get("cached"):
+            print(f"  {name:<36} {'(cached)':>8}")
+            continue
+        rss = f"{entry['peakRss'] / 1e6:.0f} MB" if entry["peakRss"] is not None else "-"
+        print(
+            f"  {name:<36} {entry['wall']:>7.3f}s {entry['cpu']:>7.3f}s {entry['objects']:>8} "
+            f"{entry['rawCalls']:>9} {entry['bytesRead'] / 1e6:>8.1f} {rss:>9}"
+        )
+    peak, largest = peak_profile_rss(steps), largest_asset(steps)
+    if peak is not None and largest is not None:
+        print(
+            f"  Peak RSS {peak / 1e6:.0f} MB; largest asset file loaded: "
+            f"{largest['file']} ({largest['size'] / 1e6:.0f} MB)"
+        )
+    print()
+
+
+def peak_profile_rss(steps: list[dict]) -> int | None:
+    """Highest peak RSS recorded by any step (any process), or None."""
+    rss_values = [entry["peakRss"] for entry in steps if entry["peakRss"] is not None]
+    return max(rss_values) if rss_values else None
+
+
+def largest_asset(steps: list[dict]) -> dict | None:
+    """The biggest game file loaded during the profiled run, as {"file", "size"}."""
+    loads = [entry for entry in steps if "fileSize" in entry]
+    if not loads:
+        return None
+    entry = max(loads, key=lambda e: e["fileSize"])
+    name = entry["step"].rsplit("/", 1)[-1].removeprefix("load ")
+    return {"file": name, "size": entry["fileSize"]}
+
+
+def write_profile_report(steps: list[dict], output_path: Path, jobs: int) -> Path:
+    """Write the profile as JSON next to the output file. Returns its path."""
+    report = {
+        "scriptVersion": SCRIPT_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "jobs": jobs,
+        "peakRss": peak_profile_rss(steps),
+        "largestAsset": largest_asset(steps),
+        "steps": steps,
+    }
+    report_path = output_path.with_name(output_path.stem + PROFILE_SUFFIX)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    return report_path
+
+
 def validate_output(output: dict) -> list[str]:
     """Sanity-check the extracted data."""
     warnings = []
@@ -517,12 +2011,59 @@ def main():
         default=None,
         help="Override auto-detected game version (e.g. 1.0.7)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the extraction cache",
+    )
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Ignore cached results and re-run every phase (the cache is refreshed)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run independent phases in up to N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall/CPU time, objects, raw reads and peak RSS per phase and step",
+    )
+    parser.add_argument(
+        "--profile-report",
+        action="store_true",
+        help=f"Also write the profile as JSON next to the output ({PROFILE_SUFFIX})",
+    )
+    parser.add_argument(
+        "--icons",
+        action="store_true",
+        help="Also extract item icons into atlases (needs UnityPy and Pillow)",
+    )
+    parser.add_argument(
+        "--icons-dir",
+        type=Path,
+        default=ICONS_DIR,
+        help="Where to write the icon atlases (default: ../static/item-icons)",
+    )
     args = parser.parse_args()
 
     if not args.game_dir.exists():
         print(f"ERROR: Game directory not found: {args.game_dir}")
         sys.exit(1)
 
+    if args.icons:
+        try:
+            import PIL  # noqa: F401
+            import UnityPy  # noqa: F401
+        except ImportError as e:
+            print(f"ERROR: --icons needs UnityPy and Pillow ({e.name} is not installed)")
+            print("  Install them with: pip install unitypy pillow")
+            sys.exit(1)
+
     output_path = args.output or (Path(__file__).parent.parent / "data" / "items.json")
 
     print(f"Dinkum Item Data Extractor v{SCRIPT_VERSION}")
@@ -530,49 +2071,71 @@ def main():
     print(f"Output: {output_path}")
     print()
 
-    print("Phase 1: Extracting item names...")
-    item_names = extract_item_names(args.game_dir)
-    print(f"  Extracted {len(item_names)} item names")
-    print()
-
-    print("Phase 2: Extracting tool and stack data...")
-    is_tool_map, max_stack_map = extract_tool_data(args.game_dir, item_names)
-    tool_count = sum(1 for v in is_tool_map.values() if v)
-    print(f"  Found {tool_count} tools, extracted maxStack for {len(max_stack_map)} items")
-    print()
+    cache = ExtractionCache(
+        None if args.no_cache else CACHE_PATH, args.game_dir, rebuild=args.rebuild_cache
+    )
 
-    game_version = args.game_version
-    if not game_version:
-        print("Phase 2.5: Extracting game version...")
-        game_version = extract_game_version(args.game_dir)
-        if game_version:
-            print(f"  Detected game version: {game_version}")
-        else:
-            print("  Could not detect game version (use --game-version to set manually)")
+    phases = ["names", "tools"]
+    if args.game_version:
+        print(f"Using provided game version: {args.game_version}")
+        print()
     else:
-        print(f"Using provided game version: {game_version}")
-    print()
+        phases.append("version")
 
-    print("Phase 3: Building output...")
-    output = build_output(item_names, is_tool_map, max_stack_map, game_version)
+    profiler = Profiler() if args.profile or args.profile_report else None
+    start = time.perf_counter()
+    results, timings = run_phases(args.game_dir, phases, cache, args.jobs, profiler)
+    extract_seconds = time.perf_counter() - start
 
-    warnings = validate_output(output)
-    if warnings:
-        print("  WARNINGS:")
-        for w in warnings:
-            print(f"    - {w}")
-    else:
-        print("  All validation checks passed")
+    item_names = {int(k): v for k, v in results["names"].items()}
+    tool_data = ToolData.from_json(results["tools"])
+    game_version = args.game_version or results["version"]["gameVersion"]
+
+    phase_times = ", ".join(f"{phase} {timings[phase]:.2f}s" for phase in phases)
+    print(f"Extraction took {extract_seconds:.2f}s ({phase_times})")
     print()
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    icons = None
+    if args.icons:
+        icons = run_icons_phase(
+            args.game_dir, tool_data.item_pid_map, args.icons_dir, cache, profiler
+        )
+
+    output_step = profiler.step("output") if profiler else nullcontext()
+    with output_step:
+        print("Phase 3: Building output...")
+        count = max(item_names) + 1 if item_names else 0
+        durability = item_durability(tool_data.records, count)
+        output = build_output(item_names, durability, game_version, icons)
+
+        warnings = validate_output(output)
+        if warnings:
+            print("  WARNINGS:")
+            for w in warnings:
+                print(f"    - {w}")
+        else:
+            print("  All validation checks passed")
+        print()
+
+        icon_rects = item_icon_rects(icons, count) if icons is not None else None
+        columns = build_columnar_output(output["meta"], item_names, durability, icon_rects)
+        search = build_search_index(item_names)
+        written = write_outputs(output, columns, search, output_path)
+        cache.save()
 
-    print(f"Wrote {output_path} ({output_path.stat().st_size:,} bytes)")
+    for path in written:
+        print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
     meta = output["meta"]
     print(f"  {meta['totalItems']} items, {meta['totalItemsWithDurability']} with durability")
+    if icons is not None:
+        print(f"  {len(icons['icons'])} items with icons")
+
+    if profiler:
+        print()
+        print_profile(profiler.steps)
+        if args.profile_report:
+            report_path = write_profile_report(profiler.steps, output_path, args.jobs)
+            print(f"Wrote {report_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dinkum Asset Fixtures
+
+Builds fake Unity objects shaped like the ones extract_items.py reads, so the
+extractor can be exercised and benchmarked without a Dinkum install:
+
+  - globalgamemanagers.assets: MonoScripts (InventoryItem, Inventory, WorldManager)
+  - sharedassets0.assets: InventoryItem MonoBehaviours (28-byte header, four
+    strings, fixed data with maxStack and isATool at known offsets)
+  - level0: the Inventory singleton (allItems PPtr array) and WorldManager
+  - resources.assets: an I2 LanguageSourceData blob with
+    InventoryItemNames/InvItem_NNN terms in two languages
+  - with --icons, sharedassets0.assets also holds a Texture2D icon sheet
+    and Sprites cut from it, and each item's fixed data an itemSprite PPtr
+
+The calibration items from extract_items.py get their real values, so
+calibration succeeds; every other item is random but reproducible from the
+seed. --output writes the files as real SerializedFiles in a fake install,
+so the extractor itself can be run against it. With --bundle they are packed
+into one compressed UnityFS bundle (Dinkum_Data/data.unity3d) instead.
+
+Usage:
+    python fixtures.py --items 100000 --output /tmp/dinkum-fixtures
+    python fixtures.py --output /tmp/dinkum-bundled --bundle lz4
+    python fixtures.py --output /tmp/dinkum-icons --icons
+    python extract_items.py /tmp/dinkum-fixtures --output /tmp/items.json --no-cache
+"""
+
+import argparse
+import json
+import lzma
+import random
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from bundled_files import BundledFile, ObjectFilter, read_bundled_files
+from extract_items import (
+    CALIBRATION_WINDOW,
+    STACK_CALIBRATION,
+    TOOL_CALIBRATION,
+    AssetSession,
+)
+from serialized_file import CLASS_IDS, SerializedFile
+from unityfs import (
+    COMPRESSION_LZ4,
+    COMPRESSION_LZMA,
+    COMPRESSION_NONE,
+    SIGNATURE,
+    UnityFSBundle,
+)
+
+DEFAULT_ITEM_COUNT = 2025
+MAX_ITEM_COUNT = 100_000
+
+# Where the fixture puts each field, relative to fixed data start
+FIXTURE_OFFSETS = {"maxStack": 140, "isATool": 133}
+FIXTURE_SPRITE_OFFSET = 40  # itemSprite PPtr, with --icons
+FIXTURE_VERSION = (7, 0)  # versionNumber, masterVersionNumber -> "1.0.7"
+
+# Path IDs of the MonoScripts in globalgamemanagers.assets
+SCRIPT_PIDS = {"InventoryItem": 1001, "WorldManager": 1002, "Inventory": 1003, "Other": 1004}
+ITEM_PID_BASE = 20_000
+LANGUAGES = [("English", "en"), ("French", "fr")]
+
+MANIFEST_NAME = "manifest.json"
+SERIALIZED_FILE_VERSION = 22  # Unity 2020.1+
+UNITY_VERSION = "2020.3.48f1"
+
+BUNDLE_NAME = "data.unity3d"
+BUNDLE_COMPRESSION = {"none": COMPRESSION_NONE, "lzma": COMPRESSION_LZMA, "lz4": COMPRESSION_LZ4}
+BUNDLE_BLOCK_SIZE = 128 * 1024  # Unity's chunk size for LZ4 bundles
+NODE_FLAG_SERIALIZED_FILE = 0x4
+
+# --icons: ICON_SPRITES sprites of ICON_CELL pixels on one RGBA32 texture,
+# shared by the items (item_id % ICON_SPRITES); every NO_SPRITE_EVERY-th
+# item has no sprite
+FIXTURE_CLASS_IDS = {**CLASS_IDS, "Texture2D": 28}
+ICON_SPRITES = 64
+ICON_CELL = 32
+ICON_SHEET_COLUMNS = 8
+TEXTURE_PID = 900
+SPRITE_PID_BASE = 1000
+NO_SPRITE_EVERY = 100
+TEXTURE_FORMAT_RGBA32 = 4
+
+
+def unity_string(value: str) -> bytes:
+    """Serialize a Unity string: uint32 length, UTF-8 bytes, padded to 4."""
+    data = value.encode("utf-8")
+    out = struct.pack("<I", len(data)) + data
+    return out + b"\0" * (-len(out) % 4)
+
+
+def mono_header(script_pid: int, game_object_pid: int = 0) -> bytes:
+    """28-byte MonoBehaviour header: GameObject PPtr, Enabled, Script PPtr."""
+    return (
+        struct.pack("<iq", 0, game_object_pid)
+        + struct.pack("<I", 1)
+        + struct.pack("<iq", 1, script_pid)
+    )
+
+
+def monoscript_blob(name: str) -> bytes:
+    """MonoScript payload; extract_items only reads the leading m_Name."""
+    return unity_string(name) + b"\0" * 32
+
+
+def item_blob(
+    rng: random.Random, item_id: int, max_stack: int, is_tool: bool, sprite_pid: int | None = None
+) -> bytes:
+    """
+    InventoryItem MonoBehaviour with maxStack/isATool at FIXTURE_OFFSETS and,
+    given a sprite path ID (0 for none), an itemSprite PPtr at
+    FIXTURE_SPRITE_OFFSET.
+    """
+    fixed = bytearray(rng.randbytes(CALIBRATION_WINDOW + 64))
+    struct.pack_into("<i", fixed, FIXTURE_OFFSETS["maxStack"], max_stack)
+    fixed[FIXTURE_OFFSETS["isATool"]] = 1 if is_tool else 0
+    if sprite_pid is not None:
+        struct.pack_into("<iq", fixed, FIXTURE_SPRITE_OFFSET, 0, sprite_pid)
+    strings = (
+        unity_string("")
+        + unity_string(f"category_{item_id % 37}")
+        + unity_string(item_name(item_id))
+        + unity_string("A synthetic item. " * (item_id % 4))
+    )
+    return mono_header(SCRIPT_PIDS["InventoryItem"], item_id) + strings + bytes(fixed)
+
+
+def item_name(item_id: int) -> str:
+    return f"Item {item_id}"
+
+
+def i2_term(term: str, values: list[str]) -> bytes:
+    """Serialize one I2 TermData record (see extract_items.read_i2_term)."""
+    flags = struct.pack("<I", len(values)) + b"\0" * len(values)
+    return (
+        unity_string(term)
+        + struct.pack("<iI", 0, len(values))
+        + b"".join(unity_string(v) for v in values)
+        + flags
+        + b"\0" * (-len(flags) % 4)
+        + struct.pack("<I", len(values))
+        + b"".join(unity_string("") for _ in values)
+    )
+
+
+def i2_blob(item_ids: list[int]) -> bytes:
+    """
+    I2 LanguageSourceData: a few unrelated terms around the item terms,
+    some names with {s} plural markers, then the mLanguages list.
+    """
+    terms = [i2_term("Menu/Title", ["Dinkum", "Dinkum"])]
+    for item_id in item_ids:
+        english = item_name(item_id) + ("{s}" if item_id % 5 == 0 else "")
+        terms.append(i2_term(f"InventoryItemNames/InvItem_{item_id}", [english, f"Objet {item_id}"]))
+    terms.append(i2_term("Tips/Tip_1", ["Water your crops", "Arrosez vos cultures"]))
+
+    languages = b"".join(
+        unity_string(name) + unity_string(code) + struct.pack("<I", 0) for name, code in LANGUAGES
+    )
+    return (
+        mono_header(SCRIPT_PIDS["Other"])
+        + unity_string("I2Languages")
+        + struct.pack("<I", len(terms))
+        + b"".join(terms)
+        + struct.pack("<Ii", 0, 0)  # CaseInsensitiveTerms, OnMissingTranslation
+        + unity_string("")  # mTerm_AppName
+        + struct.pack("<I", len(LANGUAGES))
+        + languages
+    )
+
+
+def inventory_blob(item_pids: list[int]) -> bytes:
+    """Inventory singleton: some leading fields, then the allItems PPtr array."""
+    all_items = struct.pack("<I", len(item_pids)) + b"".join(
+        struct.pack("<iq", 1, pid) for pid in item_pids
+    )
+    return (
+        mono_header(SCRIPT_PIDS["Inventory"])
+        + unity_string("")
+        + struct.pack("<10i", *range(10))
+        + all_items
+        + b"\0" * 16
+    )
+
+
+def world_manager_blob() -> bytes:
+    """WorldManager: m_Name, then versionNumber and masterVersionNumber."""
+    return (
+        mono_header(SCRIPT_PIDS["WorldManager"])
+        + unity_string("")
+        + struct.pack("<ii", *FIXTURE_VERSION)
+        + b"\0" * 20
+    )
+
+
+def icon_color(index: int) -> tuple[int, int, int, int]:
+    """RGBA fill of icon sheet cell `index`."""
+    return (index * 37 % 256, index * 91 % 256, index * 53 % 256, 255)
+
+
+def icon_objects() -> list["FixtureObject"]:
+    """
+    A Texture2D icon sheet (ICON_SPRITES solid-colored cells, uncompressed
+    RGBA32) and a Sprite per cell. The payloads are written with UnityPy's
+    bundled type trees for UNITY_VERSION, so UnityPy can decode them.
+    """
+    from UnityPy.helpers import Tpk, TypeTreeHelper
+    from UnityPy.helpers.UnityVersion import UnityVersion
+    from UnityPy.streams import EndianBinaryReader, EndianBinaryWriter
+
+    version = UnityVersion.from_str(UNITY_VERSION)
+
+    def encode(type_name: str, values: dict) -> bytes:
+        # Start from the type's default values, then set the given fields
+        node = Tpk.get_typetree_node(FIXTURE_CLASS_IDS[type_name], version)
+        defaults = TypeTreeHelper.read_typetree(
+            node, EndianBinaryReader(b"\0" * 4096, endian="<"), as_dict=True, check_read=False
+        )
+        for key, value in values.items():
+            if isinstance(value, dict):
+                defaults[key].update(value)
+            else:
+                defaults[key] = value
+        writer = EndianBinaryWriter(endian="<")
+        TypeTreeHelper.write_typetree(defaults, node, writer)
+        return writer.bytes
+
+    width = ICON_SHEET_COLUMNS * ICON_CELL
+    height = -(-ICON_SPRITES // ICON_SHEET_COLUMNS) * ICON_CELL
+    pixels = bytearray(width * height * 4)
+    for index in range(ICON_SPRITES):
+        x = index % ICON_SHEET_COLUMNS * ICON_CELL
+        y = index // ICON_SHEET_COLUMNS * ICON_CELL
+        row = bytes(icon_color(index)) * ICON_CELL
+        for line in range(y, y + ICON_CELL):
+            start = (line * width + x) * 4
+            pixels[start : start + len(row)] = row
+
+    texture = encode(
+        "Texture2D",
+        {
+            "m_Name": "ItemIcons",
+            "m_Width": width,
+            "m_Height": height,
+            "m_CompleteImageSize": len(pixels),
+            "m_TextureFormat": TEXTURE_FORMAT_RGBA32,
+            "m_MipCount": 1,
+            "m_ImageCount": 1,
+            "m_TextureDimension": 2,
+            "image data": bytes(pixels),
+        },
+    )
+    objects = [FixtureObject(TEXTURE_PID, "Texture2D", texture)]
+    for index in range(ICON_SPRITES):
+        rect = {
+            "x": index % ICON_SHEET_COLUMNS * ICON_CELL,
+            "y": index // ICON_SHEET_COLUMNS * ICON_CELL,
+            "width": ICON_CELL,
+            "height": ICON_CELL,
+        }
+        sprite = encode(
+            "Sprite",
+            {
+                "m_Name": f"icon_{index}",
+                # settingsRaw 2: rectangle packing, so the rect is cut as is
+                "m_RD": {
+                    "texture": {"m_FileID": 0, "m_PathID": TEXTURE_PID},
+                    "textureRect": rect,
+                    "settingsRaw": 2,
+                },
+            },
+        )
+        objects.append(FixtureObject(SPRITE_PID_BASE + index, "Sprite", sprite))
+    return objects
+
+
+def item_sprite_pid(item_id: int) -> int:
+    """The fixture item's itemSprite path ID, 0 (null) for items without one."""
+    if item_id % NO_SPRITE_EVERY == NO_SPRITE_EVERY - 1:
+        return 0
+    return SPRITE_PID_BASE + item_id % ICON_SPRITES
+
+
+class FixtureReader:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read_bytes(self, size: int) -> bytes:
+        return self._data[:size]
+
+
+class FixtureObject:
+    """Stands in for a UnityPy ObjectReader (the parts AssetSession uses)."""
+
+    def __init__(self, path_id: int, type_name: str, data: bytes):
+        self.path_id = path_id
+        self.class_id = FIXTURE_CLASS_IDS[type_name]
+        self.byte_size = len(data)
+        self._data = data
+        self.reader = FixtureReader(data)
+
+    def reset(self):
+        self.reader = FixtureReader(self._data)
+
+    def get_raw_data(self) -> bytes:
+        return self._data
+
+
+class FixtureEnv:
+    def __init__(self, objects: list[FixtureObject]):
+        self.objects = objects
+
+
+@dataclass
+class FixtureGame:
+    """Synthetic asset files plus the values the extractor should recover."""
+
+    envs: dict[str, FixtureEnv | SerializedFile | BundledFile]
+    names: dict[int, str] = field(default_factory=dict)
+    is_tool: dict[int, bool] = field(default_factory=dict)
+    max_stack: dict[int, int] = field(default_factory=dict)
+    sprites: dict[int, int] = field(default_factory=dict)
+    game_version: str = "1.{1}.{0}".format(*FIXTURE_VERSION)
+
+
+class FixtureSession(AssetSession):
+    """AssetSession that serves a FixtureGame instead of loading files."""
+
+    def __init__(self, game: FixtureGame):
+        super().__init__(Path("<fixtures>"))
+        self.fixture = game
+
+    def env(self, filename: str):
+        return self.fixture.envs[filename]
+
+
+def build_fixture_game(
+    item_count: int = DEFAULT_ITEM_COUNT, seed: int = 1, icons: bool = False
+) -> FixtureGame:
+    """
+    Build a synthetic game with item_count InventoryItems; with icons, also
+    their sprites (needs UnityPy). The other objects don't depend on icons.
+    """
+    calibration_ids = STACK_CALIBRATION.keys() | TOOL_CALIBRATION.keys()
+    if not max(calibration_ids) < item_count <= MAX_ITEM_COUNT:
+        raise ValueError(
+            f"item_count must be between {max(calibration_ids) + 1} and {MAX_ITEM_COUNT}"
+        )
+
+    rng = random.Random(seed)
+    game = FixtureGame(envs={})
+
+    scripts = [
+        FixtureObject(pid, "MonoScript", monoscript_blob(name)) for name, pid in SCRIPT_PIDS.items()
+    ]
+
+    items = [FixtureObject(5, "MonoBehaviour", mono_header(SCRIPT_PIDS["Other"]) + b"\0" * 64)]
+    item_pids = []
+    for item_id in range(item_count):
+        max_stack = STACK_CALIBRATION.get(item_id, rng.choice([1, 10, 50, 99, 200]))
+        is_tool = TOOL_CALIBRATION.get(item_id, item_id in STACK_CALIBRATION or rng.random() < 0.1)
+        pid = ITEM_PID_BASE + item_id * 3
+        sprite_pid = item_sprite_pid(item_id) if icons else None
+        items.append(
+            FixtureObject(
+                pid, "MonoBehaviour", item_blob(rng, item_id, max_stack, is_tool, sprite_pid)
+            )
+        )
+        item_pids.append(pid)
+        game.names[item_id] = item_name(item_id)
+        game.is_tool[item_id] = is_tool
+        game.max_stack[item_id] = max_stack
+        if sprite_pid:
+            game.sprites[item_id] = sprite_pid
+    # Asset files aren't ordered by item ID
+    rng.shuffle(items)
+    if icons:
+        items += icon_objects()
+
+    level = [
+        FixtureObject(1, "MonoBehaviour", mono_header(SCRIPT_PIDS["Other"]) + b"\0" * 700),
+        FixtureObject(2, "MonoBehaviour", inventory_blob(item_pids)),
+        FixtureObject(3, "MonoBehaviour", world_manager_blob()),
+    ]
+    resources = [
+        FixtureObject(1, "MonoBehaviour", mono_header(SCRIPT_PIDS["Other"]) + b"\0" * 40),
+        FixtureObject(2, "MonoBehaviour", i2_blob(list(range(item_count)))),
+    ]
+
+    game.envs = {
+        "globalgamemanagers.assets": FixtureEnv(scripts),
+        "sharedassets0.assets": FixtureEnv(items),
+        "level0": FixtureEnv(level),
+        "resources.assets": FixtureEnv(resources),
+    }
+    return game
+
+
+def serialize_asset_file(objects: list[FixtureObject]) -> bytes:
+    """
+    Pack objects into an uncompressed SerializedFile (format version 22,
+    little-endian, no type trees), the layout of a built game's .assets.
+    """
+    class_ids = sorted({obj.class_id for obj in objects})
+    meta = bytearray(UNITY_VERSION.encode() + b"\0")
+    meta += struct.pack("<i?i", 19, False, len(class_ids))  # platform, type trees, types
+    for class_id in class_ids:
+        # class ID, stripped, script type index, [script ID], old type hash
+        meta += struct.pack("<i?h", class_id, False, -1)
+        meta += b"\0" * (32 if class_id == CLASS_IDS["MonoBehaviour"] else 16)
+
+    header_size = 48
+    meta += struct.pack("<i", len(objects))
+    data_start = 0
+    for obj in objects:
+        meta += b"\0" * (-(header_size + len(meta)) % 4)
+        data_start += -data_start % 8
+        meta += struct.pack(
+            "<qqIi", obj.path_id, data_start, obj.byte_size, class_ids.index(obj.class_id)
+        )
+        data_start += obj.byte_size
+    meta += struct.pack("<iii", 0, 0, 0)  # scripts, externals, ref types
+    meta += b"\0"  # user information
+
+    data_offset = header_size + len(meta)
+    data_offset += -data_offset % 16
+    body = bytearray()
+    for obj in objects:
+        body += b"\0" * (-len(body) % 8)
+        body += obj.get_raw_data()
+
+    file_size = data_offset + len(body)
+    header = struct.pack(">4I4B", 0, 0, SERIALIZED_FILE_VERSION, 0, 0, 0, 0, 0)
+    header += struct.pack(">IqqQ", len(meta), file_size, data_offset, 0)
+    return header + meta + b"\0" * (data_offset - header_size - len(meta)) + body
+
+
+def compress_block(data: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_LZMA:
+        lzma_filter = {"id": lzma.FILTER_LZMA1, "lc": 3, "lp": 0, "pb": 2, "dict_size": 1 << 23}
+        props = struct.pack("<BI", (2 * 5 + 0) * 9 + 3, lzma_filter["dict_size"])
+        return props + lzma.compress(data, format=lzma.FORMAT_RAW, filters=[lzma_filter])
+    if compression == COMPRESSION_LZ4:
+        import lz4.block
+
+        return lz4.block.compress(data, store_size=False)
+    return data
+
+
+def serialize_bundle(files: dict[str, bytes], compression: int) -> bytes:
+    """
+    Pack files into a UnityFS bundle (format 7), the layout of a build that
+    ships its data compressed. LZ4 data is split into 128 KB blocks, LZMA
+    data is a single block, as Unity writes them.
+    """
+    data = b"".join(files.values())
+    block_size = len(data) if compression == COMPRESSION_LZMA else BUNDLE_BLOCK_SIZE
+    blocks = [
+        (data[i : i + block_size], compress_block(data[i : i + block_size], compression))
+        for i in range(0, len(data), block_size)
+    ]
+
+    info = bytearray(16)  # uncompressed data hash
+    info += struct.pack(">i", len(blocks))
+    for raw, packed in blocks:
+        info += struct.pack(">IIH", len(raw), len(packed), compression)
+    info += struct.pack(">i", len(files))
+    offset = 0
+    for name, content in files.items():
+        info += struct.pack(">qqI", offset, len(content), NODE_FLAG_SERIALIZED_FILE)
+        info += name.encode() + b"\0"
+        offset += len(content)
+    packed_info = compress_block(bytes(info), compression)
+
+    header = bytearray(SIGNATURE + struct.pack(">I", 7))
+    header += b"5.x.x\0" + UNITY_VERSION.encode() + b"\0"
+    size_pos = len(header)
+    header += struct.pack(">qIII", 0, len(packed_info), len(info), compression | 0x40)
+    header += b"\0" * (-len(header) % 16)
+    body = packed_info + b"".join(packed for _, packed in blocks)
+    struct.pack_into(">q", header, size_pos, len(header) + len(body))
+    return bytes(header) + body
+
+
+def save_fixture_game(game: FixtureGame, output_dir: Path, bundle: str | None = None) -> None:
+    """
+    Write a fixture game as a fake install: each asset file as a real
+    SerializedFile under Dinkum_Data/ (so extract_items.py can run against
+    output_dir), plus a manifest with the expected extraction results.
+
+    With bundle set to a compression name (see BUNDLE_COMPRESSION), the files
+    are packed into Dinkum_Data/data.unity3d instead.
+    """
+    data_dir = output_dir / "Dinkum_Data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    files = {filename: serialize_asset_file(env.objects) for filename, env in game.envs.items()}
+    if bundle is None:
+        for filename, content in files.items():
+            (data_dir / filename).write_bytes(content)
+    else:
+        (data_dir / BUNDLE_NAME).write_bytes(serialize_bundle(files, BUNDLE_COMPRESSION[bundle]))
+    manifest = {
+        "expected": {
+            "names": {str(k): v for k, v in game.names.items()},
+            "isTool": {str(k): v for k, v in game.is_tool.items()},
+            "maxStack": {str(k): v for k, v in game.max_stack.items()},
+            "sprites": {str(k): v for k, v in game.sprites.items()},
+            "gameVersion": game.game_version,
+        },
+    }
+    with open(output_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f)
+
+
+def load_fixture_game(fixture_dir: Path) -> FixtureGame:
+    """Load a fixture game written by save_fixture_game."""
+    with open(fixture_dir / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    data_dir = fixture_dir / "Dinkum_Data"
+    bundle_path = data_dir / BUNDLE_NAME
+    if bundle_path.exists():
+        object_filter = ObjectFilter(payloads=frozenset(CLASS_IDS.values()))
+        names = [node.path for node in UnityFSBundle(bundle_path).nodes]
+        envs = {
+            bundled.name: bundled
+            for bundled in read_bundled_files(bundle_path, names, lambda _: object_filter)
+        }
+    else:
+        envs = {path.name: SerializedFile(path) for path in sorted(data_dir.iterdir())}
+    expected = manifest["expected"]
+    return FixtureGame(
+        envs=envs,
+        names={int(k): v for k, v in expected["names"].items()},
+        is_tool={int(k): v for k, v in expected["isTool"].items()},
+        max_stack={int(k): v for k, v in expected["maxStack"].items()},
+        sprites={int(k): v for k, v in expected.get("sprites", {}).items()},
+        game_version=expected["gameVersion"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic Dinkum asset fixtures")
+    parser.add_argument("--output", type=Path, required=True, help="Directory to write fixtures to")
+    parser.add_argument(
+        "--items",
+        type=int,
+        default=DEFAULT_ITEM_COUNT,
+        help=f"Number of InventoryItems (default: {DEFAULT_ITEM_COUNT}, max {MAX_ITEM_COUNT})",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument(
+        "--bundle",
+        choices=sorted(BUNDLE_COMPRESSION),
+        default=None,
+        help=f"Pack the asset files into a UnityFS bundle ({BUNDLE_NAME}) with this compression",
+    )
+    parser.add_argument(
+        "--icons",
+        action="store_true",
+        help="Give items sprites on an icon texture, for --icons extraction (needs UnityPy)",
+    )
+    args = parser.parse_args()
+
+    if args.bundle == "lz4":
+        try:
+            import lz4.block  # noqa: F401
+        except ImportError:
+            print("ERROR: --bundle lz4 needs the lz4 package (pip install lz4)")
+            sys.exit(1)
+    if args.icons:
+        try:
+            import UnityPy  # noqa: F401
+        except ImportError:
+            print("ERROR: --icons needs UnityPy to write sprites (pip install unitypy)")
+            sys.exit(1)
+
+    try:
+        game = build_fixture_game(args.items, args.seed, args.icons)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    save_fixture_game(game, args.output, args.bundle)
+    names = [BUNDLE_NAME] if args.bundle else game.envs
+    total = sum((args.output / "Dinkum_Data" / name).stat().st_size for name in names)
+    print(f"Wrote {args.items} items ({total / 1e6:.1f} MB of asset files) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Minimal reader for uncompressed Unity SerializedFiles (.assets, level0).
+
+The extractor only needs each file's object table (path_id, class_id, byte
+offset and size) and the raw payloads of a few objects. This module reads
+just that, straight from a memory-mapped file, so plain asset files can be
+processed without importing UnityPy or building its object model.
+
+Supported: SerializedFile format versions 9-22 (Unity 3.5 through 2022),
+with or without embedded type trees. Anything else (UnityFS bundles, web
+files, compressed or unknown formats) raises SerializedFileError, and the
+caller falls back to UnityPy.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+
+MIN_VERSION = 9
+MAX_VERSION = 22
+
+# Bytes that always hold the header, whatever the format version
+HEADER_SIZE = 48
+
+# Unity class IDs of the object types the extractor reads
+CLASS_IDS = {"MonoBehaviour": 114, "MonoScript": 115, "Sprite": 213}
+
+
+class SerializedFileError(Exception):
+    """Raised when a file isn't a SerializedFile this module can read."""
+
+
+class SerializedObject:
+    """One entry of a SerializedFile's object table."""
+
+    __slots__ = ("path_id", "class_id", "byte_start", "byte_size", "_file")
+
+    def __init__(
+        self, file: "SerializedFile", path_id: int, class_id: int, byte_start: int, byte_size: int
+    ):
+        self._file = file
+        self.path_id = path_id
+        self.class_id = class_id
+        self.byte_start = byte_start
+        self.byte_size = byte_size
+
+    def get_raw_data(self) -> bytes:
+        """The object's serialized payload."""
+        return self._file.data[self.byte_start : self.byte_start + self.byte_size]
+
+    def read_bytes(self, size: int) -> bytes:
+        """The first `size` bytes of the payload (all of it if shorter)."""
+        return self._file.data[self.byte_start : self.byte_start + min(size, self.byte_size)]
+
+    def __repr__(self) -> str:
+        return f"<SerializedObject path_id={self.path_id} class_id={self.class_id}>"
+
+
+class _Cursor:
+    """Position in the metadata plus the file's endianness."""
+
+    def __init__(self, data, pos: int, endian: str):
+        self.data = data
+        self.pos = pos
+        self.endian = endian
+        self._structs: dict[str, struct.Struct] = {}
+
+    def unpack(self, fmt: str) -> tuple:
+        compiled = self._structs.get(fmt)
+        if compiled is None:
+            compiled = self._structs[fmt] = struct.Struct(self.endian + fmt)
+        values = compiled.unpack_from(self.data, self.pos)
+        self.pos += compiled.size
+        return values
+
+    def skip(self, size: int) -> None:
+        self.pos += size
+
+    def skip_cstring(self) -> None:
+        end = self.data.find(b"\0", self.pos)
+        if end < 0:
+            raise SerializedFileError("unterminated string in metadata")
+        self.pos = end + 1
+
+    def align(self) -> None:
+        self.pos = (self.pos + 3) & ~3
+
+
+class SerializedFile:
+    """
+    Object table of an uncompressed SerializedFile, read from a memory map.
+
+    `objects` lists every object in file order. Payloads are sliced from the
+    map on demand; call close() (or use as a context manager) to unmap.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise SerializedFileError(f"{self.path.name}: {e}") from e
+        try:
+            self.version, entries = read_object_table(self.data, self.path.name)
+        except SerializedFileError:
+            self.close()
+            raise
+        self.objects = [SerializedObject(self, *entry) for entry in entries]
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self) -> "SerializedFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_data_offset(header, name: str) -> int:
+    """
+    Where object data starts in a SerializedFile, from its first HEADER_SIZE
+    bytes. Everything before it is header and metadata, so a streamed file
+    can be buffered up to this point and passed to read_object_table.
+    """
+    try:
+        return _read_header(header, name)[2]
+    except struct.error as e:
+        raise SerializedFileError(f"{name}: truncated header") from e
+
+
+def read_object_table(data, name: str, size: int | None = None) -> tuple[int, list[tuple]]:
+    """
+    Parse a SerializedFile's header and metadata.
+
+    `data` must hold at least everything before the object data; `size` is
+    the full file size if `data` is only that prefix. Returns (format version,
+    [(path_id, class_id, byte_start, byte_size)] in file order), with
+    byte_start relative to the start of the file.
+    """
+    try:
+        return _read_object_table(data, name, len(data) if size is None else size)
+    except (struct.error, IndexError) as e:
+        raise SerializedFileError(f"{name}: truncated metadata") from e
+
+
+def _read_header(data, name: str) -> tuple[int, int, int, int]:
+    """Returns (version, file size, data offset, metadata start)."""
+    if len(data) < 20:
+        raise SerializedFileError(f"{name}: too short for a SerializedFile")
+
+    if data[:8] in (b"UnityFS\0", b"UnityWeb", b"UnityRaw"):
+        raise SerializedFileError(f"{name}: asset bundle, not a SerializedFile")
+
+    # The header is always big-endian
+    _, file_size, version, data_offset = struct.unpack_from(">4I", data, 0)
+    if not MIN_VERSION <= version <= MAX_VERSION:
+        raise SerializedFileError(f"{name}: unsupported format version {version}")
+    pos = 20
+    if version >= 22:
+        _, file_size, data_offset, _ = struct.unpack_from(">IqqQ", data, pos)
+        pos += 28
+    return version, file_size, data_offset, pos
+
+
+def _read_object_table(data, name: str, size: int) -> tuple[int, list[tuple]]:
+    version, file_size, data_offset, pos = _read_header(data, name)
+    if file_size > size or data_offset > file_size:
+        raise SerializedFileError(f"{name}: header doesn't match the file size")
+
+    cursor = _Cursor(data, pos, ">" if data[16] else "<")
+    cursor.skip_cstring()  # Unity version
+    cursor.skip(4)  # target platform
+    enable_type_tree = True
+    if version >= 13:
+        enable_type_tree = cursor.unpack("?")[0]
+
+    (type_count,) = cursor.unpack("i")
+    class_ids = [_read_type(cursor, version, enable_type_tree) for _ in range(type_count)]
+
+    big_ids = version < 14 and cursor.unpack("i")[0]
+
+    (object_count,) = cursor.unpack("i")
+    entries = []
+    for _ in range(object_count):
+        if big_ids:
+            (path_id,) = cursor.unpack("q")
+        elif version < 14:
+            (path_id,) = cursor.unpack("i")
+        else:
+            cursor.align()
+            (path_id,) = cursor.unpack("q")
+        byte_start, byte_size, type_id = cursor.unpack("qIi" if version >= 22 else "IIi")
+        if version < 16:
+            (class_id,) = cursor.unpack("H")
+        else:
+            class_id = class_ids[type_id]
+        if version < 11:
+            cursor.skip(2)  # is_destroyed
+        elif version < 17:
+            cursor.skip(2)  # script type index
+        if version in (15, 16):
+            cursor.skip(1)  # stripped
+        byte_start += data_offset
+        if byte_start + byte_size > file_size:
+            raise SerializedFileError(f"{name}: object {path_id} runs past the end")
+        entries.append((path_id, class_id, byte_start, byte_size))
+    return version, entries
+
+
+def _read_type(cursor: _Cursor, version: int, enable_type_tree: bool) -> int:
+    """Skip one SerializedType entry. Returns its class ID."""
+    (class_id,) = cursor.unpack("i")
+    if version >= 16:
+        cursor.skip(1)  # is stripped
+    if version >= 17:
+        cursor.skip(2)  # script type index
+    if version >= 13:
+        if (version < 16 and class_id < 0) or (version >= 16 and class_id == 114):
+            cursor.skip(16)  # script ID
+        cursor.skip(16)  # old type hash
+
+    if enable_type_tree:
+        if version >= 12 or version == 10:
+            node_count, strings_size = cursor.unpack("ii")
+            cursor.skip(node_count * (32 if version >= 19 else 24) + strings_size)
+        else:
+            _skip_legacy_type_tree(cursor)
+        if version >= 21:
+            (dependency_count,) = cursor.unpack("i")
+            cursor.skip(4 * dependency_count)
+    return class_id
+
+
+def _skip_legacy_type_tree(cursor: _Cursor) -> None:
+    """Skip a pre-blob (format 9 and 11) type tree, one node at a time."""
+    pending = 1
+    while pending:
+        pending -= 1
+        cursor.skip_cstring()  # type
+        cursor.skip_cstring()  # name
+        # byte size, index, type flags, version, meta flags, children count
+        pending += cursor.unpack("6i")[5]
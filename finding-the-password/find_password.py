@@ -9,11 +9,42 @@ The game uses EasySave3 (ES3) for save file encryption, and the password is
 stored in the ES3Defaults configuration object within resources.assets.
 """
 
+import argparse
+import hashlib
+import mmap
+import os
 import re
+import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
+from unityfs import BundleError, UnityFSBundle, is_bundle
+
+# Markers that appear in or next to the serialized ES3Defaults/ES3Settings
+# objects. Discovery mode searches for all of them in a single pass per file.
+ES3_MARKERS = (b'ES3Defaults', b'ES3Settings', b'SaveFile.es3', b'encryptionPassword')
+MARKER_PATTERN = re.compile(b'|'.join(re.escape(m) for m in ES3_MARKERS))
+
+# Strings around the markers that are known not to be the password
+NON_PASSWORD_STRINGS = {'ES3Defaults', 'ES3Settings', 'SaveFile.es3', 'Easy Save', 'encryptionPassword'}
+
+# Bytes copied out around each marker hit for candidate parsing
+WINDOW_BEFORE = 64
+WINDOW_AFTER = 256
+
+# ES3 key derivation (see README: Technical Details)
+PBKDF2_ITERATIONS = 100
+KEY_LENGTH = 16
+BLOCK_SIZE = 16
+
+# Candidates handed to each worker at a time in --verify
+VERIFY_BATCH_SIZE = 256
+
+# Unity strings in asset files: printable ASCII runs that could be passwords
+PRINTABLE_RUN = re.compile(b'[\x20-\x7e]{4,30}')
+MAX_PRINTABLE_RUN = 30
 
 
 
@@ -40,6 +71,90 @@ def find_resources_file(game_dir: Path) -> Optional[Path]:
     return None
 
 
+def iter_bundle_data(path: Path) -> Iterator[bytes]:
+    """
+    Yield a UnityFS bundle's decompressed data in order, one block (or 1 MB
+    of an LZMA block) at a time; see UnityFSBundle.iter_data in unityfs.py.
+    The bundle is opened lazily, so header errors surface while iterating.
+    """
+    for _, chunk in UnityFSBundle(path).iter_data():
+        yield chunk
+
+
+def stream_matches(chunks: Iterable[bytes], pattern: 're.Pattern', before: int,
+                   after: int) -> Iterator[Tuple[int, bytes, bytes, int]]:
+    """
+    Run a regex over a stream of chunks as if over their concatenation.
+
+    Matches are only taken once `after` bytes follow them, and only `before`
+    bytes are carried over from one chunk to the next, so patterns no longer
+    than `after` are found even when they straddle a block boundary.
+
+    Returns:
+        Iterator of (offset of the match, matched bytes, window, window offset),
+        the window spanning offset-before to offset+after
+    """
+    buf = b''
+    buf_start = 0
+    resume = 0
+    chunks = iter(chunks)
+    done = False
+    while not done:
+        chunk = next(chunks, None)
+        done = chunk is None
+        if chunk:
+            buf += chunk
+        limit = len(buf) if done else len(buf) - after
+        for match in pattern.finditer(buf, resume - buf_start):
+            if match.start() >= limit:
+                break
+            start = max(0, match.start() - before)
+            yield (buf_start + match.start(), match.group(),
+                   buf[start:match.start() + after], buf_start + start)
+            resume = buf_start + match.end()
+        resume = max(resume, buf_start + limit)
+        keep_from = max(0, resume - buf_start - before)
+        buf = buf[keep_from:]
+        buf_start += keep_from
+
+
+def find_marker_window(path: Path, marker: bytes, before: int, after: int) -> Tuple[int, bytes]:
+    """
+    Find the first occurrence of a marker in a file without reading it into memory.
+
+    The file is memory-mapped and searched in place, so memory use stays flat
+    regardless of file size. Only the window around the match is copied out.
+    UnityFS bundles are searched as they are decompressed (see stream_matches);
+    offsets then refer to the decompressed data.
+
+    Args:
+        path: File to search
+        marker: Byte string to look for
+        before: Bytes to include before the match
+        after: Bytes to include after the start of the match
+
+    Returns:
+        Tuple of (offset of the match or -1, bytes from offset-before to offset+after)
+    """
+    if path.stat().st_size == 0:
+        return -1, b''
+
+    if is_bundle(path):
+        matches = stream_matches(iter_bundle_data(path), re.compile(re.escape(marker)), before, after)
+        try:
+            for offset, _, window, _ in matches:
+                return offset, window
+        except BundleError as e:
+            print(f"ERROR: {e}")
+        return -1, b''
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        idx = data.find(marker)
+        if idx == -1:
+            return -1, b''
+        return idx, data[max(0, idx - before):min(len(data), idx + after)]
+
+
 def extract_password_from_resources(resources_path: Path) -> Tuple[Optional[str], dict]:
     """
     Extract the encryption password from the resources.assets file.
@@ -56,11 +171,8 @@ def extract_password_from_resources(resources_path: Path) -> Tuple[Optional[str]
     print(f"Reading resources file: {resources_path}")
     print(f"File size: {resources_path.stat().st_size:,} bytes")
 
-    with open(resources_path, 'rb') as f:
-        data = f.read()
-
     info = {
-        'file_size': len(data),
+        'file_size': resources_path.stat().st_size,
         'es3defaults_offset': None,
         'password': None,
         'context': None
@@ -68,7 +180,7 @@ def extract_password_from_resources(resources_path: Path) -> Tuple[Optional[str]
 
     # Search for ES3Defaults configuration object
     es3_marker = b'ES3Defaults'
-    idx = data.find(es3_marker)
+    idx, chunk = find_marker_window(resources_path, es3_marker, before=50, after=200)
 
     if idx == -1:
         print("ERROR: ES3Defaults configuration not found in resources.assets")
@@ -77,12 +189,6 @@ def extract_password_from_resources(resources_path: Path) -> Tuple[Optional[str]
     print(f"Found ES3Defaults at offset: {idx} (0x{idx:08x})")
     info['es3defaults_offset'] = idx
 
-    # Extract a chunk of data around ES3Defaults
-    # The password typically appears within 100 bytes after ES3Defaults
-    start = max(0, idx - 50)
-    end = min(len(data), idx + 200)
-    chunk = data[start:end]
-
     # Look for readable ASCII strings (potential passwords)
     # ES3 stores strings with a length prefix followed by the string data
     strings = re.findall(b'[\x20-\x7e]{4,}', chunk)
@@ -133,6 +239,274 @@ def extract_password_from_resources(resources_path: Path) -> Tuple[Optional[str]
     return None, info
 
 
+class MarkerHit(NamedTuple):
+    """One marker occurrence found while scanning an asset file."""
+    path: Path
+    marker: str
+    offset: int
+    window: bytes
+    window_start: int
+
+
+class Candidate(NamedTuple):
+    """A possible password, with the evidence that supports it."""
+    password: str
+    score: int
+    hits: int
+    path: Path
+    offset: int
+    marker: str
+
+
+def find_asset_files(game_dir: Path) -> List[Path]:
+    """
+    List every Unity data file in the game install that could hold ES3 settings.
+
+    Args:
+        game_dir: Path to the Dinkum game installation directory
+
+    Returns:
+        Asset files (*.assets, levelN, *.bundle, *.unity3d), largest first
+    """
+    data_dir = game_dir / "Dinkum_Data"
+    root = data_dir if data_dir.is_dir() else game_dir
+    files = [
+        path for path in root.rglob('*')
+        if path.is_file() and (
+            path.suffix in ('.assets', '.bundle', '.unity3d')
+            or re.fullmatch(r'level\d+', path.name)
+        )
+    ]
+    # Largest first so the longest scans start early in the pool
+    return sorted(files, key=lambda path: path.stat().st_size, reverse=True)
+
+
+def scan_asset_file(path: Path) -> List[MarkerHit]:
+    """
+    Find every ES3 marker in a file in a single pass.
+
+    The file is memory-mapped and matched against all markers at once with one
+    compiled alternation; only a small window around each hit is copied out.
+    UnityFS bundles are matched block by block as they are decompressed.
+    """
+    hits: List[MarkerHit] = []
+    if path.stat().st_size == 0:
+        return hits
+
+    if is_bundle(path):
+        matches = stream_matches(iter_bundle_data(path), MARKER_PATTERN, WINDOW_BEFORE, WINDOW_AFTER)
+        try:
+            for offset, marker, window, start in matches:
+                hits.append(MarkerHit(path, marker.decode('ascii'), offset, window, start))
+        except BundleError as e:
+            print(f"   WARNING: skipping {e}")
+        return hits
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for match in MARKER_PATTERN.finditer(data):
+            start = max(0, match.start() - WINDOW_BEFORE)
+            end = min(len(data), match.start() + WINDOW_AFTER)
+            hits.append(MarkerHit(path, match.group().decode('ascii'), match.start(), data[start:end], start))
+    return hits
+
+
+def length_prefixed_strings(window: bytes) -> List[Tuple[int, str]]:
+    """
+    Find Unity length-prefixed ASCII strings ([int32 length][bytes]) in a window.
+
+    Returns:
+        List of (offset within window, string) for plausible password lengths
+    """
+    found = []
+    for i in range(len(window) - 8):
+        length = struct.unpack_from('<I', window, i)[0]
+        if 4 <= length <= 30 and i + 4 + length <= len(window):
+            value = window[i + 4:i + 4 + length]
+            if all(32 <= b < 127 for b in value):
+                found.append((i, value.decode('ascii')))
+    return found
+
+
+def rank_candidates(hits: List[MarkerHit]) -> List[Candidate]:
+    """
+    Turn marker hits from all files into one ranked list of password candidates.
+
+    Every length-prefixed string near a marker is a candidate. The first such
+    string after "SaveFile.es3" (where Dinkum's ES3Defaults keeps the password)
+    scores 3, any other string near a marker scores 1. Scores are summed per
+    string across all hits and files.
+    """
+    scores: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    first_seen: Dict[str, Tuple[Path, int, str]] = {}
+
+    for hit in hits:
+        marker_pos = hit.offset - hit.window_start
+        after_marker = marker_pos + len(hit.marker)
+        strings = [(pos, value) for pos, value in length_prefixed_strings(hit.window)
+                   if value not in NON_PASSWORD_STRINGS]
+        following = [value for pos, value in strings if pos >= after_marker]
+        preferred = following[0] if hit.marker == 'SaveFile.es3' and following else None
+
+        for pos, value in strings:
+            scores[value] = scores.get(value, 0) + (3 if value == preferred else 1)
+            counts[value] = counts.get(value, 0) + 1
+            first_seen.setdefault(value, (hit.path, hit.window_start + pos, hit.marker))
+
+    candidates = [
+        Candidate(value, score, counts[value], *first_seen[value])
+        for value, score in scores.items()
+    ]
+    return sorted(candidates, key=lambda c: (-c.score, -c.hits, str(c.path), c.offset))
+
+
+def discover_passwords(game_dir: Path, jobs: Optional[int] = None) -> List[Candidate]:
+    """
+    Scan every asset file in the install concurrently and rank all candidates.
+
+    Args:
+        game_dir: Path to the Dinkum game installation directory
+        jobs: Worker processes to use (default: one per CPU)
+
+    Returns:
+        Ranked password candidates from all files
+    """
+    files = find_asset_files(game_dir)
+    total = sum(path.stat().st_size for path in files)
+    print(f"Scanning {len(files)} asset files ({total:,} bytes) for ES3 markers...")
+
+    hits: List[MarkerHit] = []
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for path, file_hits in zip(files, pool.map(scan_asset_file, files)):
+            if file_hits:
+                markers = sorted({hit.marker for hit in file_hits})
+                print(f"   - {path.name}: {len(file_hits)} hits ({', '.join(markers)})")
+            hits.extend(file_hits)
+
+    return rank_candidates(hits)
+
+
+def print_candidate_report(candidates: List[Candidate], limit: int = 10):
+    """Print the ranked candidates from discovery mode."""
+    print("\nRanked password candidates:")
+    if not candidates:
+        print("   (none)")
+        return
+    print(f"   {'#':>3}  {'score':>5}  {'hits':>4}  {'candidate':<30} location")
+    for rank, c in enumerate(candidates[:limit], 1):
+        location = f"{c.path.name} @ 0x{c.offset:08x} (near {c.marker})"
+        print(f"   {rank:>3}  {c.score:>5}  {c.hits:>4}  {c.password:<30} {location}")
+
+
+def harvest_strings(path: Path) -> List[str]:
+    """
+    Collect every length-prefixed printable ASCII string (4-30 chars) in a file.
+
+    These are the serialized Unity strings that could hold the password; used
+    by --verify when the ranked candidates don't decrypt the save.
+    """
+    found: Dict[str, None] = {}
+    if path.stat().st_size == 0:
+        return []
+
+    if is_bundle(path):
+        matches = stream_matches(iter_bundle_data(path), PRINTABLE_RUN, 4, MAX_PRINTABLE_RUN + 1)
+        try:
+            for offset, value, window, start in matches:
+                if offset - start == 4 and struct.unpack_from('<I', window)[0] == len(value):
+                    found.setdefault(value.decode('ascii'), None)
+        except BundleError as e:
+            print(f"   WARNING: skipping {e}")
+        return list(found)
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for match in PRINTABLE_RUN.finditer(data):
+            start = match.start()
+            if start >= 4 and struct.unpack_from('<I', data, start - 4)[0] == match.end() - start:
+                found.setdefault(match.group().decode('ascii'), None)
+    return list(found)
+
+
+def password_decrypts(password: str, iv: bytes, blocks: bytes, final: bool = False) -> bool:
+    """
+    Check whether a password decrypts the start of an ES3 save.
+
+    Derives the key with PBKDF2-SHA1 (IV as salt) and decrypts only the first
+    one or two AES-CBC blocks. A correct password yields either a gzip header
+    (magic, deflate method, no reserved flags) or the start of the JSON
+    document: an opening brace followed only by printable text. Checking the
+    whole of both blocks keeps random matches out when testing thousands of
+    candidates. If the blocks are the end of the save (`final`), they must
+    also end in valid PKCS#7 padding, which is stripped before the check.
+    """
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    key = hashlib.pbkdf2_hmac('sha1', password.encode('utf-8'), iv, PBKDF2_ITERATIONS, KEY_LENGTH)
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    plaintext = decryptor.update(blocks)
+    if final:
+        pad = plaintext[-1]
+        if not 1 <= pad <= BLOCK_SIZE or plaintext[-pad:] != bytes([pad]) * pad:
+            return False
+        plaintext = plaintext[:-pad]
+    if plaintext[:3] == b'\x1f\x8b\x08' and not plaintext[3] & 0xE0:
+        return True
+    text = plaintext.lstrip(b'\xef\xbb\xbf \t\r\n')
+    return text.startswith(b'{') and all(32 <= b < 127 or b in b'\t\r\n' for b in text)
+
+
+def verify_batch(passwords: List[str], iv: bytes, blocks: bytes, final: bool) -> Optional[str]:
+    """Return the first password in the batch that decrypts the save, if any."""
+    for password in passwords:
+        if password_decrypts(password, iv, blocks, final):
+            return password
+    return None
+
+
+def verify_candidates(save_path: Path, passwords: List[str], jobs: Optional[int] = None) -> Optional[str]:
+    """
+    Test candidate passwords against a real .es3 save in parallel.
+
+    Candidates are split into batches and checked across a process pool. When
+    a batch reports a hit, the batches after it are cancelled, but those
+    before it still run, so the result is always the highest-ranked
+    candidate that decrypts the save, whichever batch finishes first.
+
+    Args:
+        save_path: An encrypted .es3 save file
+        passwords: Candidates to test, most likely first
+        jobs: Worker processes to use (default: one per CPU)
+
+    Returns:
+        The password that decrypts the save, or None
+    """
+    with open(save_path, 'rb') as f:
+        header = f.read(3 * BLOCK_SIZE)
+        final = not f.read(1)
+    if len(header) < 2 * BLOCK_SIZE:
+        print(f"ERROR: {save_path} is too short to be an encrypted ES3 file")
+        return None
+    iv = header[:BLOCK_SIZE]
+    blocks = header[BLOCK_SIZE:BLOCK_SIZE + (len(header) - BLOCK_SIZE) // BLOCK_SIZE * BLOCK_SIZE]
+
+    print(f"Verifying {len(passwords):,} candidates against {save_path.name}...")
+    batches = [passwords[i:i + VERIFY_BATCH_SIZE] for i in range(0, len(passwords), VERIFY_BATCH_SIZE)]
+    best: Optional[Tuple[int, str]] = None
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = [pool.submit(verify_batch, batch, iv, blocks, final) for batch in batches]
+        index_of = {future: i for i, future in enumerate(futures)}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            password = future.result()
+            index = index_of[future]
+            if password is not None and (best is None or index < best[0]):
+                best = (index, password)
+                for pending in futures[index + 1:]:
+                    pending.cancel()
+    return best[1] if best else None
+
+
 def print_hex_dump(data: bytes, offset: int = 0, length: int = 256):
     """Print a formatted hex dump of binary data."""
     print("\nHex dump of relevant section:")
@@ -144,16 +518,51 @@ def print_hex_dump(data: bytes, offset: int = 0, length: int = 256):
 
 def main():
     """Main entry point for the password finder script."""
+    parser = argparse.ArgumentParser(
+        description="Find the ES3 save encryption password in Dinkum's game files",
+    )
+    parser.add_argument('game_dir', nargs='?', type=Path, help="Path to Dinkum installation directory")
+    parser.add_argument(
+        '--discover',
+        action='store_true',
+        help="Scan every asset file for all ES3 markers in parallel and rank candidates",
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        metavar='N',
+        help="Worker processes for --discover and --verify (default: one per CPU)",
+    )
+    parser.add_argument(
+        '--verify',
+        type=Path,
+        default=None,
+        metavar='SAVE',
+        help="Check candidates against an encrypted .es3 save (needs the cryptography package)",
+    )
+    args = parser.parse_args()
+
+    if args.verify is not None:
+        try:
+            import cryptography  # noqa: F401
+        except ImportError:
+            print("ERROR: --verify needs the cryptography package (pip install cryptography)")
+            sys.exit(1)
+        if not args.verify.is_file():
+            print(f"ERROR: Save file not found: {args.verify}")
+            sys.exit(1)
+
     print("=" * 70)
     print("Dinkum Save File Password Finder")
     print("=" * 70)
     print()
 
     # Check if game directory was provided as argument
-    if len(sys.argv) < 2:
+    if args.game_dir is None:
         print("ERROR: Game directory path is required")
         print("\nUsage:")
-        print("  python find_password.py <path_to_dinkum_directory>")
+        print("  python find_password.py <path_to_dinkum_directory> [--discover]")
         print("\nExample:")
         print("  python find_password.py /mnt/d/SteamLibrary/steamapps/common/Dinkum")
         print("\nCommon locations:")
@@ -162,7 +571,7 @@ def main():
         print("  WSL:     /mnt/c/Program Files (x86)/Steam/steamapps/common/Dinkum")
         sys.exit(1)
 
-    game_dir = Path(sys.argv[1])
+    game_dir = args.game_dir
     if not game_dir.exists():
         print(f"ERROR: Provided path does not exist: {game_dir}")
         sys.exit(1)
@@ -173,20 +582,54 @@ def main():
 
     print(f"Using game directory: {game_dir}")
 
-    # Locate resources.assets file
-    print("\nLooking for resources.assets...")
-    resources_path = find_resources_file(game_dir)
-
-    if resources_path is None:
-        print(f"ERROR: Could not find resources.assets in {game_dir}")
-        sys.exit(1)
-
-    print(f"Found resources.assets: {resources_path}")
-
-    # Extract password
-    print("\nAnalyzing resources.assets for ES3 configuration...")
-    print("-" * 70)
-    password, info = extract_password_from_resources(resources_path)
+    if args.discover:
+        print("\nDiscovering ES3 settings across all asset files...")
+        print("-" * 70)
+        candidates = discover_passwords(game_dir, args.jobs)
+        print_candidate_report(candidates)
+
+        password = candidates[0].password if candidates else None
+        info = {'es3defaults_offset': candidates[0].offset if candidates else None}
+        source = candidates[0].path.name if candidates else "the game's asset files"
+        ranked = [c.password for c in candidates]
+        harvest_from = sorted({c.path for c in candidates}, key=str)
+    else:
+        # Locate resources.assets file
+        print("\nLooking for resources.assets...")
+        resources_path = find_resources_file(game_dir)
+
+        if resources_path is None:
+            print(f"ERROR: Could not find resources.assets in {game_dir}")
+            print("  (if the game ships its data in a .unity3d bundle, try --discover)")
+            sys.exit(1)
+
+        print(f"Found resources.assets: {resources_path}")
+
+        # Extract password
+        print("\nAnalyzing resources.assets for ES3 configuration...")
+        print("-" * 70)
+        password, info = extract_password_from_resources(resources_path)
+        source = "resources.assets"
+        ranked = [password] if password else []
+        harvest_from = [resources_path]
+
+    if args.verify is not None:
+        print("\nVerifying candidates against the save file...")
+        print("-" * 70)
+        # Ranked candidates first, then every Unity string in the same files
+        passwords = dict.fromkeys(ranked)
+        for path in harvest_from:
+            passwords.update(dict.fromkeys(harvest_strings(path)))
+        verified = verify_candidates(args.verify, list(passwords), args.jobs)
+        if verified is None:
+            print(f"None of the candidates decrypt {args.verify.name}")
+            password = None
+        else:
+            print(f"'{verified}' decrypts {args.verify.name}")
+            if verified != password:
+                # Harvested rather than found next to a marker
+                info = {'es3defaults_offset': None}
+            password = verified
 
     # Print results
     print("\n" + "=" * 70)
@@ -194,7 +637,8 @@ def main():
     print("=" * 70)
 
     if password:
-        print(f"\nSUCCESS! Found encryption password: '{password}'")
+        verified_note = f" (verified against {args.verify.name})" if args.verify else ""
+        print(f"\nSUCCESS! Found encryption password: '{password}'{verified_note}")
         print("\nThis password is used to encrypt/decrypt Dinkum save files (.es3)")
         print("\nTechnical Details:")
         print(f"  - Algorithm: AES-128-CBC")
@@ -205,13 +649,17 @@ def main():
         print(f"  - Password: '{password}'")
 
         if info['es3defaults_offset']:
-            print(f"\nFound at offset: {info['es3defaults_offset']} (0x{info['es3defaults_offset']:08x})")
+            print(f"\nFound at offset: {info['es3defaults_offset']} (0x{info['es3defaults_offset']:08x}) in {source}")
+    elif args.verify is not None:
+        print(f"\nERROR: No candidate password decrypts {args.verify.name}")
     else:
-        print("\nERROR: Could not extract password from resources.assets")
+        print(f"\nERROR: Could not extract password from {source}")
         print("\nThis might mean:")
         print("  - The game version has changed")
         print("  - The file structure is different than expected")
         print("  - The password is stored in a different location")
+        if not args.discover:
+            print("  (try --discover to search every asset file)")
 
         if info['es3defaults_offset']:
             print(f"\nES3Defaults was found at offset {info['es3defaults_offset']}")
@@ -0,0 +1,274 @@
+"""
+Streaming reader for UnityFS asset bundles (.unity3d, .bundle).
+
+Builds that ship their data as a compressed bundle keep the usual files
+(level0, resources.assets, ...) as nodes inside it. Rather than inflating
+the whole bundle, this module decompresses one block at a time and hands
+out the node's bytes as they come: LZ4 blocks (Unity's default, 128 KB
+each) are inflated whole, LZMA blocks, which often span the entire bundle,
+are inflated CHUNK_SIZE bytes at a time. Blocks before a node are skipped
+without decompressing them where the format allows it (everything but
+LZMA), and reading stops at the node's end.
+
+The module only depends on the standard library (LZMA) and, for LZ4
+blocks, the lz4 package (pip install lz4). Parsing the files inside a
+bundle is left to callers (see bundled_files.py in extracting-item-data).
+The same file is used by extracting-item-data and finding-the-password,
+which each keep a copy so they run on their own; change both together.
+"""
+
+from __future__ import annotations
+
+import lzma
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+SIGNATURE = b"UnityFS\0"
+
+# Most decompressed bytes handed out at once for LZMA and uncompressed blocks
+CHUNK_SIZE = 1 << 20
+
+# Compression types (low 6 bits of the archive and block flags)
+COMPRESSION_NONE = 0
+COMPRESSION_LZMA = 1
+COMPRESSION_LZ4 = 2
+COMPRESSION_LZ4HC = 3
+
+# Archive flags
+BLOCKS_INFO_AT_END = 0x80
+BLOCK_INFO_NEEDS_PADDING = 0x200
+
+NODE_HEADER = struct.Struct(">qqI")
+BLOCK_HEADER = struct.Struct(">IIH")
+
+
+class BundleError(Exception):
+    """Raised when a bundle can't be read."""
+
+
+class BundleBlock(NamedTuple):
+    """One compressed block and where its bytes go in the bundle's data."""
+
+    file_offset: int
+    compressed_size: int
+    data_offset: int
+    size: int
+    compression: int
+
+
+class BundleNode(NamedTuple):
+    """A file stored in the bundle, as a range of its decompressed data."""
+
+    path: str
+    offset: int
+    size: int
+
+
+def is_bundle(path: Path) -> bool:
+    """Whether a file starts with the UnityFS signature."""
+    with open(path, "rb") as f:
+        return f.read(len(SIGNATURE)) == SIGNATURE
+
+
+class UnityFSBundle:
+    """
+    Block and node tables of a UnityFS bundle. Only the header and the
+    (small) blocks info are read up front; data is streamed by iter_data().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self.blocks, self.nodes = self._read_tables(f)
+        except (struct.error, ValueError, EOFError) as e:
+            raise BundleError(f"{self.path.name}: truncated or corrupt bundle header") from e
+
+    def _read_tables(self, f) -> tuple[list[BundleBlock], list[BundleNode]]:
+        head = f.read(1024)
+        if not head.startswith(SIGNATURE):
+            raise BundleError(f"{self.path.name}: not a UnityFS bundle")
+        pos = len(SIGNATURE)
+        (format_version,) = struct.unpack_from(">I", head, pos)
+        pos += 4
+        for _ in range(2):  # Unity version, revision
+            end = head.find(b"\0", pos)
+            if end < 0:
+                raise EOFError
+            pos = end + 1
+        _, info_compressed, info_size, flags = struct.unpack_from(">qIII", head, pos)
+        pos += 20
+        if format_version >= 7:
+            pos += -pos % 16
+
+        if flags & BLOCKS_INFO_AT_END:
+            f.seek(-info_compressed, 2)
+            data_start = pos
+        else:
+            f.seek(pos)
+            data_start = pos + info_compressed
+        packed = f.read(info_compressed)
+        if len(packed) < info_compressed:
+            raise EOFError
+        info = decompress(packed, info_size, flags & 0x3F)
+        if flags & BLOCK_INFO_NEEDS_PADDING:
+            data_start += -data_start % 16
+
+        pos = 16  # uncompressed data hash
+        (block_count,) = struct.unpack_from(">i", info, pos)
+        pos += 4
+        blocks = []
+        file_offset = data_start
+        data_offset = 0
+        for _ in range(block_count):
+            size, compressed_size, block_flags = BLOCK_HEADER.unpack_from(info, pos)
+            pos += BLOCK_HEADER.size
+            blocks.append(
+                BundleBlock(file_offset, compressed_size, data_offset, size, block_flags & 0x3F)
+            )
+            file_offset += compressed_size
+            data_offset += size
+
+        (node_count,) = struct.unpack_from(">i", info, pos)
+        pos += 4
+        nodes = []
+        for _ in range(node_count):
+            offset, size, _ = NODE_HEADER.unpack_from(info, pos)
+            pos += NODE_HEADER.size
+            end = info.index(b"\0", pos)
+            nodes.append(BundleNode(info[pos:end].decode("utf-8"), offset, size))
+            pos = end + 1
+        return blocks, nodes
+
+    def node(self, name: str) -> BundleNode:
+        for node in self.nodes:
+            if node.path == name:
+                return node
+        raise BundleError(f"{self.path.name}: no {name} in bundle")
+
+    def iter_data(self, start: int = 0, end: int | None = None) -> Iterator[tuple[int, bytes]]:
+        """
+        Yield (offset, bytes) pieces of the decompressed data in [start, end),
+        in order, one block (or CHUNK_SIZE of an LZMA block) at a time.
+        """
+        if end is None:
+            end = sum(block.size for block in self.blocks)
+        for offset, chunk in self.iter_ranges([(start, end)]):
+            if offset < start or offset + len(chunk) > end:
+                lo = max(start, offset)
+                chunk = chunk[lo - offset : min(end, offset + len(chunk)) - offset]
+                offset = lo
+            yield offset, chunk
+
+    def iter_ranges(self, ranges: Iterable[tuple[int, int]]) -> Iterator[tuple[int, bytes]]:
+        """
+        Yield (offset, bytes) pieces of the decompressed data that overlap any
+        of the [start, end) ranges, in order, in a single pass. Blocks that
+        overlap none are skipped without decompressing them; pieces are
+        yielded whole, so they may extend past a range.
+        """
+        ranges = sorted(r for r in ranges if r[0] < r[1])
+        if not ranges:
+            return
+        last = ranges[-1][1]
+
+        def overlaps(lo: int, hi: int) -> bool:
+            return any(start < hi and lo < end for start, end in ranges)
+
+        with open(self.path, "rb") as f:
+            for block in self.blocks:
+                if block.data_offset >= last:
+                    return
+                if not overlaps(block.data_offset, block.data_offset + block.size):
+                    continue
+                f.seek(block.file_offset)
+                for offset, chunk in _inflate(f, block):
+                    if offset >= last:
+                        return
+                    if overlaps(offset, offset + len(chunk)):
+                        yield offset, chunk
+
+
+def decompress(data: bytes, size: int, compression: int) -> bytes:
+    """Decompress a whole block of a known decompressed size."""
+    if compression == COMPRESSION_NONE:
+        return data
+    if compression == COMPRESSION_LZMA:
+        try:
+            out = _lzma_decompressor(data[:5]).decompress(data[5:], max_length=size)
+        except lzma.LZMAError as e:
+            raise BundleError(f"corrupt LZMA block: {e}") from e
+    elif compression in (COMPRESSION_LZ4, COMPRESSION_LZ4HC):
+        lz4_block = _lz4_block()
+        try:
+            out = lz4_block.decompress(data, uncompressed_size=size)
+        except lz4_block.LZ4BlockError as e:
+            raise BundleError(f"corrupt LZ4 block: {e}") from e
+    else:
+        raise BundleError(f"unsupported compression type {compression}")
+    if len(out) != size:
+        raise BundleError(f"block decompressed to {len(out)} bytes, expected {size}")
+    return out
+
+
+def _lz4_block():
+    try:
+        import lz4.block
+    except ImportError:
+        raise BundleError("LZ4-compressed bundles need the lz4 package (pip install lz4)") from None
+    return lz4.block
+
+
+def _lzma_decompressor(props: bytes) -> "lzma.LZMADecompressor":
+    """Raw LZMA decoder for Unity's header: a properties byte and dictionary size."""
+    if len(props) < 5:
+        raise BundleError("truncated LZMA header")
+    lc_lp_pb = props[0]
+    (dict_size,) = struct.unpack_from("<I", props, 1)
+    lzma_filter = {
+        "id": lzma.FILTER_LZMA1,
+        "lc": lc_lp_pb % 9,
+        "lp": lc_lp_pb // 9 % 5,
+        "pb": lc_lp_pb // 45,
+        "dict_size": dict_size,
+    }
+    return lzma.LZMADecompressor(format=lzma.FORMAT_RAW, filters=[lzma_filter])
+
+
+def _inflate(f, block: BundleBlock) -> Iterator[tuple[int, bytes]]:
+    """Decompress one block read from f (positioned at its start) in pieces."""
+    offset = block.data_offset
+    remaining = block.size
+    if block.compression == COMPRESSION_NONE:
+        while remaining:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise BundleError("bundle data ends early")
+            yield offset, chunk
+            offset += len(chunk)
+            remaining -= len(chunk)
+    elif block.compression == COMPRESSION_LZMA:
+        unread = block.compressed_size - 5
+        decoder = _lzma_decompressor(f.read(5))
+        while remaining:
+            packed = b""
+            if decoder.needs_input:
+                packed = f.read(min(CHUNK_SIZE, unread))
+                unread -= len(packed)
+                if not packed:
+                    raise BundleError("LZMA block ends early")
+            try:
+                chunk = decoder.decompress(packed, max_length=min(CHUNK_SIZE, remaining))
+            except lzma.LZMAError as e:
+                raise BundleError(f"corrupt LZMA block: {e}") from e
+            if chunk:
+                yield offset, chunk
+                offset += len(chunk)
+                remaining -= len(chunk)
+            elif decoder.eof:
+                raise BundleError("LZMA block ends early")
+    else:
+        packed = f.read(block.compressed_size)
+        yield offset, decompress(packed, block.size, block.compression)
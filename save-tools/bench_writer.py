@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+ES3 Writer Benchmark
+
+Compares three ways of producing an encrypted ES3 save from parsed data:
+
+- naive:     json.dumps(indent) + regex post-processing into ES3 layout,
+             then encrypt_es3 on the whole string
+- serialize: serialize_es3_json, then encrypt_es3 on the whole string
+- stream:    save_es3, streaming write_es3_json output through an ES3Sink
+
+The data is a synthetic save shaped like Player.es3 / Container.es3 (long
+catalogue and slot arrays, many chests). All three outputs are checked to
+decrypt to identical text before timings are reported.
+
+Usage:
+    python bench_writer.py [--chests N] [--repeat N] [--gzip]
+"""
+
+import argparse
+import json
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from dinkum_es3 import decrypt_es3, encrypt_es3, save_es3, serialize_es3_json
+
+# One element per line in json.dumps output, for joining primitive arrays
+PRIMITIVE_LINE = r'(?:-?\d[^,\n]*|true|false|null|"(?:[^"\\\n]|\\.)*")'
+JOIN_PRIMITIVES = re.compile(r",\n\t+(?=" + PRIMITIVE_LINE + r",?\n)")
+JOIN_CONTAINERS = re.compile(r"([}\]]),\n\t+([{\[])")
+EMPTY_ARRAY = re.compile(r"^(\t*)(.*)\[\](,?)$", re.MULTILINE)
+EMPTY_OBJECT = re.compile(r"^(\t*)(.*)\{\}(,?)$", re.MULTILINE)
+
+
+def make_save(chests: int, seed: int = 1) -> dict:
+    """
+    Build a synthetic save with Dinkum-like shapes and sizes.
+
+    Floats are kept to 4 decimal places between 0 and 1, where Python's repr
+    and JavaScript's String(number) agree, so the naive writer (which does
+    not reformat numbers) can produce matching output.
+    """
+    rng = random.Random(seed)
+    slots = 44
+    return {
+        "playerInfo": {
+            "__type": "PlayerInv",
+            "value": {
+                "playerName": "Benchmark",
+                "money": 1234567,
+                "itemsInInvSlots": [rng.randint(-1, 1500) for _ in range(slots)],
+                "stacksInSlots": [rng.randint(0, 99) for _ in range(slots)],
+                "catalogue": [rng.random() < 0.5 for _ in range(20000)],
+                "health": 87.5,
+                "emptyList": [],
+            },
+        },
+        "chests": {
+            "__type": "ChestSave[]",
+            "value": [
+                {
+                    "xPos": rng.randint(0, 1000),
+                    "yPos": rng.randint(0, 1000),
+                    "itemIds": [rng.randint(-1, 1500) for _ in range(24)],
+                    "itemStacks": [rng.randint(0, 99) for _ in range(24)],
+                    "label": f"Chest {i}",
+                    "tint": {c: rng.randint(1, 9999) / 10000 for c in "rgb"},
+                }
+                for i in range(chests)
+            ],
+        },
+    }
+
+
+def naive_es3_json(data) -> str:
+    """ES3 layout from json.dumps plus string post-processing."""
+    text = json.dumps(data, indent="\t", separators=(",", " : "), ensure_ascii=False)
+    text = EMPTY_ARRAY.sub(lambda m: f"{m[1]}{m[2]}[\n{m[1]}\t\n{m[1]}]{m[3]}", text)
+    text = EMPTY_OBJECT.sub(lambda m: f"{m[1]}{m[2]}{{\n{m[1]}}}{m[3]}", text)
+    text = JOIN_PRIMITIVES.sub(",", text)
+    text = JOIN_CONTAINERS.sub(r"\1,\2", text)
+    return text.replace("\n", "\r\n")
+
+
+def run_naive(data, path: Path, should_gzip: bool) -> None:
+    path.write_bytes(encrypt_es3(naive_es3_json(data), should_gzip))
+
+
+def run_serialize(data, path: Path, should_gzip: bool) -> None:
+    path.write_bytes(encrypt_es3(serialize_es3_json(data), should_gzip))
+
+
+def run_stream(data, path: Path, should_gzip: bool) -> None:
+    save_es3(path, data, should_gzip)
+
+
+def measure(func, data, path: Path, should_gzip: bool, repeat: int) -> tuple[float, float]:
+    """Returns (best seconds over repeat runs, peak traced MB of one run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data, path, should_gzip)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data, path, should_gzip)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ES3 writers")
+    parser.add_argument("--chests", type=int, default=20000, help="Chests in the synthetic save")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per writer (best is kept)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip before encrypting")
+    args = parser.parse_args()
+
+    data = make_save(args.chests)
+    expected = serialize_es3_json(data)
+    size_mb = len(expected.encode("utf-8")) / 1e6
+    print(f"Synthetic save: {args.chests:,} chests, {size_mb:.1f} MB of ES3 JSON")
+
+    writers = {"naive": run_naive, "serialize": run_serialize, "stream": run_stream}
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, func in writers.items():
+            path = Path(tmp) / f"{name}.es3"
+            results[name] = measure(func, data, path, args.gzip, args.repeat)
+            if decrypt_es3(path.read_bytes()) != expected:
+                print(f"ERROR: {name} output differs from serialize_es3_json")
+                raise SystemExit(1)
+
+    print()
+    print(f"  {'writer':<10} {'time':>8} {'MB/s':>8} {'peak MB':>9}")
+    for name, (seconds, peak) in results.items():
+        print(f"  {name:<10} {seconds:>7.3f}s {size_mb / seconds:>8.1f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Read and write Dinkum's EasySave3 (.es3) save files.
+
+Python counterpart of utils/crypto.ts: AES-128-CBC with a PBKDF2-SHA1 key
+(IV as salt), optional gzip, and Unity ES3's JSON layout.
+"""
+
+from .codec import (
+    ES3_PASSWORD,
+    ES3Error,
+    ES3Sink,
+    decrypt_es3,
+    encrypt_es3,
+    is_gzip,
+    load_es3,
+    save_es3,
+)
+from .serializer import format_number, serialize_es3_json, write_es3_json
+from .stream import JSONStream, iter_es3_text, load_es3_paths, select_paths
+
+__all__ = [
+    "ES3_PASSWORD",
+    "ES3Error",
+    "ES3Sink",
+    "JSONStream",
+    "decrypt_es3",
+    "encrypt_es3",
+    "format_number",
+    "is_gzip",
+    "iter_es3_text",
+    "load_es3",
+    "load_es3_paths",
+    "save_es3",
+    "select_paths",
+    "serialize_es3_json",
+    "write_es3_json",
+]
@@ -0,0 +1,144 @@
+"""ES3 encryption: AES-128-CBC, PBKDF2-SHA1 key derivation, optional gzip."""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import zlib
+from pathlib import Path
+
+from .serializer import write_es3_json
+
+ES3_PASSWORD = "jamesbendon"
+PBKDF2_ITERATIONS = 100
+KEY_LENGTH = 16
+IV_LENGTH = 16
+CHUNK_SIZE = 64 * 1024
+
+
+class ES3Error(Exception):
+    """Raised when a save can't be decrypted or encrypted."""
+
+
+def derive_key(password: str, iv: bytes) -> bytes:
+    """Derive the AES-128 key from the password, using the IV as salt."""
+    return hashlib.pbkdf2_hmac("sha1", password.encode("utf-8"), iv, PBKDF2_ITERATIONS, KEY_LENGTH)
+
+
+def is_gzip(data: bytes) -> bool:
+    """Check if data is gzipped."""
+    return len(data) >= 2 and data[0] == 0x1F and data[1] == 0x8B
+
+
+def decrypt_es3(encrypted: bytes, password: str = ES3_PASSWORD) -> str:
+    """
+    Decrypt an ES3 file and return its JSON text.
+
+    The first 16 bytes are the IV; gzipped payloads are decompressed.
+    """
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    try:
+        iv, ciphertext = encrypted[:IV_LENGTH], encrypted[IV_LENGTH:]
+        decryptor = Cipher(algorithms.AES(derive_key(password, iv)), modes.CBC(iv)).decryptor()
+        padded = decryptor.update(ciphertext) + decryptor.finalize()
+        unpadder = padding.PKCS7(128).unpadder()
+        data = unpadder.update(padded) + unpadder.finalize()
+        if is_gzip(data):
+            data = gzip.decompress(data)
+    except (ValueError, OSError, EOFError) as e:
+        raise ES3Error(f"Decryption failed: {e}") from e
+
+    # Same as TextDecoder: drop a leading BOM, replace invalid sequences
+    return data.decode("utf-8-sig", errors="replace")
+
+
+class ES3Sink:
+    """
+    Writable text sink that gzips (optionally), pads and encrypts into a
+    binary file object as data arrives.
+
+    Text is buffered up to chunk_size characters before each encode /
+    compress / encrypt pass, so memory stays bounded however much is
+    written. close() flushes the final padded block.
+    """
+
+    def __init__(
+        self,
+        fileobj,
+        should_gzip: bool = False,
+        password: str = ES3_PASSWORD,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        from cryptography.hazmat.primitives import padding
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        iv = os.urandom(IV_LENGTH)
+        fileobj.write(iv)
+        self._file = fileobj
+        self._encryptor = Cipher(algorithms.AES(derive_key(password, iv)), modes.CBC(iv)).encryptor()
+        self._padder = padding.PKCS7(128).padder()
+        # Level 9 with a zero mtime: same bytes as gzip.compress(data, mtime=0)
+        self._compressor = zlib.compressobj(9, wbits=31) if should_gzip else None
+        self._chunk_size = chunk_size
+        self._parts = []
+        self._buffered = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self._write_bytes("".join(self._parts).encode("utf-8"))
+            self._parts.clear()
+            self._buffered = 0
+
+    def _write_bytes(self, data: bytes) -> None:
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._file.write(self._encryptor.update(self._padder.update(data)))
+
+    def close(self) -> None:
+        self.flush()
+        tail = self._compressor.flush() if self._compressor is not None else b""
+        padded = self._padder.update(tail) + self._padder.finalize()
+        self._file.write(self._encryptor.update(padded) + self._encryptor.finalize())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def encrypt_es3(json_string: str, should_gzip: bool = False, password: str = ES3_PASSWORD) -> bytes:
+    """Encrypt JSON text to ES3 format with a random IV prepended."""
+    out = io.BytesIO()
+    with ES3Sink(out, should_gzip, password) as sink:
+        sink.write(json_string)
+    return out.getvalue()
+
+
+def save_es3(path: Path, data, should_gzip: bool = False, password: str = ES3_PASSWORD) -> None:
+    """
+    Serialize data in ES3 layout and encrypt it straight into a file.
+
+    The serialized text is streamed through an ES3Sink, so it is never held
+    in memory as a whole.
+    """
+    with open(path, "wb") as f, ES3Sink(f, should_gzip, password) as sink:
+        write_es3_json(data, sink.write)
+
+
+def load_es3(path: Path, password: str = ES3_PASSWORD):
+    """Decrypt and parse an .es3 file. Key order is preserved."""
+    try:
+        return json.loads(decrypt_es3(Path(path).read_bytes(), password))
+    except json.JSONDecodeError as e:
+        raise ES3Error(f"Invalid save JSON: {e}") from e
@@ -0,0 +1,149 @@
+"""
+Unity ES3 JSON layout, byte-for-byte compatible with serializeES3Json in
+utils/crypto.ts:
+
+- \r\n line endings
+- Tab indentation
+- Spaces around colons: "key" : value
+- Primitive arrays on a single indented line
+- Object arrays with },{ between elements (no newline)
+"""
+
+import math
+from decimal import Decimal
+from functools import lru_cache
+from json.encoder import encode_basestring
+
+
+# Primitive arrays are joined this many elements at a time, so a long
+# catalogue or stacksInSlots line is never one giant string
+ARRAY_SLICE = 4096
+
+_BOOL_TEXT = {True: "true", False: "false"}
+
+# Same as json.dumps(s, ensure_ascii=False); keys repeat, so cache those
+_quote = encode_basestring
+_quote_key = lru_cache(maxsize=4096)(encode_basestring)
+
+
+def serialize_es3_json(data) -> str:
+    """Serialize parsed save data to Unity ES3's JSON layout."""
+    parts = []
+    write_es3_json(data, parts.append)
+    return "".join(parts)
+
+
+def write_es3_json(value, write, depth: int = 0) -> None:
+    """
+    Stream value in Unity ES3's JSON layout as a series of write(str) calls.
+
+    Output is identical to serialize_es3_json; pair it with an ES3Sink to
+    encrypt without holding the whole text.
+    """
+    if isinstance(value, dict):
+        if not value:
+            write("{\r\n" + tabs(depth) + "}")
+            return
+        indent = tabs(depth + 1)
+        separator = "{\r\n"
+        for k, v in value.items():
+            key = separator + indent + _quote_key(k) + " : "
+            if isinstance(v, (dict, list)):
+                write(key)
+                write_es3_json(v, write, depth + 1)
+            else:
+                write(key + format_value(v, depth + 1))
+            separator = ",\r\n"
+        write("\r\n" + tabs(depth) + "}")
+        return
+
+    if isinstance(value, list):
+        write("[\r\n" + tabs(depth + 1))
+        if value and not isinstance(value[0], (dict, list)):
+            write_primitive_items(value, write, depth + 1)
+        else:
+            # Objects end up as },{ since each starts with { and ends with }
+            for i, v in enumerate(value):
+                if i:
+                    write(",")
+                write_es3_json(v, write, depth + 1)
+        write("\r\n" + tabs(depth) + "]")
+        return
+
+    write(format_value(value, depth))
+
+
+def write_primitive_items(values: list, write, depth: int) -> None:
+    """Write a primitive array's elements on one line, in slices."""
+    for start in range(0, len(values), ARRAY_SLICE):
+        chunk = values[start:start + ARRAY_SLICE]
+        kinds = set(map(type, chunk))
+        if kinds == {bool}:
+            text = ",".join(map(_BOOL_TEXT.__getitem__, chunk))
+        elif kinds == {int}:
+            text = ",".join(map(str, chunk))
+        else:
+            text = ",".join(format_value(v, depth) for v in chunk)
+        write("," + text if start else text)
+
+
+def format_value(value, depth: int) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return format_number(value)
+    if isinstance(value, str):
+        return _quote(value)
+    if isinstance(value, (dict, list)):
+        parts = []
+        write_es3_json(value, parts.append, depth)
+        return "".join(parts)
+    return str(value)
+
+
+def tabs(n: int) -> str:
+    return "\t" * n
+
+
+def format_number(value) -> str:
+    """
+    Format a number the way JavaScript's String(number) does.
+
+    Integral values print without a decimal point (1.0 -> "1"), and
+    exponent notation is used only below 1e-6 or from 1e21 up, written
+    as "1e-7" rather than Python's "1e-07".
+
+    Python ints are printed exactly. The browser parses numbers as doubles,
+    so integers beyond 2**53 are the one case where the output differs: the
+    editor would round them, this keeps them intact.
+    """
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value) or math.isinf(value):
+        # JSON has no NaN/Infinity; JSON.stringify writes null
+        return "null"
+    if value == 0:
+        return "0"
+    text = repr(value)
+    if "e" not in text:
+        # Plain notation: same shortest digits as JavaScript, minus any ".0"
+        return text[:-2] if text.endswith(".0") else text
+    # repr gives the shortest round-tripping digits, same as JavaScript
+    sign, digits, exponent = Decimal(repr(abs(value))).normalize().as_tuple()
+    digits = "".join(map(str, digits))
+    k = len(digits)
+    n = k + exponent  # value = 0.<digits> * 10**n
+    prefix = "-" if value < 0 else ""
+
+    if k <= n <= 21:
+        return prefix + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return prefix + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return prefix + "0." + "0" * (-n) + digits
+
+    e = n - 1
+    mantissa = digits if k == 1 else digits[0] + "." + digits[1:]
+    return prefix + mantissa + ("e+" if e >= 0 else "e-") + str(abs(e))
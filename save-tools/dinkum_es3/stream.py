@@ -0,0 +1,284 @@
+"""
+Streaming ES3 decoding: decrypt -> gunzip -> incremental JSON parse.
+
+decrypt_es3 holds the ciphertext, the plaintext and the decompressed text in
+memory at once. This module pushes fixed-size chunks through each stage
+instead, so memory is bounded by the chunk size (plus any values the caller
+asks to keep), not by the size of the save.
+"""
+
+import codecs
+import json
+import re
+import zlib
+from pathlib import Path
+
+from .codec import CHUNK_SIZE, ES3_PASSWORD, IV_LENGTH, ES3Error, derive_key
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# A whole string, a bracket, or a lone quote when the string runs past the buffer
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}"]', re.DOTALL)
+_SCALAR = re.compile(r"[^ \t\r\n,:\]}]*")
+
+
+def iter_es3_bytes(stream, password: str = ES3_PASSWORD, chunk_size: int = CHUNK_SIZE):
+    """
+    Decrypt an ES3 stream chunk by chunk, yielding plaintext bytes.
+
+    The PKCS7 unpadder holds back the final block until the end of the
+    stream. Gzipped payloads (detected from the first two bytes, like
+    decrypt_es3) are inflated with each output piece capped at chunk_size.
+    """
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    iv = stream.read(IV_LENGTH)
+    if len(iv) < IV_LENGTH:
+        raise ES3Error("Decryption failed: file is shorter than the IV")
+
+    decryptor = Cipher(algorithms.AES(derive_key(password, iv)), modes.CBC(iv)).decryptor()
+    unpadder = padding.PKCS7(128).unpadder()
+    inflater = None
+    head = b""
+
+    def decrypted():
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            yield unpadder.update(decryptor.update(chunk))
+        yield unpadder.update(decryptor.finalize()) + unpadder.finalize()
+
+    try:
+        for data in decrypted():
+            if inflater is None:
+                # Need two bytes to tell gzip from plain JSON
+                head += data
+                if len(head) < 2:
+                    continue
+                data, head = head, b""
+                inflater = zlib.decompressobj(wbits=31) if data[:2] == b"\x1f\x8b" else False
+            if not inflater:
+                yield data
+                continue
+            out = inflater.decompress(data, chunk_size)
+            while out:
+                yield out
+                out = inflater.decompress(inflater.unconsumed_tail, chunk_size)
+        if head:
+            yield head
+        if inflater:
+            yield inflater.flush()
+            if not inflater.eof:
+                raise ES3Error("Decryption failed: gzip stream is truncated")
+    except (ValueError, zlib.error) as e:
+        raise ES3Error(f"Decryption failed: {e}") from e
+
+
+def iter_es3_text(stream, password: str = ES3_PASSWORD, chunk_size: int = CHUNK_SIZE):
+    """Decrypt an ES3 stream to text chunks, decoding UTF-8 like decrypt_es3."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    for data in iter_es3_bytes(stream, password, chunk_size):
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class JSONStream:
+    """
+    Pull parser over JSON text arriving in chunks.
+
+    The caller walks the document with iter_keys / iter_items and consumes
+    each value with read_value or skip_value. Only the unconsumed tail of
+    the text is buffered, plus the text of a value being read.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._mark = None
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at end of data."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        keep = self._pos if self._mark is None else self._mark
+        self._buf = self._buf[keep:] + chunk
+        self._pos -= keep
+        if self._mark is not None:
+            self._mark = 0
+        return True
+
+    def _error(self, message: str) -> ES3Error:
+        near = self._buf[self._pos:self._pos + 20] or "end of data"
+        return ES3Error(f"Invalid save JSON: {message} near {near!r}")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise self._error(f"expected {' or '.join(chars)}")
+        self._pos += 1
+        return ch
+
+    def _skip_string_body(self) -> None:
+        """Move past a string whose opening quote was already consumed."""
+        while True:
+            match = _STRING_BODY.match(self._buf, self._pos)
+            if match:
+                self._pos = match.end()
+                return
+            if not self._fill():
+                raise self._error("unterminated string")
+
+    def skip_value(self) -> None:
+        """
+        Move past the next value without decoding it.
+
+        Only quotes and brackets are looked at, so this is a regex scan in C
+        rather than a Python step per token. Scalars are not validated.
+        """
+        ch = self.peek()
+        if ch == '"':
+            self._pos += 1
+            self._skip_string_body()
+        elif ch in ("{", "["):
+            depth = 0
+            while True:
+                match = _STRUCTURE.search(self._buf, self._pos)
+                if match is None:
+                    self._pos = len(self._buf)
+                    if not self._fill():
+                        raise self._error("unexpected end of data")
+                    continue
+                ch = match.group()
+                if ch == '"':
+                    self._pos = match.start()
+                    if not self._fill():
+                        raise self._error("unterminated string")
+                    continue
+                self._pos = match.end()
+                if ch[0] == '"':
+                    continue
+                if ch in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            # A scalar is only complete once something follows it
+            while True:
+                end = _SCALAR.match(self._buf, self._pos).end()
+                if end < len(self._buf) or not self._fill():
+                    break
+            if end == self._pos:
+                raise self._error("expected a value")
+            self._pos = end
+
+    def read_value(self):
+        """Decode the next value (of any type) with the stdlib JSON parser."""
+        self.peek()
+        self._mark = self._pos
+        try:
+            self.skip_value()
+        finally:
+            start, self._mark = self._mark, None
+        try:
+            return json.loads(self._buf[start:self._pos])
+        except json.JSONDecodeError as e:
+            raise ES3Error(f"Invalid save JSON: {e}") from e
+
+    def read_string(self) -> str:
+        """Decode the next value, which must be a string."""
+        if self.peek() != '"':
+            raise self._error("expected a string")
+        return self.read_value()
+
+    def iter_keys(self):
+        """Iterate an object's keys; read or skip each value before the next."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def iter_items(self):
+        """Iterate an array's indices; read or skip each value before the next."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            if self._expect(",]") == "]":
+                return
+            index += 1
+
+
+def select_paths(chunks, paths) -> dict:
+    """
+    Decode only the values at the given dotted paths from JSON text chunks.
+
+    Path segments are object keys, or decimal indices for arrays, e.g.
+    "playerInfo.value.itemsInInvSlots". Everything else is skipped as it
+    streams past, and parsing stops as soon as every path has been found.
+    Returns {path: value} for the paths that exist.
+    """
+    stream = JSONStream(chunks)
+    wanted = {tuple(path.split(".")): path for path in paths}
+    prefixes = {key[:i] for key in wanted for i in range(len(key))}
+    found = {}
+
+    def visit(key) -> bool:
+        """Returns True once every wanted path has been found."""
+        if key in wanted:
+            found[wanted[key]] = stream.read_value()
+            return len(found) == len(wanted)
+        ch = stream.peek()
+        if key not in prefixes or ch not in ("{", "["):
+            stream.skip_value()
+            return False
+        children = stream.iter_keys() if ch == "{" else map(str, stream.iter_items())
+        for child in children:
+            if visit(key + (child,)):
+                return True
+        return False
+
+    if wanted and stream.peek():
+        visit(())
+    return found
+
+
+def load_es3_paths(path: Path, paths, password: str = ES3_PASSWORD, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Stream an .es3 file and return {path: value} for the selected paths.
+
+    Reading stops once all paths are found, so keys near the start of a big
+    save come back without decrypting the rest of it.
+    """
+    with open(path, "rb") as f:
+        chunks = iter_es3_text(f, password, chunk_size)
+        try:
+            return select_paths(chunks, paths)
+        finally:
+            chunks.close()
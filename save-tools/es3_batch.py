@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Dinkum ES3 Batch Tool
+
+Decrypts, re-encrypts or round-trip checks every .es3 save in a directory
+tree, spreading the files across a process pool.
+
+Requires: cryptography (pip install -r requirements.txt)
+
+Usage:
+    python es3_batch.py decrypt /path/to/saves /path/to/json
+    python es3_batch.py encrypt /path/to/json /path/to/saves [--gzip]
+    python es3_batch.py check /path/to/saves
+    python es3_batch.py select /path/to/saves --path playerInfo.value.money
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from dinkum_es3 import (
+    ES3Error,
+    decrypt_es3,
+    encrypt_es3,
+    load_es3_paths,
+    save_es3,
+    serialize_es3_json,
+)
+
+
+def decrypt_file(src: Path, dst: Path) -> str:
+    """Decrypt one save to its JSON text."""
+    text = decrypt_es3(src.read_bytes())
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_text(text, encoding="utf-8", newline="")
+    return f"{len(text):,} chars"
+
+
+def encrypt_file(src: Path, dst: Path, should_gzip: bool) -> str:
+    """Re-serialize one JSON file in ES3 layout and encrypt it."""
+    data = json.loads(src.read_text(encoding="utf-8"))
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    save_es3(dst, data, should_gzip)
+    return f"{dst.stat().st_size:,} bytes"
+
+
+def check_file(src: Path) -> str:
+    """
+    Round-trip one save: decrypt, parse, re-serialize, encrypt, decrypt.
+
+    The re-serialized JSON must match the decrypted text byte for byte (the
+    layout the editor's serializeES3Json writes), and must survive encryption
+    unchanged.
+    """
+    text = decrypt_es3(src.read_bytes())
+    serialized = serialize_es3_json(json.loads(text))
+    if serialized != text:
+        pos = next(
+            (i for i, (a, b) in enumerate(zip(serialized, text)) if a != b),
+            min(len(serialized), len(text)),
+        )
+        raise ES3Error(
+            f"layout differs at char {pos}: "
+            f"expected {text[pos:pos + 20]!r}, wrote {serialized[pos:pos + 20]!r}"
+        )
+    if decrypt_es3(encrypt_es3(serialized)) != serialized:
+        raise ES3Error("encrypt/decrypt round trip changed the text")
+    return "round trip OK"
+
+
+def select_file(src: Path, paths: list[str]) -> str:
+    """Stream one save and return the selected paths as compact JSON."""
+    found = load_es3_paths(src, paths)
+    missing = [path for path in paths if path not in found]
+    if missing:
+        raise ES3Error(f"not found: {', '.join(missing)}")
+    return json.dumps(found, ensure_ascii=False)
+
+
+def run_job(
+    command: str, src: Path, dst: Path | None, should_gzip: bool, paths: list[str]
+) -> tuple[bool, str]:
+    """Process-pool entry point. Returns (ok, message)."""
+    try:
+        if command == "decrypt":
+            return True, decrypt_file(src, dst)
+        if command == "encrypt":
+            return True, encrypt_file(src, dst, should_gzip)
+        if command == "select":
+            return True, select_file(src, paths)
+        return True, check_file(src)
+    except (ES3Error, OSError, ValueError) as e:
+        return False, str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch decrypt/encrypt Dinkum .es3 saves")
+    parser.add_argument(
+        "command",
+        choices=["decrypt", "encrypt", "check", "select"],
+        help=(
+            "decrypt .es3 -> .json, encrypt .json -> .es3, check round trips in place, "
+            "or select values by path"
+        ),
+    )
+    parser.add_argument("source", type=Path, help="Directory to read (searched recursively)")
+    parser.add_argument(
+        "dest",
+        type=Path,
+        nargs="?",
+        default=None,
+        help="Output directory, mirroring the source tree (decrypt/encrypt)",
+    )
+    parser.add_argument("--gzip", action="store_true", help="Gzip data before encrypting")
+    parser.add_argument(
+        "--path",
+        action="append",
+        default=[],
+        dest="paths",
+        metavar="KEY.KEY",
+        help="Dotted path to print (select; repeatable), e.g. playerInfo.value.money",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes (default: one per CPU)",
+    )
+    args = parser.parse_args()
+
+    if not args.source.is_dir():
+        print(f"ERROR: Source directory not found: {args.source}")
+        sys.exit(1)
+    if args.command == "select" and not args.paths:
+        print("ERROR: select needs at least one --path")
+        sys.exit(1)
+    if args.command in ("decrypt", "encrypt") and args.dest is None:
+        print(f"ERROR: {args.command} needs an output directory")
+        sys.exit(1)
+
+    in_suffix, out_suffix = (".json", ".es3") if args.command == "encrypt" else (".es3", ".json")
+    sources = sorted(args.source.rglob(f"*{in_suffix}"))
+    if not sources:
+        print(f"No {in_suffix} files found in {args.source}")
+        sys.exit(1)
+
+    jobs = args.jobs or os.cpu_count()
+    print(f"{args.command.capitalize()}ing {len(sources)} files with {jobs} workers...")
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for src in sources:
+            dst = None
+            if args.dest is not None:
+                dst = (args.dest / src.relative_to(args.source)).with_suffix(out_suffix)
+            futures[pool.submit(run_job, args.command, src, dst, args.gzip, args.paths)] = src
+
+        for future in as_completed(futures):
+            ok, message = future.result()
+            rel = futures[future].relative_to(args.source)
+            if ok:
+                print(f"  {rel}: {message}")
+            else:
+                failures += 1
+                print(f"  ERROR {rel}: {message}")
+
+    print()
+    print(f"{len(sources) - failures}/{len(sources)} files processed successfully")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
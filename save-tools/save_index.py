@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Dinkum Save Corpus Indexer
+
+Decrypts every Player.es3 and Container.es3 under a directory tree in
+parallel and flattens the player's money and bank balance plus the
+inventory, stash and chest slot arrays into an indexed SQLite database,
+with item names from data/items.json. Questions across many saves ("which
+saves hold item 1728?", "total money per world") then become single SQL
+queries instead of opening each save in the editor.
+
+Re-ingesting is incremental: files whose size and mtime are unchanged are
+skipped without being read, and the rest are only decrypted again if their
+SHA-256 changed. Saves that disappeared from the tree are dropped.
+
+Requires: cryptography (pip install -r requirements.txt)
+
+Usage:
+    python save_index.py ingest /path/to/saves
+    python save_index.py find 1728
+    python save_index.py find "Har-Vac"
+    python save_index.py totals
+    python save_index.py sql "SELECT item_name, SUM(stack) FROM slot_items GROUP BY item_id"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from dinkum_es3 import ES3Error, decrypt_es3, load_es3_paths
+
+DEFAULT_DB = Path("saves.sqlite")
+ITEMS_PATH = Path(__file__).parent.parent / "data" / "items.json"
+
+# Save file name -> kind stored in saves.kind
+SAVE_FILES = {"Player.es3": "player", "Container.es3": "container"}
+EMPTY_SLOT = -1  # itemId of an empty slot; empty slots aren't stored
+STASH_KEY = re.compile(r"stash_(\d+)")
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE saves (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,      -- absolute path of the .es3 file
+    world TEXT NOT NULL,            -- its directory, relative to the ingested root
+    kind TEXT NOT NULL,             -- 'player' or 'container'
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    player_name TEXT,
+    island_name TEXT,
+    money INTEGER,
+    bank_balance INTEGER
+);
+
+-- One row per occupied slot
+CREATE TABLE slots (
+    save_id INTEGER NOT NULL REFERENCES saves(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,           -- 'inventory', 'stash' or 'chest'
+    container INTEGER NOT NULL,     -- stash number or chest index; 0 for the inventory
+    slot INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    stack INTEGER NOT NULL
+);
+
+CREATE TABLE chests (
+    save_id INTEGER NOT NULL REFERENCES saves(id) ON DELETE CASCADE,
+    chest INTEGER NOT NULL,
+    x_pos INTEGER,
+    y_pos INTEGER,
+    house_x INTEGER,
+    house_y INTEGER,
+    PRIMARY KEY (save_id, chest)
+);
+
+CREATE TABLE items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+-- Covers the per-item aggregates, so they never touch the slots table itself
+CREATE INDEX slots_item ON slots (item_id, save_id, source, stack);
+CREATE INDEX slots_save ON slots (save_id);
+CREATE INDEX saves_world ON saves (world, kind);
+CREATE INDEX items_name ON items (name COLLATE NOCASE);
+
+CREATE VIEW slot_items AS
+SELECT saves.path, saves.world, saves.kind, slots.source, slots.container, slots.slot,
+       slots.item_id, items.name AS item_name, slots.stack
+FROM slots
+JOIN saves ON saves.id = slots.save_id
+LEFT JOIN items ON items.id = slots.item_id;
+"""
+
+
+# --- Reading saves (worker processes) ---
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def slot_rows(source: str, container: int, item_ids: list, stacks: list) -> list[tuple]:
+    """(source, container, slot, item_id, stack) for each occupied slot."""
+    return [
+        (source, container, slot, item_id, stack)
+        for slot, (item_id, stack) in enumerate(zip(item_ids, stacks))
+        if item_id != EMPTY_SLOT
+    ]
+
+
+def read_player(path: Path) -> dict:
+    """PlayerInfo fields plus inventory and stash slots from a Player.es3."""
+    data = json.loads(decrypt_es3(path.read_bytes()))
+    info = data["playerInfo"]["value"]
+    slots = slot_rows("inventory", 0, info["itemsInInvSlots"], info["stacksInSlots"])
+    for key, entry in data.items():
+        match = STASH_KEY.fullmatch(key)
+        if match:
+            stash = entry["value"]
+            slots += slot_rows("stash", int(match.group(1)), stash["itemId"], stash["itemStack"])
+    return {
+        "player_name": info.get("playerName"),
+        "island_name": info.get("islandName"),
+        "money": info.get("money"),
+        "bank_balance": info.get("bankBalance"),
+        "slots": slots,
+        "chests": [],
+    }
+
+
+def read_container(path: Path) -> dict:
+    """Chest positions and slots from a Container.es3, streamed (see load_es3_paths)."""
+    key = "chests.value.allChests"
+    found = load_es3_paths(path, [key])
+    if key not in found:
+        raise ES3Error(f"not found: {key}")
+    slots, chests = [], []
+    for index, chest in enumerate(found[key]):
+        slots += slot_rows("chest", index, chest["itemId"], chest["itemStack"])
+        chests.append(
+            (index, chest.get("xPos"), chest.get("yPos"), chest.get("houseX"), chest.get("houseY"))
+        )
+    return {"slots": slots, "chests": chests}
+
+
+def index_save(path: Path, kind: str, known_hash: str | None) -> tuple[bool, dict | str]:
+    """
+    Process-pool entry point: hash a save and, unless the hash is
+    known_hash, decrypt and flatten it. Returns (ok, record or message);
+    record is {"sha256", "unchanged"} plus the read_player/read_container
+    fields when the save was read.
+    """
+    try:
+        digest = file_hash(path)
+        if digest == known_hash:
+            return True, {"sha256": digest, "unchanged": True}
+        record = read_player(path) if kind == "player" else read_container(path)
+        return True, {"sha256": digest, "unchanged": False, **record}
+    except (ES3Error, OSError, ValueError) as e:
+        return False, str(e)
+    except (KeyError, TypeError, IndexError) as e:
+        return False, f"unexpected save layout: {e!r}"
+
+
+# --- Database ---
+
+
+def open_database(db_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the index database."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    elif version != SCHEMA_VERSION:
+        print(f"ERROR: {db_path} was made by another version of this tool")
+        print("  Delete it and run ingest again")
+        sys.exit(1)
+    return conn
+
+
+def load_items(conn: sqlite3.Connection, items_path: Path) -> int:
+    """Replace the items table with the names in items.json. Returns the count."""
+    with open(items_path, encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    conn.execute("DELETE FROM items")
+    conn.executemany(
+        "INSERT INTO items (id, name) VALUES (?, ?)",
+        ((int(item_id), entry["name"]) for item_id, entry in items.items()),
+    )
+    return len(items)
+
+
+def store_save(
+    conn: sqlite3.Connection, path: Path, world: str, kind: str, stat: os.stat_result, record: dict
+) -> None:
+    """Replace everything indexed for one save with a freshly read record."""
+    conn.execute("DELETE FROM saves WHERE path = ?", (str(path),))
+    save_id = conn.execute(
+        """
+        INSERT INTO saves (path, world, kind, size, mtime_ns, sha256,
+                           player_name, island_name, money, bank_balance)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            str(path),
+            world,
+            kind,
+            stat.st_size,
+            stat.st_mtime_ns,
+            record["sha256"],
+            record.get("player_name"),
+            record.get("island_name"),
+            record.get("money"),
+            record.get("bank_balance"),
+        ),
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO slots (save_id, source, container, slot, item_id, stack) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((save_id, *row) for row in record["slots"]),
+    )
+    conn.executemany(
+        "INSERT INTO chests (save_id, chest, x_pos, y_pos, house_x, house_y) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((save_id, *row) for row in record["chests"]),
+    )
+
+
+def ingest(conn: sqlite3.Connection, root: Path, items_path: Path, jobs: int) -> int:
+    """Index every save under root. Returns the number of files that failed."""
+    root = root.resolve()
+    sources = sorted(p for p in root.rglob("*.es3") if p.name in SAVE_FILES)
+    known = {
+        path: (size, mtime_ns, sha256)
+        for path, size, mtime_ns, sha256 in conn.execute(
+            "SELECT path, size, mtime_ns, sha256 FROM saves WHERE path LIKE ? ESCAPE '\\'",
+            (re.sub(r"([%_\\])", r"\\\1", str(root) + os.sep) + "%",),
+        )
+    }
+
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    failures = 0
+    with conn:
+        item_count = load_items(conn, items_path)
+        print(f"Loaded {item_count} item names from {items_path}")
+
+        pending = {}
+        for path in sources:
+            stat = path.stat()
+            size, mtime_ns, sha256 = known.get(str(path), (None, None, None))
+            if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                counts["unchanged"] += 1
+            else:
+                pending[path] = (stat, sha256)
+        print(f"Indexing {len(pending)} of {len(sources)} saves with {jobs} workers...")
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(index_save, path, SAVE_FILES[path.name], sha256): path
+                for path, (_, sha256) in pending.items()
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                stat = pending[path][0]
+                rel = path.relative_to(root)
+                ok, record = future.result()
+                if not ok:
+                    failures += 1
+                    print(f"  ERROR {rel}: {record}")
+                    continue
+                if record["unchanged"]:
+                    # Touched but identical; remember the new mtime
+                    conn.execute(
+                        "UPDATE saves SET size = ?, mtime_ns = ? WHERE path = ?",
+                        (stat.st_size, stat.st_mtime_ns, str(path)),
+                    )
+                    counts["unchanged"] += 1
+                    continue
+                world = rel.parent.as_posix()
+                store_save(conn, path, world, SAVE_FILES[path.name], stat, record)
+                counts["updated" if str(path) in known else "new"] += 1
+                print(f"  {rel}: {len(record['slots'])} occupied slots")
+
+        present = {str(path) for path in sources}
+        removed = [(path,) for path in known if path not in present]
+        conn.executemany("DELETE FROM saves WHERE path = ?", removed)
+        counts["removed"] = len(removed)
+    conn.execute("PRAGMA optimize")
+
+    print()
+    print(", ".join(f"{count} {name}" for name, count in counts.items()) + f", {failures} failed")
+    return failures
+
+
+# --- Queries ---
+
+
+def run_query(conn: sqlite3.Connection, sql: str, params=()) -> None:
+    """Run a query and print its rows tab-separated, with a header and the time taken."""
+    start = time.perf_counter()
+    try:
+        cursor = conn.execute(sql, params)
+        rows = cursor.fetchall()
+    except sqlite3.Error as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    seconds = time.perf_counter() - start
+
+    print("\t".join(column[0] for column in cursor.description or ()))
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+    print(f"({len(rows)} rows in {seconds * 1000:.1f} ms)")
+
+
+def resolve_item(conn: sqlite3.Connection, item: str) -> list[int]:
+    """Item IDs for an ID or a name (exact, else substring, case-insensitive)."""
+    if item.lstrip("-").isdigit():
+        return [int(item)]
+    rows = conn.execute("SELECT id FROM items WHERE name = ? COLLATE NOCASE", (item,)).fetchall()
+    if not rows:
+        rows = conn.execute("SELECT id FROM items WHERE name LIKE ?", (f"%{item}%",)).fetchall()
+    return [row[0] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index Dinkum saves into SQLite and query them")
+    parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB, help=f"Index database (default: {DEFAULT_DB})"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="Index (or re-index) every save under a directory"
+    )
+    ingest_parser.add_argument("source", type=Path, help="Directory to read (searched recursively)")
+    ingest_parser.add_argument(
+        "--items",
+        type=Path,
+        default=ITEMS_PATH,
+        help="items.json with item names (default: ../data/items.json)",
+    )
+    ingest_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes (default: one per CPU)",
+    )
+
+    find_parser = commands.add_parser("find", help="List the saves holding an item")
+    find_parser.add_argument("item", help="Item ID or name")
+
+    commands.add_parser("totals", help="Money and bank balance per world and overall")
+
+    sql_parser = commands.add_parser("sql", help="Run an SQL query against the index")
+    sql_parser.add_argument("query", help="e.g. SELECT * FROM slot_items WHERE item_id = 1728")
+    args = parser.parse_args()
+
+    if args.command != "ingest" and not args.db.exists():
+        print(f"ERROR: Index not found: {args.db} (run ingest first)")
+        sys.exit(1)
+    conn = open_database(args.db)
+
+    if args.command == "ingest":
+        if not args.source.is_dir():
+            print(f"ERROR: Source directory not found: {args.source}")
+            sys.exit(1)
+        if not args.items.exists():
+            print(f"ERROR: Item data not found: {args.items}")
+            sys.exit(1)
+        if ingest(conn, args.source, args.items, args.jobs or os.cpu_count()):
+            sys.exit(1)
+
+    elif args.command == "find":
+        item_ids = resolve_item(conn, args.item)
+        if not item_ids:
+            print(f"ERROR: No item matches {args.item!r}")
+            sys.exit(1)
+        placeholders = ", ".join("?" * len(item_ids))
+        run_query(
+            conn,
+            f"""
+            SELECT saves.path, items.name AS item, found.item_id, found.source,
+                   found.slots, found.total_stack
+            FROM (
+                SELECT save_id, item_id, source, COUNT(*) AS slots, SUM(stack) AS total_stack
+                FROM slots
+                WHERE item_id IN ({placeholders})
+                GROUP BY item_id, save_id, source
+            ) AS found
+            JOIN saves ON saves.id = found.save_id
+            LEFT JOIN items ON items.id = found.item_id
+            ORDER BY saves.path, found.item_id, found.source
+            """,
+            item_ids,
+        )
+
+    elif args.command == "totals":
+        run_query(
+            conn,
+            """
+            SELECT world, players, money, bank_balance FROM (
+                SELECT 0 AS total, world, COUNT(*) AS players,
+                       SUM(money) AS money, SUM(bank_balance) AS bank_balance
+                FROM saves WHERE kind = 'player' GROUP BY world
+                UNION ALL
+                SELECT 1, 'TOTAL', COUNT(*), SUM(money), SUM(bank_balance)
+                FROM saves WHERE kind = 'player'
+            )
+            ORDER BY total, world
+            """,
+        )
+
+    else:
+        run_query(conn, args.query)
+
+
+if __name__ == "__main__":
+    main()
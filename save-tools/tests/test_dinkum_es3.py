@@ -0,0 +1,213 @@
+"""
+Compatibility tests for dinkum_es3 against the web editor (utils/crypto.ts).
+
+The expected strings and the encrypted saves below were produced by the
+editor's serializeES3Json and encryptES3 from the same JSON, so a mismatch
+means a save written by these tools would differ from one the editor
+writes. Run from save-tools/:
+
+    python -m unittest discover tests
+"""
+
+import base64
+import json
+import unittest
+
+from dinkum_es3 import (
+    ES3Error,
+    decrypt_es3,
+    encrypt_es3,
+    is_gzip,
+    serialize_es3_json,
+    write_es3_json,
+)
+
+# (input JSON, serializeES3Json output)
+GOLDEN = {
+    "nested objects and arrays": (
+        '{"playerInfo": {"value": {"playerName": "Alex", "money": 150000, "bankBalance": 0,'
+        ' "itemsInInvSlots": [0, -1, 3], "stacksInSlots": [1, 0, 2],'
+        ' "position": {"x": 1.5, "y": -0.25, "z": 100}}}}',
+        '{\r\n'
+        '\t"playerInfo" : {\r\n'
+        '\t\t"value" : {\r\n'
+        '\t\t\t"playerName" : "Alex",\r\n'
+        '\t\t\t"money" : 150000,\r\n'
+        '\t\t\t"bankBalance" : 0,\r\n'
+        '\t\t\t"itemsInInvSlots" : [\r\n'
+        '\t\t\t\t0,-1,3\r\n'
+        '\t\t\t],\r\n'
+        '\t\t\t"stacksInSlots" : [\r\n'
+        '\t\t\t\t1,0,2\r\n'
+        '\t\t\t],\r\n'
+        '\t\t\t"position" : {\r\n'
+        '\t\t\t\t"x" : 1.5,\r\n'
+        '\t\t\t\t"y" : -0.25,\r\n'
+        '\t\t\t\t"z" : 100\r\n'
+        '\t\t\t}\r\n'
+        '\t\t}\r\n'
+        '\t}\r\n'
+        '}',
+    ),
+    "empty arrays and objects": (
+        '{"list": [], "obj": {}, "nested": [[], {}], "objs": [{}, {}], "deep": {"a": {"b": []}}}',
+        '{\r\n'
+        '\t"list" : [\r\n'
+        '\t\t\r\n'
+        '\t],\r\n'
+        '\t"obj" : {\r\n'
+        '\t},\r\n'
+        '\t"nested" : [\r\n'
+        '\t\t[\r\n'
+        '\t\t\t\r\n'
+        '\t\t],{\r\n'
+        '\t\t}\r\n'
+        '\t],\r\n'
+        '\t"objs" : [\r\n'
+        '\t\t{\r\n'
+        '\t\t},{\r\n'
+        '\t\t}\r\n'
+        '\t],\r\n'
+        '\t"deep" : {\r\n'
+        '\t\t"a" : {\r\n'
+        '\t\t\t"b" : [\r\n'
+        '\t\t\t\t\r\n'
+        '\t\t\t]\r\n'
+        '\t\t}\r\n'
+        '\t}\r\n'
+        '}',
+    ),
+    "object array": (
+        '[{"itemId": [1, 2], "itemStack": [5, 5], "xPos": 10},'
+        ' {"itemId": [], "itemStack": [], "xPos": -3}]',
+        '[\r\n'
+        '\t{\r\n'
+        '\t\t"itemId" : [\r\n'
+        '\t\t\t1,2\r\n'
+        '\t\t],\r\n'
+        '\t\t"itemStack" : [\r\n'
+        '\t\t\t5,5\r\n'
+        '\t\t],\r\n'
+        '\t\t"xPos" : 10\r\n'
+        '\t},{\r\n'
+        '\t\t"itemId" : [\r\n'
+        '\t\t\t\r\n'
+        '\t\t],\r\n'
+        '\t\t"itemStack" : [\r\n'
+        '\t\t\t\r\n'
+        '\t\t],\r\n'
+        '\t\t"xPos" : -3\r\n'
+        '\t}\r\n'
+        ']',
+    ),
+    # The first element decides the layout, as in formatValue
+    "mixed array": (
+        '[1, {"a": [true]}, "s", null]',
+        '[\r\n'
+        '\t1,{\r\n'
+        '\t\t"a" : [\r\n'
+        '\t\t\ttrue\r\n'
+        '\t\t]\r\n'
+        '\t},"s",null\r\n'
+        ']',
+    ),
+    "floats and ints": (
+        "[1, 1.0, 0.5, -2.25, 0, -0.0, 1e-7, 0.000001, 1e21, 123456789012345680000,"
+        " 1.7976931348623157e308, 5e-324, 0.1, 9007199254740991, true, false, null]",
+        "[\r\n"
+        "\t1,1,0.5,-2.25,0,0,1e-7,0.000001,1e+21,123456789012345680000,"
+        "1.7976931348623157e+308,5e-324,0.1,9007199254740991,true,false,null\r\n"
+        "]",
+    ),
+    "string escaping": (
+        r'["quote \" backslash \\ slash \/", "tab\tnewline\nreturn\r", "\b\f\u0001\u001f\u007f",'
+        r' "café üß \u2028 \u2029 \ud83d\ude00 中"]',
+        '[\r\n'
+        '\t"quote \\" backslash \\\\ slash /","tab\\tnewline\\nreturn\\r",'
+        '"\\b\\f\\u0001\\u001f\x7f","café üß \u2028 \u2029 \U0001f600 中"\r\n'
+        ']',
+    ),
+    "key escaping": (
+        r'{"": 1, "with \"quote\"": 2, "café": 3, "tab\tkey": 4}',
+        '{\r\n'
+        '\t"" : 1,\r\n'
+        '\t"with \\"quote\\"" : 2,\r\n'
+        '\t"café" : 3,\r\n'
+        '\t"tab\\tkey" : 4\r\n'
+        '}',
+    ),
+}
+
+# encryptES3(<"nested objects and arrays" output>, shouldGzip) from the editor
+EDITOR_SAVES = {
+    False: (
+        "RfzzpoOkejhNALhK4c/u6/WK24zksPWVjgDo52U14g8h+EYMQFeFQUg3SyV6H+WeMG1DKEek7tglN7Rt"
+        "HHwChRo6W/Z56pSYrPw0hR39t47hOpoawK77PDhPJTLILL9oeLTSS6gjQljhtnSVFMxasD2rJqaPrNkJ"
+        "mVuljR4gDZmDzH6lsZlxdNsCh8iRuFppAB9U82iPQfPxsPCI+eSmR0K72h3tDXCXs5X8jUBnP7BGN0ba"
+        "Kkunp/rN9zSdezB0wNP2aXT681E6apMvQn9bvhRXgaMABE3TOfJnxtIXIi2StQSzDuSp6ZHUy0RsLadB"
+        "Opr79fytvZTDFThmaWiCM7k2oRw0ckyQg7k+zZdZeLeripXzdq6Xv6PmniIC1+Zqjii/ohCVdwyUBfE+"
+        "RFtPsA=="
+    ),
+    True: (
+        "PBiQOb6xx9EiwZK6nLYm/7f52zgjAotumDnj2xe6UZxrkckP0mEPFTxq/b3uq2E9kifJEY6P53/2l/3F"
+        "nujuQ4gI5JB0RuLK+p662I3P/tV8qgPdzkzcVdcdMm2ry8+xDvJcGokNp3/WHxF5+Jl7oyhSoo5uGr/b"
+        "DJ8FPkqgu6VhCLmt+rVrFAAreI2hE4RWIRUoPd9sA7SkuMPmVODKLPWsumapYpStOst5C6mwKbwrk+kD"
+        "iMA8R+ekFiKIowd6XAfxnIYzzoeGObn8Ch48yw=="
+    ),
+}
+
+
+class SerializerTest(unittest.TestCase):
+    def test_matches_editor(self):
+        for name, (source, expected) in GOLDEN.items():
+            with self.subTest(name):
+                self.assertEqual(serialize_es3_json(json.loads(source)), expected)
+
+    def test_streaming_writer_matches(self):
+        for name, (source, expected) in GOLDEN.items():
+            with self.subTest(name):
+                parts = []
+                write_es3_json(json.loads(source), parts.append)
+                self.assertEqual("".join(parts), expected)
+
+    def test_reserialize_is_identity(self):
+        for name, (_, expected) in GOLDEN.items():
+            with self.subTest(name):
+                self.assertEqual(serialize_es3_json(json.loads(expected)), expected)
+
+
+class CodecTest(unittest.TestCase):
+    text = GOLDEN["nested objects and arrays"][1]
+
+    def test_decrypts_editor_saves(self):
+        for should_gzip, encoded in EDITOR_SAVES.items():
+            with self.subTest(gzip=should_gzip):
+                self.assertEqual(decrypt_es3(base64.b64decode(encoded)), self.text)
+
+    def test_round_trip(self):
+        texts = [value for _, value in GOLDEN.values()] + ["", "x" * 15, "x" * 16, "é" * 100_000]
+        for text in texts:
+            for should_gzip in (False, True):
+                with self.subTest(size=len(text), gzip=should_gzip):
+                    encrypted = encrypt_es3(text, should_gzip)
+                    self.assertEqual(len(encrypted) % 16, 0)
+                    decrypted = decrypt_es3(encrypted)
+                    self.assertEqual(decrypted.encode("utf-8"), text.encode("utf-8"))
+
+    def test_random_iv(self):
+        first, second = encrypt_es3(self.text), encrypt_es3(self.text)
+        self.assertNotEqual(first[:16], second[:16])
+        self.assertEqual(decrypt_es3(first), decrypt_es3(second))
+
+    def test_gzip_is_inside_encryption(self):
+        encrypted = encrypt_es3(self.text, should_gzip=True)
+        self.assertFalse(is_gzip(encrypted))
+        self.assertEqual(decrypt_es3(encrypted), self.text)
+
+    def test_wrong_password(self):
+        with self.assertRaises(ES3Error):
+            decrypt_es3(base64.b64decode(EDITOR_SAVES[False]), password="not-the-password")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,24 +1,210 @@
-import itemData from "../data/items.json" with { type: "json" };
+import compactItems from "../data/items.min.json" with { type: "json" };
 
-interface ItemEntry {
-  name: string;
-  maxDurability?: number;
+/**
+ * Item data in columnar form, indexed by item ID.
+ *
+ * Generated by extracting-item-data/extract_items.py as `items.min.json`.
+ */
+export interface ItemColumns {
+  meta: Record<string, unknown>;
+  /** Item name per ID; "" for unused IDs */
+  names: string[];
+  /** Max durability per ID; NO_DURABILITY for items without durability */
+  maxDurability: number[];
+  /**
+   * Icon rect per ID as 5 values (atlas, x, y, width, height) at 5 * id;
+   * atlas is NO_ICON for items without an icon. Absent if the data was
+   * extracted without --icons.
+   */
+  iconRects?: number[];
 }
 
-const items = itemData.items as Record<string, ItemEntry>;
+/**
+ * Item name index written by extract_items.py (build_search_index) as
+ * `items.search.json`: the IDs of named items sorted by normalized name, the
+ * normalized names in that order, and for every 1-, 2- and 3-gram the
+ * ascending positions in `ids` of the names containing it, delta-encoded.
+ */
+export interface SearchIndex {
+  ids: number[];
+  names: string[];
+  grams: Record<string, number[]>;
+}
+
+/** Where an item's icon is drawn from: a rect of an icon atlas image. */
+export interface ItemIcon {
+  url: string;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  atlasWidth: number;
+  atlasHeight: number;
+}
+
+interface IconsMeta {
+  size: number;
+  atlases: { file: string; width: number; height: number }[];
+}
+
+const NO_DURABILITY = 0;
+const NO_ICON = 0xffff;
+/** Where extract_items.py --icons writes the atlases (static/item-icons) */
+const ICON_BASE_URL = "/item-icons/";
+const SEARCH_GRAM = 3;
+/** Items listed for an empty query */
+const EMPTY_QUERY_LIMIT = 50;
+
+const columns: ItemColumns = compactItems;
+let allItems: { id: number; name: string }[] | null = null;
+let searchIndex: SearchIndex | null = null;
+let searchIndexLoad: Promise<void> | null = null;
+/** Decoded (absolute) posting lists, filled as queries need them */
+const postings = new Map<string, number[]>();
 
 export function getItemName(id: number): string {
   if (id === -1) return "Empty";
-  return items[String(id)]?.name ?? `Unknown (${id})`;
+  return columns.names[id] || `Unknown (${id})`;
 }
 
 export function getMaxDurability(id: number): number | null {
-  return items[String(id)]?.maxDurability ?? null;
+  const durability = columns.maxDurability[id];
+  return durability === undefined || durability === NO_DURABILITY
+    ? null
+    : durability;
 }
 
 export function getAllItems(): { id: number; name: string }[] {
-  return Object.entries(items).map(([id, entry]) => ({
-    id: Number(id),
-    name: entry.name,
+  if (allItems === null) {
+    const list: { id: number; name: string }[] = [];
+    columns.names.forEach((name, id) => {
+      if (name) list.push({ id, name });
+    });
+    allItems = list;
+  }
+  return allItems;
+}
+
+/**
+ * Returns where to draw an item's icon from, or null if it has none (or the
+ * item data was extracted without icons).
+ */
+export function getItemIcon(id: number): ItemIcon | null {
+  const rects = columns.iconRects;
+  const icons = columns.meta.icons as IconsMeta | undefined;
+  if (!rects || !icons || id < 0 || 5 * id >= rects.length) return null;
+  const atlas = icons.atlases[rects[5 * id]];
+  if (rects[5 * id] === NO_ICON || !atlas) return null;
+  return {
+    url: ICON_BASE_URL + atlas.file,
+    x: rects[5 * id + 1],
+    y: rects[5 * id + 2],
+    width: rects[5 * id + 3],
+    height: rects[5 * id + 4],
+    atlasWidth: atlas.width,
+    atlasHeight: atlas.height,
+  };
+}
+
+/**
+ * Lowercases, strips accents and collapses whitespace; must match
+ * normalize_search_text in extract_items.py.
+ */
+export function normalizeSearchText(text: string): string {
+  return text.normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase()
+    .replace(/\s+/g, " ").trim();
+}
+
+/**
+ * Starts loading the search index. It is a separate chunk, not part of the
+ * bundled item data, so it only costs a download once the item picker is
+ * used; searches made before it arrives scan the names instead.
+ */
+export function loadSearchIndex(): Promise<void> {
+  searchIndexLoad ??= import("../data/items.search.json", {
+    with: { type: "json" },
+  }).then(
+    (module) => {
+      searchIndex = module.default;
+    },
+    () => {
+      // Offline before the chunk was cached: keep scanning, retry next time
+      searchIndexLoad = null;
+    },
+  );
+  return searchIndexLoad;
+}
+
+function getPostings(index: SearchIndex, gram: string): number[] {
+  let hits = postings.get(gram);
+  if (!hits) {
+    hits = [];
+    let position = 0;
+    for (const delta of index.grams[gram] ?? []) {
+      position += delta;
+      hits.push(position);
+    }
+    postings.set(gram, hits);
+  }
+  return hits;
+}
+
+function sortedIncludes(sorted: number[], value: number): boolean {
+  let lo = 0;
+  let hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (sorted[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return sorted[lo] === value;
+}
+
+/**
+ * Every item whose name contains the query (case- and accent-insensitive),
+ * in ID order. An empty query returns the first items by ID.
+ *
+ * Queries of up to three characters are answered straight from their
+ * posting list; longer ones intersect their trigram lists, starting from
+ * the shortest, so a keystroke costs about the matches rather than a scan
+ * of every item. Until the index has loaded (see loadSearchIndex), the
+ * names are scanned.
+ */
+export function searchItems(query: string): { id: number; name: string }[] {
+  const q = normalizeSearchText(query);
+  if (!q) return getAllItems().slice(0, EMPTY_QUERY_LIMIT);
+
+  const index = searchIndex;
+  if (index === null) {
+    loadSearchIndex();
+    return getAllItems().filter((item) =>
+      normalizeSearchText(item.name).includes(q)
+    );
+  }
+
+  const chars = Array.from(q);
+  const size = Math.min(chars.length, SEARCH_GRAM);
+  const grams = new Set<string>();
+  for (let start = 0; start + size <= chars.length; start++) {
+    grams.add(chars.slice(start, start + size).join(""));
+  }
+  const lists = [...grams].map((gram) => getPostings(index, gram))
+    .sort((a, b) => a.length - b.length);
+
+  const ids: number[] = [];
+  for (const position of lists[0]) {
+    // Posting lists are sorted, so the others can be binary searched
+    if (!lists.every((list, i) => i === 0 || sortedIncludes(list, position))) {
+      continue;
+    }
+    if (chars.length > SEARCH_GRAM && !index.names[position].includes(q)) {
+      continue;
+    }
+    ids.push(index.ids[position]);
+  }
+  // Positions follow name order; the picker lists matches by ID
+  return ids.sort((a, b) => a - b).map((id) => ({
+    id,
+    name: columns.names[id],
   }));
 }